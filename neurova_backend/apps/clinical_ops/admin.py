@@ -17,6 +17,7 @@ from apps.clinical_ops.models_consent import ConsentRecord
 from apps.clinical_ops.models_deletion import DeletionRequest
 from apps.clinical_ops.battery_assessment_model import Assessment, Battery, BatteryAssessment
 from apps.clinical_ops.audit.models import AuditEvent
+from apps.clinical_ops.models_scheduler import ScheduledJobRun
 
 
 
@@ -300,4 +301,40 @@ class AuditEventAdmin(admin.ModelAdmin):
         return False  # prevent manual log creation
 
     def has_change_permission(self, request, obj=None):
-        return False  # prevent editing logs
\ No newline at end of file
+        return False  # prevent editing logs
+
+
+@admin.register(ScheduledJobRun)
+class ScheduledJobRunAdmin(admin.ModelAdmin):
+
+    list_display = (
+        "started_at",
+        "job_name",
+        "status",
+        "duration_ms",
+        "rows_affected",
+        "node",
+    )
+
+    list_filter = (
+        "job_name",
+        "status",
+        "started_at",
+    )
+
+    readonly_fields = (
+        "job_name",
+        "node",
+        "status",
+        "started_at",
+        "finished_at",
+        "duration_ms",
+        "rows_affected",
+        "output",
+        "error",
+    )
+
+    ordering = ("-started_at",)
+
+    def has_add_permission(self, request):
+        return False
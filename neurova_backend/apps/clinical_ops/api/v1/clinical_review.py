@@ -8,6 +8,7 @@ from rest_framework.response import Response
 from rest_framework import status
 
 from apps.clinical_ops.models import AssessmentOrder, Battery
+from common.db_router import read_from_replica
 from common.encryption_decorators import decrypt_request, encrypt_response
 
 
@@ -17,6 +18,7 @@ logger = logging.getLogger(__name__)
 class ClinicalReviewDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @read_from_replica
     @decrypt_request
     @encrypt_response
     def get(self, request, order_id):
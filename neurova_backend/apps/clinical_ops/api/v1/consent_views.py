@@ -2,7 +2,7 @@ import logging
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.throttling import AnonRateThrottle
+from common.rate_limit import ClientIPThrottle, PublicTokenThrottle
 from rest_framework.exceptions import PermissionDenied
 from django.utils import timezone
 
@@ -20,7 +20,8 @@ logger = logging.getLogger(__name__)
 class PublicGetConsent(APIView):
     authentication_classes = []
     permission_classes = []
-    throttle_classes = [AnonRateThrottle]
+    throttle_scope = "public_read"
+    throttle_classes = [PublicTokenThrottle, ClientIPThrottle]
 
     @encrypt_response
     def get(self, request, token):
@@ -77,7 +78,8 @@ class PublicGetConsent(APIView):
 class PublicSubmitConsent(APIView):
     authentication_classes = []
     permission_classes = []
-    throttle_classes = [AnonRateThrottle]
+    throttle_scope = "public_consent"
+    throttle_classes = [PublicTokenThrottle, ClientIPThrottle]
 
     @decrypt_request
     @encrypt_response
@@ -141,15 +141,24 @@ class StaffDeleteOrder(APIView):
                     status=status.HTTP_200_OK
                 )
     
-            # 3. Create Deletion Request (Auto-Approved)
-            dr = DeletionRequest.objects.create(
-                org=user_org,
-                order=order,
-                requested_by="STAFF_USER",
-                reason="Staff initiated deletion",
-                status="APPROVED", # Skip admin approval for staff deletion
-                requested_at=timezone.now()
+            # 3. Approve the open Deletion Request (one per order), or create one
+            dr = (
+                DeletionRequest.objects.select_for_update()
+                .filter(order=order, status__in=DeletionRequest.OPEN_STATUSES)
+                .first()
             )
+            if dr is not None:
+                dr.status = "APPROVED"
+                dr.save(update_fields=["status"])
+            else:
+                dr = DeletionRequest.objects.create(
+                    org=user_org,
+                    order=order,
+                    requested_by="STAFF_USER",
+                    reason="Staff initiated deletion",
+                    status="APPROVED", # Skip admin approval for staff deletion
+                    requested_at=timezone.now()
+                )
     
             # 4. Execute Deletion Immediately
             execute_deletion(dr)
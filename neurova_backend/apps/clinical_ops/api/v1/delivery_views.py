@@ -8,6 +8,7 @@ from django.shortcuts import get_object_or_404
 from django.utils import timezone
 
 from common.encryption_decorators import decrypt_request, encrypt_response
+from common.idempotency import idempotent
 
 from apps.clinical_ops.models import AssessmentOrder
 from apps.clinical_ops.audit.logger import log_event
@@ -19,6 +20,7 @@ logger = logging.getLogger(__name__)
 class SetDeliveryAndMarkDelivered(APIView):
     permission_classes = [IsAuthenticated]
 
+    @idempotent("staff.orders.deliver")
     @decrypt_request
     @encrypt_response
     def post(self, request):
@@ -0,0 +1,111 @@
+"""
+Server-Sent Events stream of clinical notifications for the caller's org
+(see services/clinical_events.py), so clinicians no longer poll
+staff/inbox to spot red flags.
+
+    GET staff/events/stream    Authorization: Bearer <access token>
+
+    id: 3
+    event: red_flag
+    data: {"encrypted_data": "<encrypt_data({...})>"}
+
+Event types: red_flag, result, report, order, plus resync when the
+client fell behind and events were dropped (reload the inbox). A comment
+line is sent every EVENT_STREAM_HEARTBEAT_SECONDS to keep proxies from
+closing the connection. The stream ends when the access token expires;
+the client reconnects with its refreshed token (browsers need a
+fetch-based EventSource to send the Authorization header).
+
+There is no replay: after a reconnect, refresh the inbox once. Only
+served under ASGI; a WSGI worker would be held for the whole stream.
+"""
+
+import asyncio
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.exceptions import PermissionDenied
+
+from common.async_views import AsyncAPIView, envelope
+from common.auth.authentication import ClaimsJWTAuthentication
+from common.crypto_utils import encrypt_data
+from common.event_bus import subscribe, unsubscribe
+from common.metrics import EVENT_STREAM_MESSAGES
+from common.rate_limit import UserThrottle
+
+RETRY_MILLISECONDS = 5000
+
+
+def format_event(event_id, event, data):
+    payload = json.dumps({"encrypted_data": encrypt_data(data)})
+    return f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n"
+
+
+def _organization_id(user):
+    profile = getattr(user, "profile", None)
+    return getattr(profile, "organization_id", None)
+
+
+async def event_stream(org_id, expires_at=None):
+    heartbeat = getattr(settings, "EVENT_STREAM_HEARTBEAT_SECONDS", 15)
+    subscription = await subscribe(org_id)
+    event_id = 0
+    try:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+        while True:
+            timeout = heartbeat
+            if expires_at is not None:
+                remaining = expires_at - time.time()
+                if remaining <= 0:
+                    return
+                timeout = min(timeout, remaining)
+
+            try:
+                message = await asyncio.wait_for(subscription.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            if subscription.overflowed:
+                subscription.overflowed = False
+                event_id += 1
+                yield format_event(event_id, "resync", {})
+
+            event_id += 1
+            EVENT_STREAM_MESSAGES.labels(event=message["event"]).inc()
+            yield format_event(event_id, message["event"], message["data"])
+    finally:
+        unsubscribe(subscription)
+
+
+class ClinicalEventStream(AsyncAPIView):
+    authentication_classes = [ClaimsJWTAuthentication]
+    throttle_classes = [UserThrottle]
+    throttle_scope = "event_stream"
+    error_message = "Unable to open event stream."
+
+    async def get(self, request):
+        if not isinstance(request, ASGIRequest):
+            return envelope(
+                False,
+                "Event stream is only available on the ASGI server",
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            )
+
+        org_id = await sync_to_async(_organization_id)(request.user)
+        if org_id is None:
+            raise PermissionDenied("User is not linked to an organization")
+
+        response = StreamingHttpResponse(
+            event_stream(org_id, expires_at=request.auth.get("exp")),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        # nginx: pass events through as they are written
+        response["X-Accel-Buffering"] = "no"
+        return response
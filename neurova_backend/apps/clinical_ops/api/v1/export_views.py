@@ -7,12 +7,14 @@ from django.shortcuts import get_object_or_404
 from apps.clinical_ops.models import AssessmentOrder, Org
 from apps.clinical_ops.services.data_exporter import export_order_data
 from apps.clinical_ops.audit.logger import log_event
+from common.db_router import read_from_replica
 
 
 logger = logging.getLogger(__name__)
 
 
 class ExportOrderJSON(APIView):
+    @read_from_replica
     def get(self, request):
         try:
             org_id = request.query_params.get("org_id")
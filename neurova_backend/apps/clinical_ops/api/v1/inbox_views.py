@@ -4,6 +4,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 
+from common.db_router import read_from_replica
 from common.encryption_decorators import encrypt_response
 from apps.clinical_ops.models import AssessmentOrder
 
@@ -13,6 +14,7 @@ logger = logging.getLogger(__name__)
 class ClinicalInboxView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @read_from_replica
     @encrypt_response
     def get(self, request):
         try:
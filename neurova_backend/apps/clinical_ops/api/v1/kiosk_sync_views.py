@@ -0,0 +1,147 @@
+import logging
+
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+
+from common.encryption_decorators import decrypt_request, encrypt_response
+from common.idempotency import idempotent
+
+from apps.clinical_ops.services.kiosk_sync import (
+    ITEM_ACCEPTED,
+    ITEM_DUPLICATE,
+    ITEM_REJECTED,
+    MAX_SESSIONS_PER_BATCH,
+    ingest_sessions,
+    kiosk_sync_configured,
+    verify_batch_signature,
+)
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-Kiosk-Signature"
+
+
+# ============================================================
+# KIOSK OFFLINE SYNC
+# ============================================================
+class KioskSyncIngest(APIView):
+    """
+    Upload a signed batch of assessments completed offline on a kiosk.
+
+    Payload (decrypted): {org_id, device_id, sessions: [...]}
+    Header: X-Kiosk-Signature = HMAC-SHA256(device_id + sessions)
+    """
+    permission_classes = [IsAuthenticated]
+
+    @idempotent("staff.kiosk.sync")
+    @decrypt_request
+    @encrypt_response
+    def post(self, request):
+        if not kiosk_sync_configured():
+            return Response(
+                {
+                    "success": False,
+                    "message": "Kiosk sync is not configured on this server",
+                    "data": None,
+                },
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+        try:
+            data = request.decrypted_data
+            user_org = request.user.profile.organization
+
+            req_org_id = data.get("org_id")
+            if not req_org_id:
+                return Response(
+                    {
+                        "success": False,
+                        "message": "Organization id is required",
+                        "data": None,
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            if str(user_org.external_id) != str(req_org_id):
+                return Response(
+                    {
+                        "success": False,
+                        "message": "Unauthorized organization access",
+                        "data": None,
+                    },
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+
+            device_id = data.get("device_id")
+            sessions = data.get("sessions")
+
+            if not device_id or not isinstance(sessions, list):
+                return Response(
+                    {
+                        "success": False,
+                        "message": "device_id and sessions are required",
+                        "data": None,
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            if len(sessions) > MAX_SESSIONS_PER_BATCH:
+                return Response(
+                    {
+                        "success": False,
+                        "message": f"At most {MAX_SESSIONS_PER_BATCH} sessions per batch",
+                        "data": None,
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            signature = request.headers.get(SIGNATURE_HEADER)
+            if not verify_batch_signature(device_id, sessions, signature):
+                return Response(
+                    {
+                        "success": False,
+                        "message": "Invalid batch signature",
+                        "data": None,
+                    },
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+
+            manifest = ingest_sessions(
+                user_org,
+                sessions,
+                device_id=device_id,
+                actor_user_id=str(request.user.id),
+                request=request,
+            )
+
+            counts = {ITEM_ACCEPTED: 0, ITEM_DUPLICATE: 0, ITEM_REJECTED: 0}
+            for entry in manifest:
+                counts[entry["status"]] += 1
+
+            return Response(
+                {
+                    "success": True,
+                    "message": "Sync batch processed",
+                    "data": {
+                        "device_id": device_id,
+                        "accepted": counts[ITEM_ACCEPTED],
+                        "duplicates": counts[ITEM_DUPLICATE],
+                        "rejected": counts[ITEM_REJECTED],
+                        "items": manifest,
+                    },
+                },
+                status=status.HTTP_200_OK,
+            )
+
+        except Exception as e:
+            logger.error(f"Error ingesting kiosk sync batch: {str(e)}", exc_info=True)
+            return Response(
+                {
+                    "success": False,
+                    "message": "An unexpected error occurred while syncing kiosk sessions.",
+                    "data": None,
+                },
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
@@ -0,0 +1,215 @@
+import logging
+
+from django.shortcuts import get_object_or_404
+
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+
+from common.encryption_decorators import decrypt_request, encrypt_response
+from common.idempotency import idempotent
+from common.http_conditional import strong_etag
+
+from apps.clinical_ops.models_print_batch import PrintBatch
+from apps.clinical_ops.audit.logger import log_event
+from apps.clinical_ops.services.report_delivery import deliver_report_file
+from apps.clinical_ops.services.print_batch import (
+    MAX_ORDERS_PER_BATCH,
+    run_print_batch,
+    select_print_orders,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Larger batches are left PENDING for `manage.py process_print_batches`
+INLINE_BATCH_LIMIT = 25
+
+PRINT_ROLES = ["ADMIN", "PSYCHIATRIST", "STAFF"]
+
+
+def _batch_payload(batch):
+    return {
+        "batch_id": batch.id,
+        "status": batch.status,
+        "report_count": batch.report_count,
+        "page_count": batch.page_count,
+        "skipped": batch.skipped,
+        "pdf_sha256": batch.pdf_sha256,
+        "created_at": batch.created_at.isoformat(),
+        "completed_at": batch.completed_at.isoformat() if batch.completed_at else None,
+    }
+
+
+class CreatePrintBatch(APIView):
+    """
+    Payload (decrypted): {order_ids: [..]} or {date: "YYYY-MM-DD"}, optional rerender.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @idempotent("staff.print_batches.create")
+    @decrypt_request
+    @encrypt_response
+    def post(self, request):
+        try:
+            profile = request.user.profile
+            if profile.role not in PRINT_ROLES:
+                return Response(
+                    {
+                        "success": False,
+                        "message": "Insufficient permissions",
+                        "data": None,
+                    },
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+
+            data = request.decrypted_data
+            order_ids = data.get("order_ids") or []
+
+            if not isinstance(order_ids, list) or len(order_ids) > MAX_ORDERS_PER_BATCH:
+                return Response(
+                    {
+                        "success": False,
+                        "message": f"order_ids must be a list of at most {MAX_ORDERS_PER_BATCH} ids",
+                        "data": None,
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            try:
+                order_ids = [int(oid) for oid in order_ids]
+            except (TypeError, ValueError):
+                return Response(
+                    {
+                        "success": False,
+                        "message": "order_ids must be integers",
+                        "data": None,
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            filters = {}
+            if data.get("date"):
+                filters["date"] = str(data["date"])
+
+            batch = PrintBatch.objects.create(
+                org=profile.organization,
+                order_ids=order_ids,
+                filters=filters,
+                rerender=bool(data.get("rerender", False)),
+                created_by_user_id=str(request.user.id),
+            )
+
+            selected = select_print_orders(batch.org, batch.order_ids, batch.filters).count()
+            if selected <= INLINE_BATCH_LIMIT:
+                run_print_batch(batch)
+
+            return Response(
+                {
+                    "success": True,
+                    "message": "Print batch ready" if batch.status == PrintBatch.STATUS_COMPLETED else "Print batch queued",
+                    "data": _batch_payload(batch),
+                },
+                status=status.HTTP_201_CREATED,
+            )
+
+        except Exception as e:
+            logger.error(f"Error creating print batch: {str(e)}", exc_info=True)
+            return Response(
+                {
+                    "success": False,
+                    "message": "Unable to create print batch at this time.",
+                    "data": None,
+                },
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class PrintBatchDetail(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @encrypt_response
+    def get(self, request, batch_id):
+        batch = get_object_or_404(
+            PrintBatch,
+            id=batch_id,
+            org=request.user.profile.organization,
+        )
+        return Response(
+            {
+                "success": True,
+                "message": "Print batch status",
+                "data": _batch_payload(batch),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class DownloadPrintBatch(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, batch_id):
+        try:
+            profile = request.user.profile
+            if profile.role not in PRINT_ROLES:
+                return Response(
+                    {
+                        "success": False,
+                        "message": "Insufficient permissions",
+                        "data": None,
+                    },
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+
+            batch = PrintBatch.objects.filter(id=batch_id, org=profile.organization).first()
+            if batch is None:
+                return Response(
+                    {
+                        "success": False,
+                        "message": "Print batch not found",
+                        "data": None,
+                    },
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+
+            if batch.status != PrintBatch.STATUS_COMPLETED or not batch.merged_file:
+                return Response(
+                    {
+                        "success": False,
+                        "message": f"Print batch not ready: {batch.status}",
+                        "data": None,
+                    },
+                    status=status.HTTP_409_CONFLICT,
+                )
+
+            log_event(
+                org=batch.org,
+                event_type="PRINT_BATCH_DOWNLOAD",
+                entity_type="PrintBatch",
+                entity_id=batch.id,
+                actor_user_id=str(request.user.id),
+                actor_name=request.user.get_full_name(),
+                actor_role=profile.role,
+                request=request,
+                severity="INFO",
+            )
+
+            return deliver_report_file(
+                request,
+                batch.merged_file,
+                etag=strong_etag(batch.pdf_sha256),
+                last_modified=batch.completed_at,
+                filename=f"print_batch_{batch.id}.pdf",
+            )
+
+        except Exception as e:
+            logger.error(f"Error downloading print batch: {str(e)}", exc_info=True)
+            return Response(
+                {
+                    "success": False,
+                    "message": "Unable to download print batch at this time.",
+                    "data": None,
+                },
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
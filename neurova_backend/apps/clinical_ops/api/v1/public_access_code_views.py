@@ -5,7 +5,7 @@ from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.throttling import AnonRateThrottle
+from common.rate_limit import ClientIPThrottle, PublicTokenThrottle
 
 from apps.clinical_ops.models import AssessmentOrder
 from apps.clinical_ops.services.access_code import issue_report_access_code
@@ -18,7 +18,8 @@ logger = logging.getLogger(__name__)
 class PublicRequestReportCode(APIView):
     authentication_classes = []
     permission_classes = []
-    throttle_classes = [AnonRateThrottle]
+    throttle_scope = "public_report"
+    throttle_classes = [PublicTokenThrottle, ClientIPThrottle]
 
     def post(self, request, token):
         try:
@@ -0,0 +1,374 @@
+"""
+Async (ASGI) versions of the public patient endpoints.
+
+Served instead of the DRF views when ASYNC_PUBLIC_VIEWS is on (see
+urls.py and neurova_backend/asgi.py). Request/response contracts match
+the sync views; waiting on the DB, the audit insert or the report file
+no longer pins a worker thread per phone.
+
+PublicOrderSubmit stays the DRF view: its select_for_update transaction
+and idempotency record must run sync, and Django already runs it in a
+thread under ASGI.
+"""
+
+import logging
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import PermissionDenied
+
+from apps.clinical_ops.audit.logger import alog_event
+from apps.clinical_ops.battery_assessment_model import Battery, BatteryAssessment
+from apps.clinical_ops.models import AssessmentOrder
+from apps.clinical_ops.models_consent import ConsentRecord
+from apps.clinical_ops.models_report import AssessmentReport
+from apps.clinical_ops.services.access_code import (
+    access_code_locked,
+    clear_failed_access_codes,
+    issue_report_access_code,
+    record_failed_access_code,
+    verify_report_access_code,
+)
+from apps.clinical_ops.services.consent_text import get_consent_text
+from apps.clinical_ops.services.public_token_validator import avalidate_and_rotate_url_token
+from apps.clinical_ops.services.report_delivery import adeliver_report_file
+from apps.clinical_ops.services.report_integrity import current_pdf_sha256
+from common.async_views import AsyncPublicView, envelope
+from common.http_conditional import is_not_modified, not_modified_response, strong_etag
+
+
+logger = logging.getLogger(__name__)
+
+
+class PublicOrderBootstrapAsync(AsyncPublicView):
+    throttle_scope = "public_read"
+    error_message = "Unable to initialize order."
+
+    async def get(self, request, token):
+        # Secure validation + rotation
+        order, new_token = await avalidate_and_rotate_url_token(token, request)
+
+        # Mark started if not started
+        if order.status == order.STATUS_IN_PROGRESS:
+            await sync_to_async(order.mark_started)()
+
+        return self.respond(
+            {
+                "org_id": order.org.id,
+                "order_id": order.id,
+                "patient_id": order.patient.id,
+                "patient_name": order.patient.full_name,
+                "patient_age": order.patient.age,
+                "patient_gender": order.patient.sex,
+                "battery_code": order.battery_code,
+                "battery_version": order.battery_version,
+                "status": order.status,
+                "public_token": new_token,
+            },
+            "Order initialized successfully",
+            public_token=new_token,
+        )
+
+
+class PublicGetConsentAsync(AsyncPublicView):
+    throttle_scope = "public_read"
+    error_message = "Unable to retrieve consent at this time."
+
+    async def get(self, request, token):
+        order, new_token = await avalidate_and_rotate_url_token(token, request)
+
+        text = get_consent_text(version="V1", lang="en")
+
+        await alog_event(
+            org=order.org,
+            event_type="CONSENT_VIEWED",
+            entity_type="AssessmentOrder",
+            entity_id=order.id,
+            actor_role="Patient",
+            request=request,
+            severity="INFO"
+        )
+
+        return self.respond(
+            {
+                "consent_version": "V1",
+                "consent_language": "en",
+                "consent_text": text,
+                "public_token": new_token
+            },
+            "Consent text retrieved successfully",
+            public_token=new_token,
+        )
+
+
+class PublicSubmitConsentAsync(AsyncPublicView):
+    throttle_scope = "public_consent"
+    error_message = "Unable to capture consent at this time."
+
+    async def post(self, request, token):
+        error = self.decrypt_body(request)
+        if error:
+            return error
+
+        order, new_token = await avalidate_and_rotate_url_token(token, request)
+
+        consent_version = request.decrypted_data.get("consent_version", "V1")
+        consent_language = request.decrypted_data.get("consent_language", "en")
+        consent_given_by = request.decrypted_data.get("consent_given_by", "SELF")
+        guardian_name = request.decrypted_data.get("guardian_name")
+        allow_patient_copy = bool(request.decrypted_data.get("allow_patient_copy", False))
+
+        text = get_consent_text(consent_version, consent_language)
+
+        cr, _ = await ConsentRecord.objects.aupdate_or_create(
+            org_id=order.org_id,
+            order=order,
+            defaults={
+                "consent_version": consent_version,
+                "consent_language": consent_language,
+                "consent_given_by": consent_given_by,
+                "guardian_name": guardian_name if consent_given_by == "GUARDIAN" else None,
+                "allow_data_processing": True,
+                "allow_report_generation": True,
+                "allow_share_with_clinician": True,
+                "allow_patient_copy": allow_patient_copy,
+                "consent_text_snapshot": text,
+                "ip_address": request.META.get("REMOTE_ADDR"),
+                "user_agent": request.META.get("HTTP_USER_AGENT"),
+                "consented_at": timezone.now(),
+            }
+        )
+
+        if allow_patient_copy:
+            order.delivery_mode = order.DELIVERY_ALLOW_PATIENT_DOWNLOAD
+            await order.asave(update_fields=["delivery_mode"])
+
+        await alog_event(
+            org=order.org,
+            event_type="CONSENT_CAPTURED",
+            entity_type="AssessmentOrder",
+            entity_id=order.id,
+            actor_role="Patient",
+            details={
+                "consent_version": consent_version,
+                "consent_language": consent_language,
+                "consent_given_by": consent_given_by,
+                "allow_patient_copy": allow_patient_copy
+            },
+            request=request,
+            severity="INFO"
+        )
+
+        return self.respond(
+            {
+                "consent_version": consent_version,
+                "consent_language": consent_language,
+                "consent_given_by": consent_given_by,
+                "allow_patient_copy": allow_patient_copy,
+                "consent_id": cr.id,
+                "public_token": new_token
+            },
+            "Consent captured successfully",
+            public_token=new_token,
+        )
+
+
+class PublicQuestionDisplayAsync(AsyncPublicView):
+    throttle_scope = "public_read"
+    error_message = "Unable to retrieve questions at this time."
+
+    async def get(self, request, token):
+        order, new_token = await avalidate_and_rotate_url_token(token, request)
+
+        battery = await Battery.objects.filter(
+            battery_code=order.battery_code,
+            is_active=True
+        ).afirst()
+        if battery is None:
+            return envelope(False, "Battery not found", status_code=status.HTTP_404_NOT_FOUND)
+
+        battery_tests = (
+            BatteryAssessment.objects
+            .filter(
+                battery=battery,
+                assessment__is_active=True
+            )
+            .select_related("assessment")
+            .order_by("display_order")
+        )
+
+        tests_payload = []
+        async for bt in battery_tests:
+            assessment = bt.assessment
+            tests_payload.append({
+                "test_code": assessment.test_code,
+                "title": assessment.title,
+                "version": assessment.version,
+                "description": assessment.description,
+                "questions": assessment.questions_json.get("questions", []),
+            })
+
+        await alog_event(
+            org=order.org,
+            event_type="QUESTIONS_VIEWED",
+            entity_type="AssessmentOrder",
+            entity_id=order.id,
+            actor_role="Patient",
+            request=request,
+            severity="INFO"
+        )
+
+        return self.respond(
+            {
+                "order_id": order.id,
+                "battery": {
+                    "battery_code": battery.battery_code,
+                    "name": battery.name,
+                    "version": battery.version,
+                    "screening_label": battery.screening_label,
+                    "signoff_required": battery.signoff_required,
+                    "public_token": new_token
+                },
+                "tests": tests_payload
+            },
+            None,
+            public_token=new_token,
+        )
+
+
+class PublicRequestReportCodeAsync(AsyncPublicView):
+    throttle_scope = "public_report"
+    error_message = "Unable to issue report access code."
+
+    async def post(self, request, token):
+        order = await AssessmentOrder.objects.select_related("org").filter(
+            public_token=token,
+            deletion_status="ACTIVE",
+        ).afirst()
+        if order is None:
+            return envelope(False, "Order not found", status_code=status.HTTP_404_NOT_FOUND)
+
+        # Public link expiry check
+        if order.public_link_expires_at and timezone.now() > order.public_link_expires_at:
+            raise PermissionDenied("Link expired")
+
+        # Patient download policy
+        if order.delivery_mode != AssessmentOrder.DELIVERY_ALLOW_PATIENT_DOWNLOAD:
+            raise PermissionDenied("Patient download not allowed")
+
+        # Issue short-lived access code
+        code = await sync_to_async(issue_report_access_code)(order, minutes_valid=15)
+
+        await alog_event(
+            org=order.org,
+            event_type="REPORT_ACCESS_CODE_ISSUED",
+            entity_type="AssessmentOrder",
+            entity_id=order.id,
+            actor_role="Patient",
+            details={
+                "expires_minutes": 15,
+            },
+            request=request,
+        )
+
+        return self.respond(
+            {
+                "access_code": code,          # dev-only (remove in prod)
+                "expires_in_minutes": 15,
+                "public_token": token
+            },
+            "Report access code issued successfully",
+        )
+
+
+class PublicDownloadReportAsync(AsyncPublicView):
+    throttle_scope = "public_report"
+    error_message = "Unable to download report at this time."
+
+    async def get(self, request, token):
+        # 1. Validate & Rotate Secure Token
+        order, new_token = await avalidate_and_rotate_url_token(token, request)
+
+        # 2. Delivery policy enforcement
+        if order.delivery_mode != AssessmentOrder.DELIVERY_ALLOW_PATIENT_DOWNLOAD:
+            raise PermissionDenied("Patient download not allowed")
+
+        # 3. Optional expiry check
+        if order.public_link_expires_at and timezone.now() > order.public_link_expires_at:
+            raise PermissionDenied("Link expired")
+
+        # 4. Access code verification
+        code = request.GET.get("code")
+        if not code:
+            raise PermissionDenied("Access code required")
+
+        if await sync_to_async(access_code_locked)(order):
+            raise PermissionDenied("Access locked due to multiple failed attempts")
+
+        if not verify_report_access_code(order, code):
+            await sync_to_async(record_failed_access_code)(order)
+            await alog_event(
+                org=order.org,
+                event_type="REPORT_DOWNLOAD_FAILED",
+                entity_type="AssessmentOrder",
+                entity_id=order.id,
+                actor_role="Patient",
+                details={"reason": "Invalid access code"},
+                request=request,
+                severity="SECURITY"
+            )
+            raise PermissionDenied("Invalid access code")
+
+        await sync_to_async(clear_failed_access_codes)(order)
+
+        # 5. Fetch report
+        report = await AssessmentReport.objects.filter(order=order).afirst()
+        if not report or not report.pdf_file:
+            return envelope(False, "PDF not available", status_code=status.HTTP_404_NOT_FOUND)
+
+        # 6. Conditional request: client already holds this exact file
+        etag = strong_etag(report.pdf_sha256)
+        if etag and is_not_modified(request, etag, report.generated_at):
+            response = not_modified_response(etag, report.generated_at)
+            response["X-Public-Token"] = new_token
+            return response
+
+        # 7. Integrity Check (reads the file unless recently verified)
+        current_hash = await sync_to_async(current_pdf_sha256)(report)
+
+        if report.pdf_sha256 and current_hash != report.pdf_sha256:
+            await alog_event(
+                org=order.org,
+                event_type="REPORT_TAMPER_DETECTED",
+                entity_type="AssessmentOrder",
+                entity_id=order.id,
+                actor_role="System",
+                request=request,
+                severity="CRITICAL"
+            )
+            return envelope(False, "PDF integrity check failed", status_code=status.HTTP_409_CONFLICT)
+
+        # 8. Audit successful download
+        await alog_event(
+            org=order.org,
+            event_type="REPORT_DOWNLOAD_SUCCESS",
+            entity_type="AssessmentOrder",
+            entity_id=order.id,
+            actor_role="Patient",
+            request=request,
+            severity="INFO"
+        )
+
+        # 9. Hand off the file (async stream / proxy offload / signed URL)
+        response = await adeliver_report_file(
+            request,
+            report.pdf_file,
+            etag=strong_etag(current_hash),
+            last_modified=report.generated_at,
+            filename=f"assessment_report_{order.id}.pdf",
+        )
+
+        # Return rotated token
+        response["X-Public-Token"] = new_token
+        return response
@@ -5,10 +5,11 @@ from django.db import transaction
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.throttling import AnonRateThrottle
+from common.rate_limit import ClientIPThrottle, PublicTokenThrottle
 from rest_framework.exceptions import PermissionDenied
 
 from common.encryption_decorators import decrypt_request, encrypt_response
+from common.idempotency import idempotent
 
 from apps.clinical_ops.models import AssessmentOrder, ResponseQuality
 from apps.clinical_ops.models_assessment import AssessmentResponse, AssessmentResult
@@ -24,8 +25,10 @@ logger = logging.getLogger(__name__)
 class PublicOrderSubmit(APIView):
     authentication_classes = []
     permission_classes = []
-    throttle_classes = [AnonRateThrottle]
+    throttle_scope = "public_submit"
+    throttle_classes = [PublicTokenThrottle, ClientIPThrottle]
 
+    @idempotent("public.order.submit")
     @decrypt_request
     @encrypt_response
     @transaction.atomic
@@ -3,7 +3,7 @@ from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.throttling import AnonRateThrottle
+from common.rate_limit import ClientIPThrottle, PublicTokenThrottle
 from rest_framework.exceptions import PermissionDenied
 
 from common.encryption_decorators import encrypt_response
@@ -17,7 +17,8 @@ logger = logging.getLogger(__name__)
 class PublicOrderBootstrap(APIView):
     authentication_classes = []
     permission_classes = []
-    throttle_classes = [AnonRateThrottle]
+    throttle_scope = "public_read"
+    throttle_classes = [PublicTokenThrottle, ClientIPThrottle]
 
     @encrypt_response
     def get(self, request, token):
@@ -1,8 +1,6 @@
-import hashlib
 import logging
 
 from django.shortcuts import get_object_or_404
-from django.http import FileResponse
 from django.utils import timezone
 
 from rest_framework.views import APIView
@@ -14,7 +12,21 @@ from rest_framework.exceptions import PermissionDenied
 from apps.clinical_ops.models import AssessmentOrder
 from apps.clinical_ops.models_report import AssessmentReport
 from apps.clinical_ops.audit.logger import log_event
-from rest_framework.throttling import AnonRateThrottle
+from common.rate_limit import ClientIPThrottle, PublicTokenThrottle
+from common.http_conditional import (
+    is_not_modified,
+    not_modified_response,
+    strong_etag,
+)
+from apps.clinical_ops.services.report_delivery import deliver_report_file
+from apps.clinical_ops.services.report_integrity import current_pdf_sha256
+from apps.clinical_ops.services.access_code import (
+    access_code_locked,
+    clear_failed_access_codes,
+    record_failed_access_code,
+    verify_report_access_code,
+)
+from apps.clinical_ops.services.public_token_validator import validate_and_rotate_url_token
 
 
 logger = logging.getLogger(__name__)
@@ -83,13 +95,26 @@ class StaffDownloadReport(APIView):
                     status=status.HTTP_404_NOT_FOUND,
                 )
 
-            # Memory-safe integrity verification
-            hasher = hashlib.sha256()
-            with report.pdf_file.open("rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hasher.update(chunk)
+            # Client already holds this exact file: header exchange only
+            etag = strong_etag(report.pdf_sha256)
+            if etag and is_not_modified(request, etag, report.generated_at):
+                log_event(
+                    org=org,
+                    event_type="STAFF_REPORT_DOWNLOAD",
+                    entity_type="AssessmentOrder",
+                    entity_id=order.id,
+                    actor_user_id=str(user.id),
+                    actor_name=user.get_full_name(),
+                    actor_role=user.profile.role,
+                    details={"not_modified": True},
+                    request=request,
+                    severity="INFO"
+                )
+                return not_modified_response(etag, report.generated_at)
 
-            current_hash = hasher.hexdigest()
+            # Memory-safe integrity verification
+            # (skips the full read if the background sweep verified it recently)
+            current_hash = current_pdf_sha256(report)
 
             if report.pdf_sha256 and current_hash != report.pdf_sha256:
                 log_event(
@@ -112,6 +137,11 @@ class StaffDownloadReport(APIView):
                     status=status.HTTP_409_CONFLICT,
                 )
 
+            if not report.pdf_sha256:
+                # Reports generated before the hash was persisted
+                report.pdf_sha256 = current_hash
+                report.save(update_fields=["pdf_sha256"])
+
             # Audit successful download
             log_event(
                 org=org,
@@ -125,17 +155,14 @@ class StaffDownloadReport(APIView):
                 severity="INFO"
             )
 
-            response = FileResponse(
-                report.pdf_file.open("rb"),
-                content_type="application/pdf",
+            return deliver_report_file(
+                request,
+                report.pdf_file,
+                etag=strong_etag(current_hash),
+                last_modified=report.generated_at,
+                filename=f"assessment_report_{order.id}.pdf",
             )
 
-            response["Content-Disposition"] = (
-                f'attachment; filename="assessment_report_{order.id}.pdf"'
-            )
-
-            return response
-
         except PermissionDenied as e:
             return Response(
                 {
@@ -158,13 +185,11 @@ class StaffDownloadReport(APIView):
             )
 
 
-MAX_ACCESS_ATTEMPTS = 5
-
-
 class PublicDownloadReport(APIView):
     authentication_classes = []
     permission_classes = []
-    throttle_classes = [AnonRateThrottle]
+    throttle_scope = "public_report"
+    throttle_classes = [PublicTokenThrottle, ClientIPThrottle]
 
     def get(self, request, token):
 
@@ -187,18 +212,13 @@ class PublicDownloadReport(APIView):
                 raise PermissionDenied("Access code required")
 
             # Lock protection
-            if getattr(order, "report_access_locked", False):
+            if access_code_locked(order):
                 raise PermissionDenied("Access locked due to multiple failed attempts")
 
             if not verify_report_access_code(order, code):
 
-                # Increment failure counter
-                order.report_failed_attempts = getattr(order, "report_failed_attempts", 0) + 1
-
-                if order.report_failed_attempts >= MAX_ACCESS_ATTEMPTS:
-                    order.report_access_locked = True
-
-                order.save(update_fields=["report_failed_attempts", "report_access_locked"])
+                # Increment failure counter (shared rate-limit store)
+                record_failed_access_code(order)
 
                 log_event(
                     org=order.org,
@@ -214,8 +234,7 @@ class PublicDownloadReport(APIView):
                 raise PermissionDenied("Invalid access code")
 
             # Reset failed attempts on success
-            order.report_failed_attempts = 0
-            order.save(update_fields=["report_failed_attempts"])
+            clear_failed_access_codes(order)
 
             # 5. Fetch report
             report = AssessmentReport.objects.filter(order=order).first()
@@ -230,13 +249,16 @@ class PublicDownloadReport(APIView):
                     status=status.HTTP_404_NOT_FOUND,
                 )
 
-            # 6. Integrity Check (Memory-safe)
-            hasher = hashlib.sha256()
-            with report.pdf_file.open("rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hasher.update(chunk)
+            # 6. Conditional request: client already holds this exact file
+            etag = strong_etag(report.pdf_sha256)
+            if etag and is_not_modified(request, etag, report.generated_at):
+                response = not_modified_response(etag, report.generated_at)
+                response["X-Public-Token"] = new_token
+                return response
 
-            current_hash = hasher.hexdigest()
+            # 7. Integrity Check (Memory-safe)
+            # (skips the full read if the background sweep verified it recently)
+            current_hash = current_pdf_sha256(report)
 
             if report.pdf_sha256 and current_hash != report.pdf_sha256:
                 log_event(
@@ -258,7 +280,7 @@ class PublicDownloadReport(APIView):
                     status=status.HTTP_409_CONFLICT,
                 )
 
-            # 7. Audit successful download
+            # 8. Audit successful download
             log_event(
                 org=order.org,
                 event_type="REPORT_DOWNLOAD_SUCCESS",
@@ -269,14 +291,13 @@ class PublicDownloadReport(APIView):
                 severity="INFO"
             )
 
-            # 8. Return file
-            response = FileResponse(
-                report.pdf_file.open("rb"),
-                content_type="application/pdf",
-            )
-
-            response["Content-Disposition"] = (
-                f'attachment; filename="assessment_report_{order.id}.pdf"'
+            # 9. Hand off the file (stream / proxy offload / signed URL)
+            response = deliver_report_file(
+                request,
+                report.pdf_file,
+                etag=strong_etag(current_hash),
+                last_modified=report.generated_at,
+                filename=f"assessment_report_{order.id}.pdf",
             )
 
             # Return rotated token
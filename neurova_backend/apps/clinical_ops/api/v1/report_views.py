@@ -9,6 +9,8 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 
 from common.encryption_decorators import decrypt_request, encrypt_response
+from common.idempotency import idempotent
+from common.metrics import timed
 
 from apps.clinical_ops.models import AssessmentOrder
 from core.models import Organization
@@ -28,6 +30,7 @@ logger = logging.getLogger(__name__)
 class GenerateReportPDF(APIView):
     permission_classes = [IsAuthenticated]
 
+    @idempotent("staff.reports.generate")
     @decrypt_request
     @encrypt_response
     @transaction.atomic
@@ -104,7 +107,8 @@ class GenerateReportPDF(APIView):
             )
             
             ctx = build_report_context(order)
-            pdf_bytes = generate_report_pdf_bytes_v2(ctx)
+            with timed("pdf_render"):
+                pdf_bytes = generate_report_pdf_bytes_v2(ctx)
 
             print(pdf_bytes)
 
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 from apps.clinical_ops.api.v1.views import CreatePatient, CreateOrder, ClinicQueue
 from apps.clinical_ops.api.v1.public_views import PublicOrderBootstrap
@@ -11,15 +12,30 @@ from apps.clinical_ops.api.v1.consent_views import PublicGetConsent, PublicSubmi
 from apps.clinical_ops.api.v1.public_access_code_views import PublicRequestReportCode
 from apps.clinical_ops.api.v1.deletion_views import AdminApproveDeletion, StaffDeleteOrder
 from apps.clinical_ops.api.v1.inbox_views import ClinicalInboxView
+from apps.clinical_ops.api.v1.event_stream_views import ClinicalEventStream
 from apps.clinical_ops.api.v1.clinical_review import ClinicalReviewDetailView
 from apps.clinical_ops.api.v1.display_questions import PublicQuestionDisplay
 from apps.clinical_ops.api.v1.patient_acceptance_views import PatientAcceptRejectOrder
+from apps.clinical_ops.api.v1.kiosk_sync_views import KioskSyncIngest
+from apps.clinical_ops.api.v1.print_batch_views import CreatePrintBatch, PrintBatchDetail, DownloadPrintBatch
+
+if settings.ASYNC_PUBLIC_VIEWS:
+    # Native async patient endpoints for ASGI deployments (public_async_views.py)
+    from apps.clinical_ops.api.v1.public_async_views import (  # noqa: F811
+        PublicDownloadReportAsync as PublicDownloadReport,
+        PublicGetConsentAsync as PublicGetConsent,
+        PublicOrderBootstrapAsync as PublicOrderBootstrap,
+        PublicQuestionDisplayAsync as PublicQuestionDisplay,
+        PublicRequestReportCodeAsync as PublicRequestReportCode,
+        PublicSubmitConsentAsync as PublicSubmitConsent,
+    )
 
 
 urlpatterns = [
     path("staff/patients/create", CreatePatient.as_view()),
     path("staff/orders/create", CreateOrder.as_view()),
     path("staff/queue", ClinicQueue.as_view()),
+    path("staff/kiosk/sync", KioskSyncIngest.as_view()),
     path("public/order/<str:token>", PublicOrderBootstrap.as_view()),
 
     path("staff/order/<int:order_id>/export", ExportOrderJSON.as_view()),
@@ -30,8 +46,12 @@ urlpatterns = [
     path("public/order/<str:token>/submit", PublicOrderSubmit.as_view()),
     path("staff/reports/generate", GenerateReportPDF.as_view()),
     path("staff/reports/download", StaffDownloadReport.as_view()),
+    path("staff/print-batches/create", CreatePrintBatch.as_view()),
+    path("staff/print-batches/<int:batch_id>", PrintBatchDetail.as_view()),
+    path("staff/print-batches/<int:batch_id>/download", DownloadPrintBatch.as_view()),
 
     path("staff/inbox", ClinicalInboxView.as_view()),
+    path("staff/events/stream", ClinicalEventStream.as_view()),
     path("staff/order/<int:order_id>/review", ClinicalReviewDetailView.as_view()),
 
     path("staff/orders/deliver", SetDeliveryAndMarkDelivered.as_view()),
@@ -11,7 +11,9 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 
+from common.db_router import read_from_replica
 from common.encryption_decorators import decrypt_request, encrypt_response
+from common.idempotency import idempotent
 
 from apps.clinical_ops.models import Patient, AssessmentOrder
 from apps.clinical_ops.api.v1.serializers import (
@@ -20,7 +22,7 @@ from apps.clinical_ops.api.v1.serializers import (
 )
 
 from apps.clinical_ops.services.retention_policy import compute_retention_date
-from backend.clinical.policies.services import get_or_create_policy
+from backend.clinical.policies.services import get_policy
 from apps.clinical_ops.models_public_token import PublicAccessToken
 
 
@@ -40,6 +42,7 @@ def _make_token():
 class CreatePatient(APIView):
     permission_classes = [IsAuthenticated]
 
+    @idempotent("staff.patients.create")
     @decrypt_request
     @encrypt_response
     def post(self, request):
@@ -186,6 +189,7 @@ class CreatePatient(APIView):
 class CreateOrder(APIView):
     permission_classes = [IsAuthenticated]
 
+    @idempotent("staff.orders.create")
     @decrypt_request
     @encrypt_response
     def post(self, request):
@@ -236,7 +240,7 @@ class CreateOrder(APIView):
             raw_token = PublicAccessToken.generate_raw_token()
             token = raw_token  # Unified token for legacy field too
 
-            policy = get_or_create_policy(user_org.id)
+            policy = get_policy(user_org.id)
             expires = timezone.now() + timedelta(
                 hours=policy.token_validity_hours if policy else 48
             )
@@ -311,6 +315,7 @@ class CreateOrder(APIView):
 class ClinicQueue(APIView):
     permission_classes = [IsAuthenticated]
 
+    @read_from_replica
     @encrypt_response
     def get(self, request):
         try:
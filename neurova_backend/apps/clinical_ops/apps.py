@@ -2,3 +2,6 @@ from django.apps import AppConfig
 
 class ClinicalOpsConfig(AppConfig):
     name = "apps.clinical_ops"
+
+    def ready(self):
+        from apps.clinical_ops import signals  # noqa
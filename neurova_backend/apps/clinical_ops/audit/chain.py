@@ -0,0 +1,178 @@
+"""
+Hash chain over AuditEvent rows.
+
+Inserts stay cheap: log_event() writes plain rows. A single sealer
+(`manage.py seal_audit_log`) later takes unsealed events in
+(created_at, id) order and links each one to its predecessor:
+
+    chain_hash[n] = sha256(chain_hash[n-1] + "\\n" + canonical(event n))
+    chain_hash[0] = GENESIS_HASH
+
+chain_seq numbers events in seal order. Every sealed batch records an
+AuditChainCheckpoint with the chain head, so `manage.py
+verify_audit_chain` can verify everything or resume from a checkpoint.
+Editing, deleting or reordering any sealed row breaks every later hash.
+"""
+
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from apps.clinical_ops.audit.models import AuditChainCheckpoint, AuditEvent
+from common.db_locks import advisory_xact_lock
+
+GENESIS_HASH = "0" * 64
+SEAL_LOCK = "audit_chain_seal"
+DEFAULT_SEAL_BATCH = 5000
+
+CHAINED_FIELDS = (
+    "id",
+    "org_id",
+    "event_type",
+    "entity_type",
+    "entity_id",
+    "actor_user_id",
+    "actor_name",
+    "actor_role",
+    "ip_address",
+    "user_agent",
+    "request_path",
+    "severity",
+    "details",
+    "app_version",
+    "created_at",
+)
+
+
+def canonical_event(row: dict) -> bytes:
+    payload = {field: row[field] for field in CHAINED_FIELDS}
+    return json.dumps(
+        payload,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        cls=DjangoJSONEncoder,
+    ).encode("utf-8")
+
+
+def link(prev_hash: str, row: dict) -> str:
+    return hashlib.sha256(prev_hash.encode("ascii") + b"\n" + canonical_event(row)).hexdigest()
+
+
+def chain_head():
+    """(last_seq, last_hash) of the sealed chain."""
+    last = (
+        AuditEvent.objects
+        .filter(chain_seq__isnull=False)
+        .order_by("-chain_seq")
+        .values_list("chain_seq", "chain_hash")
+        .first()
+    )
+    return last if last else (0, GENESIS_HASH)
+
+
+@transaction.atomic
+def seal_batch(batch_size=DEFAULT_SEAL_BATCH):
+    """
+    Seal up to batch_size unsealed events. Returns the checkpoint, or
+    None when nothing was pending. Concurrent sealers queue on an
+    advisory lock, so the chain is only ever extended by one writer.
+    """
+    advisory_xact_lock(SEAL_LOCK)
+
+    rows = list(
+        AuditEvent.objects
+        .filter(chain_seq__isnull=True)
+        .order_by("created_at", "id")
+        .values(*CHAINED_FIELDS)[:batch_size]
+    )
+    if not rows:
+        return None
+
+    seq, head = chain_head()
+    first_seq = seq + 1
+
+    sealed = []
+    for row in rows:
+        seq += 1
+        head = link(head, row)
+        sealed.append(AuditEvent(id=row["id"], chain_seq=seq, chain_hash=head))
+
+    AuditEvent.objects.bulk_update(sealed, ["chain_seq", "chain_hash"], batch_size=1000)
+
+    return AuditChainCheckpoint.objects.create(
+        first_seq=first_seq,
+        last_seq=seq,
+        last_event_id=rows[-1]["id"],
+        chain_hash=head,
+        event_count=len(rows),
+        sealed_at=timezone.now(),
+    )
+
+
+def verify_chain(from_checkpoint=None, chunk_size=5000, progress=None):
+    """
+    Stream the sealed chain in chain_seq order and recompute it.
+
+    Returns a dict: {"ok", "verified", "last_seq", "break"} where break
+    describes the first problem found (None when intact).
+    """
+    if from_checkpoint is not None:
+        expected_seq, prev = from_checkpoint.last_seq + 1, from_checkpoint.chain_hash
+    else:
+        expected_seq, prev = 1, GENESIS_HASH
+
+    checkpoints = dict(
+        AuditChainCheckpoint.objects
+        .filter(last_seq__gte=expected_seq)
+        .values_list("last_seq", "chain_hash")
+    )
+
+    rows = (
+        AuditEvent.objects
+        .filter(chain_seq__gte=expected_seq)
+        .order_by("chain_seq")
+        .values(*CHAINED_FIELDS, "chain_seq", "chain_hash")
+        .iterator(chunk_size=chunk_size)
+    )
+
+    verified = 0
+    for row in rows:
+        seq = row["chain_seq"]
+        if seq != expected_seq:
+            return _broken(verified, expected_seq - 1, "GAP", expected_seq, None,
+                           f"sequence {expected_seq} missing (next present: {seq})")
+
+        prev = link(prev, row)
+        if prev != row["chain_hash"]:
+            return _broken(verified, seq - 1, "HASH_MISMATCH", seq, row["id"],
+                           "event content or order does not match its chain hash")
+
+        if seq in checkpoints and checkpoints[seq] != prev:
+            return _broken(verified, seq - 1, "CHECKPOINT_MISMATCH", seq, row["id"],
+                           "chain head differs from the sealed checkpoint")
+
+        verified += 1
+        expected_seq += 1
+        if progress and verified % 100000 == 0:
+            progress(verified, seq)
+
+    last_seq = expected_seq - 1
+    last_checkpoint = max(checkpoints) if checkpoints else None
+    if last_checkpoint is not None and last_checkpoint > last_seq:
+        return _broken(verified, last_seq, "TRUNCATED", last_seq + 1, None,
+                       f"checkpoint covers seq {last_checkpoint} but chain ends at {last_seq}")
+
+    return {"ok": True, "verified": verified, "last_seq": last_seq, "break": None}
+
+
+def _broken(verified, last_good_seq, kind, seq, event_id, message):
+    return {
+        "ok": False,
+        "verified": verified,
+        "last_seq": last_good_seq,
+        "break": {"kind": kind, "chain_seq": seq, "event_id": event_id, "message": message},
+    }
@@ -1,4 +1,7 @@
+from asgiref.sync import sync_to_async
+
 from apps.clinical_ops.audit.models import AuditEvent
+from common.metrics import AUDIT_EVENTS_WRITTEN, timed
 
 def log_event(
     *,
@@ -14,13 +17,52 @@ def log_event(
     severity="INFO",
     app_version=None  # Regulatory: track app version
 ):
+    with timed("audit_write"):
+        AuditEvent.objects.create(
+            **build_event(
+                org=org,
+                event_type=event_type,
+                entity_type=entity_type,
+                entity_id=entity_id,
+                actor_user_id=actor_user_id,
+                actor_name=actor_name,
+                actor_role=actor_role,
+                details=details,
+                request=request,
+                severity=severity,
+                app_version=app_version,
+            )
+        )
+    AUDIT_EVENTS_WRITTEN.inc()
+
+
+async def alog_event(**kwargs):
+    """log_event for async views (the audit chain insert stays sync)."""
+    await sync_to_async(log_event)(**kwargs)
+
+
+def build_event(
+    *,
+    org=None,
+    event_type,
+    entity_type=None,
+    entity_id=None,
+    actor_user_id=None,
+    actor_name=None,
+    actor_role=None,
+    details=None,
+    request=None,
+    severity="INFO",
+    app_version=None
+):
+    """Field values for one AuditEvent row (shared by log_event and log_events)."""
     from django.conf import settings
-    
+
     # Get app version from settings if not provided
     if app_version is None:
         app_version = getattr(settings, 'APP_VERSION', '1.0')
 
-    AuditEvent.objects.create(
+    return dict(
         org=org,
         event_type=event_type,
         entity_type=entity_type,
@@ -35,3 +77,19 @@ def log_event(
         severity=severity,
         app_version=app_version  # Regulatory: store app version
     )
+
+
+def log_events(events, request=None):
+    """
+    Bulk variant of log_event for batch jobs: one INSERT for many events.
+    Each item takes the same keyword arguments as log_event.
+    """
+    rows = [
+        AuditEvent(**build_event(request=request, **event))
+        for event in events
+    ]
+    if rows:
+        with timed("audit_write"):
+            AuditEvent.objects.bulk_create(rows)
+        AUDIT_EVENTS_WRITTEN.inc(len(rows))
+    return rows
@@ -1,4 +1,6 @@
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 from core.models import Organization
 
@@ -34,9 +36,33 @@ class AuditEvent(models.Model):
 
     created_at = models.DateTimeField(default=timezone.now)
 
+    # Tamper evidence: assigned by the batch sealer (audit/chain.py), never on insert
+    chain_seq = models.BigIntegerField(null=True, blank=True, unique=True)
+    chain_hash = models.CharField(max_length=64, null=True, blank=True)
+
     class Meta:
         indexes = [
             models.Index(fields=["org", "event_type", "created_at"]),
             models.Index(fields=["org", "entity_type", "entity_id"]),
             models.Index(fields=["event_type", "created_at"]),
+            models.Index(
+                fields=["created_at", "id"],
+                condition=Q(chain_seq__isnull=True),
+                name="audit_unsealed_idx",
+            ),
         ]
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None and self.chain_seq is not None:
+            raise ValidationError("Sealed audit events are append-only")
+        return super().save(*args, **kwargs)
+
+
+class AuditChainCheckpoint(models.Model):
+    """Chain head after each sealed batch; lets verification resume mid-chain."""
+    first_seq = models.BigIntegerField()
+    last_seq = models.BigIntegerField(unique=True)
+    last_event_id = models.BigIntegerField()
+    chain_hash = models.CharField(max_length=64)
+    event_count = models.PositiveIntegerField()
+    sealed_at = models.DateTimeField(default=timezone.now)
@@ -0,0 +1,88 @@
+"""
+Benchmark offline kiosk sync ingestion.
+Usage: python manage.py bench_kiosk_sync --org-code <CODE> [--sessions 2000] [--batch-size 500] [--keep]
+
+Creates synthetic kiosk orders, ingests them through ingest_sessions()
+in batches and reports throughput. Everything is rolled back unless
+--keep is given.
+"""
+
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.clinical_ops.models import AssessmentOrder, Patient
+from apps.clinical_ops.services.kiosk_sync import MAX_SESSIONS_PER_BATCH, ingest_sessions
+from core.models import Organization
+
+BENCH_BATTERY = "MENTAL_HEALTH_CORE_V1"
+
+
+def _answers():
+    answers = [{"question_id": f"phq9_q{i}", "value": i % 4} for i in range(1, 10)]
+    answers += [{"question_id": f"gad7_q{i}", "value": (i + 1) % 4} for i in range(1, 8)]
+    return answers
+
+
+class Command(BaseCommand):
+    help = "Benchmark kiosk sync ingestion throughput (sessions/minute)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org-code", required=True)
+        parser.add_argument("--sessions", type=int, default=2000)
+        parser.add_argument("--batch-size", type=int, default=MAX_SESSIONS_PER_BATCH)
+        parser.add_argument("--keep", action="store_true", help="Commit generated data")
+
+    def handle(self, *args, **options):
+        org = Organization.objects.filter(code=options["org_code"]).first()
+        if org is None:
+            raise CommandError(f"Organization {options['org_code']} not found")
+
+        total = options["sessions"]
+        batch_size = min(options["batch_size"], MAX_SESSIONS_PER_BATCH)
+
+        with transaction.atomic():
+            patient = Patient.objects.create(org=org, full_name="Kiosk Bench", age=30, sex="OTHER")
+            orders = AssessmentOrder.objects.bulk_create(
+                AssessmentOrder(
+                    org=org,
+                    patient=patient,
+                    battery_code=BENCH_BATTERY,
+                    administration_mode=AssessmentOrder.MODE_KIOSK,
+                    status=AssessmentOrder.STATUS_IN_PROGRESS,
+                )
+                for _ in range(total)
+            )
+
+            submitted_at = timezone.now().isoformat()
+            sessions = [
+                {
+                    "client_session_id": str(uuid.uuid4()),
+                    "order_id": order.id,
+                    "answers": _answers(),
+                    "duration_seconds": 300,
+                    "submitted_at": submitted_at,
+                }
+                for order in orders
+            ]
+
+            accepted = 0
+            started = time.perf_counter()
+            for i in range(0, total, batch_size):
+                manifest = ingest_sessions(org, sessions[i:i + batch_size], device_id="bench")
+                accepted += sum(1 for m in manifest if m["status"] == "ACCEPTED")
+            elapsed = time.perf_counter() - started
+
+            if not options["keep"]:
+                transaction.set_rollback(True)
+
+        rate = accepted / elapsed * 60 if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Ingested {accepted}/{total} sessions in {elapsed:.2f}s "
+                f"({rate:,.0f} sessions/minute, batch size {batch_size})"
+            )
+        )
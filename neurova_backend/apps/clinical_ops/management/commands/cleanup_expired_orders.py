@@ -2,25 +2,49 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 
 from apps.clinical_ops.models import AssessmentOrder
+from common.db_locks import advisory_lock
 
 
 class Command(BaseCommand):
     help = "Cancel stale/expired assessment orders"
 
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
     def handle(self, *args, **options):
-        now = timezone.now()
-
-        qs = AssessmentOrder.objects.filter(
-            public_link_expires_at__lt=now,
-            status__in=[
-                AssessmentOrder.STATUS_CREATED,
-                AssessmentOrder.STATUS_IN_PROGRESS,
-            ],
-        )
+        batch_size = options["batch_size"]
+
+        with advisory_lock("clinical_ops.cleanup_expired_orders") as acquired:
+            if not acquired:
+                self.stdout.write(self.style.WARNING("Another cleanup_expired_orders is running; skipping"))
+                return
+
+            now = timezone.now()
+            # Uses the (status, public_link_expires_at) index
+            qs = AssessmentOrder.objects.filter(
+                public_link_expires_at__lt=now,
+                status__in=[
+                    AssessmentOrder.STATUS_CREATED,
+                    AssessmentOrder.STATUS_IN_PROGRESS,
+                ],
+            )
+
+            last_id = 0
+            count = 0
+            while True:
+                ids = list(qs.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:batch_size])
+                if not ids:
+                    break
+                last_id = ids[-1]
 
-        count = qs.count()
-        qs.update(status=AssessmentOrder.STATUS_CANCELLED)
+                # Conditions re-applied so an order submitted meanwhile is left alone
+                count += qs.filter(id__in=ids).update(
+                    status=AssessmentOrder.STATUS_CANCELLED,
+                    updated_at=timezone.now(),
+                )
+                self.stdout.write(f"Cancelled {count} expired orders so far")
 
+        self.rows_affected = count
         self.stdout.write(
             self.style.SUCCESS(f"Cancelled {count} expired orders")
         )
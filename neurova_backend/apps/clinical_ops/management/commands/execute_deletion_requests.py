@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from apps.clinical_ops.models_deletion import DeletionRequest
+from apps.clinical_ops.services.deletion_executor import DEFAULT_BATCH_SIZE, execute_deletions
+from common.db_locks import advisory_lock
+
+
+class Command(BaseCommand):
+    help = "Execute approved deletion requests in batches and purge their stored report files"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument(
+            "--approve-system",
+            action="store_true",
+            help="Also approve and execute SYSTEM (retention) requests still in REQUESTED",
+        )
+
+    def handle(self, *args, **options):
+        with advisory_lock("clinical_ops.execute_deletion_requests") as acquired:
+            if not acquired:
+                self.stdout.write(self.style.WARNING("Another execute_deletion_requests is running; skipping"))
+                return
+
+            pending = Q(status="APPROVED")
+            if options["approve_system"]:
+                pending |= Q(status="REQUESTED", requested_by="SYSTEM")
+
+            ids = list(DeletionRequest.objects.filter(pending).order_by("id").values_list("id", flat=True))
+
+            executed = execute_deletions(
+                ids,
+                batch_size=options["batch_size"],
+                approve=options["approve_system"],
+                wait_for_purge=True,
+                progress=lambda n: self.stdout.write(f"Executed {n}/{len(ids)} deletion requests"),
+            )
+
+        self.rows_affected = executed
+        self.stdout.write(self.style.SUCCESS(f"Deletion run complete: {executed} requests executed"))
@@ -0,0 +1,79 @@
+"""
+Generate deterministic synthetic data for scale testing.
+Usage: python manage.py generate_synthetic_data [--orgs 5] [--patients 1000] [--orders 5000]
+           [--audit-events 50000] [--seed 0] [--end-date YYYY-MM-DD] [--days 365]
+           [--chunk-size 5000] [--with-pdfs] [--prefix SYN] [--purge]
+
+Same seed, end date and scale produce the same rows. --purge deletes
+organizations generated earlier with the prefix first (scratch
+databases only).
+"""
+
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.clinical_ops.services.synthetic_data import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_PREFIX,
+    SyntheticDataGenerator,
+    purge,
+)
+from core.models import Organization
+
+
+class Command(BaseCommand):
+    help = "Create synthetic organizations, patients, orders, reports and audit events"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orgs", type=int, default=5)
+        parser.add_argument("--patients", type=int, default=1000)
+        parser.add_argument("--orders", type=int, default=5000)
+        parser.add_argument("--audit-events", type=int, default=50000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--end-date", type=date.fromisoformat, default=None, help="Last day of generated activity (default today)")
+        parser.add_argument("--days", type=int, default=365, help="Days of history before --end-date")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per bulk_create transaction")
+        parser.add_argument("--with-pdfs", action="store_true", help="Store a tiny PDF for every report")
+        parser.add_argument("--prefix", default=DEFAULT_PREFIX, help="Organization code prefix")
+        parser.add_argument("--purge", action="store_true", help="Delete previously generated data with this prefix first")
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"]
+        if options["orders"] and not options["patients"]:
+            raise CommandError("--orders needs at least one patient")
+        if options["patients"] and not options["orgs"]:
+            raise CommandError("--patients needs at least one organization")
+
+        if options["purge"]:
+            deleted = purge(prefix)
+            self.stdout.write(f"Purged {deleted} rows generated with prefix {prefix}")
+        elif Organization.objects.filter(code__startswith=f"{prefix}-").exists():
+            raise CommandError(f"Synthetic organizations with prefix {prefix} exist; use --purge or another --prefix")
+
+        generator = SyntheticDataGenerator(
+            seed=options["seed"],
+            end_date=options["end_date"],
+            days=options["days"],
+            chunk_size=options["chunk_size"],
+            prefix=prefix,
+            with_pdfs=options["with_pdfs"],
+            progress=self.stdout.write,
+        )
+
+        started = time.perf_counter()
+        counts = generator.generate(
+            orgs=options["orgs"],
+            patients=options["patients"],
+            orders=options["orders"],
+            audit_events=options["audit_events"],
+        )
+        elapsed = time.perf_counter() - started
+
+        self.rows_affected = sum(counts.values())
+        for model, count in counts.items():
+            self.stdout.write(f"  {model}: {count}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Generated {self.rows_affected} rows in {elapsed:.1f}s (seed {options['seed']})")
+        )
@@ -0,0 +1,40 @@
+"""
+Render queued print batches.
+Usage: python manage.py process_print_batches [--workers 4] [--limit 10]
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.clinical_ops.models_print_batch import PrintBatch
+from apps.clinical_ops.services.print_batch import DEFAULT_WORKERS, run_print_batch
+
+
+class Command(BaseCommand):
+    help = "Merge report PDFs for pending print batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+        parser.add_argument("--limit", type=int, default=10)
+
+    def handle(self, *args, **options):
+        pending = (
+            PrintBatch.objects
+            .filter(status=PrintBatch.STATUS_PENDING)
+            .select_related("org")
+            .order_by("created_at")[:options["limit"]]
+        )
+
+        done = failed = 0
+        for batch in pending:
+            try:
+                run_print_batch(batch, workers=options["workers"])
+                done += 1
+                self.stdout.write(
+                    f"Batch {batch.id}: {batch.report_count} reports, {batch.page_count} pages"
+                )
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"Batch {batch.id} failed: {e}")
+
+        self.rows_affected = done
+        self.stdout.write(self.style.SUCCESS(f"Processed {done} print batches ({failed} failed)"))
@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.clinical_ops.models_print_batch import PrintBatch
+from apps.clinical_ops.models_report import AssessmentReport
+from apps.clinical_ops.services.deletion_executor import purge_storage_objects
+
+PREFIXES = {
+    "clinical_reports": (AssessmentReport, "pdf_file"),
+    "print_batches": (PrintBatch, "merged_file"),
+}
+
+
+def walk_storage(storage, prefix):
+    dirs, files = storage.listdir(prefix)
+    for name in files:
+        yield f"{prefix}/{name}"
+    for sub in dirs:
+        yield from walk_storage(storage, f"{prefix}/{sub}")
+
+
+class Command(BaseCommand):
+    help = "Diff stored report files against the database and optionally delete orphans"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--delete", action="store_true", help="Delete orphaned files (default: report only)")
+        parser.add_argument(
+            "--min-age-hours",
+            type=int,
+            default=24,
+            help="Ignore orphans newer than this (their row may not be committed yet)",
+        )
+
+    def handle(self, *args, **options):
+        storage = default_storage
+        cutoff = timezone.now() - timedelta(hours=options["min_age_hours"])
+        orphans = []
+
+        for prefix, (model, field) in PREFIXES.items():
+            known = set(
+                model.objects.exclude(**{field: ""}).exclude(**{f"{field}__isnull": True})
+                .values_list(field, flat=True).iterator(chunk_size=5000)
+            )
+
+            try:
+                stored = set(walk_storage(storage, prefix))
+            except FileNotFoundError:
+                stored = set()
+
+            missing = known - stored
+            found = 0
+            for name in sorted(stored - known):
+                if storage.get_modified_time(name) > cutoff:
+                    continue
+                orphans.append(name)
+                found += 1
+
+            self.stdout.write(
+                f"{prefix}: {len(stored)} stored, {len(known)} referenced, "
+                f"{found} orphaned, {len(missing)} missing"
+            )
+            for name in sorted(missing):
+                self.stdout.write(self.style.WARNING(f"  missing: {name}"))
+
+        for name in orphans:
+            self.stdout.write(f"  orphan: {name}")
+
+        if options["delete"] and orphans:
+            failed = purge_storage_objects(orphans, storage=storage)
+            self.stdout.write(self.style.SUCCESS(f"Deleted {len(orphans) - len(failed)} orphaned files"))
+            if failed:
+                self.stdout.write(self.style.ERROR(f"{len(failed)} files could not be deleted"))
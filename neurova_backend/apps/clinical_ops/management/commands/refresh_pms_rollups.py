@@ -0,0 +1,28 @@
+"""
+Update PMS daily rollups from the last high-water mark.
+Usage: python manage.py refresh_pms_rollups [--full]
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.clinical_ops.services.pms_rollup import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = "Incrementally refresh post-market surveillance daily rollups"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Rebuild every bucket from source")
+
+    def handle(self, *args, **options):
+        stats = refresh_rollups(full=options["full"])
+        if stats is None:
+            self.stdout.write(self.style.WARNING("Another rollup refresh is running; skipping"))
+            return
+
+        self.rows_affected = stats["rows"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Refreshed {stats['days']} days across {stats['orgs']} orgs ({stats['rows']} rollup rows)"
+            )
+        )
@@ -1,22 +1,78 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Exists, OuterRef
 from django.utils import timezone
+
 from apps.clinical_ops.models import AssessmentOrder
 from apps.clinical_ops.models_deletion import DeletionRequest
+from common.db_locks import advisory_lock
+
+RETENTION_REASON = "Retention period expired"
+
 
 class Command(BaseCommand):
     help = "Mark expired records for deletion"
 
-    def handle(self, *args, **kwargs):
-        now = timezone.now()
-        qs = AssessmentOrder.objects.filter(
-            deletion_status="ACTIVE",
-            data_retention_until__lt=now
-        )
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        with advisory_lock("clinical_ops.retention_sweep") as acquired:
+            if not acquired:
+                self.stdout.write(self.style.WARNING("Another retention_sweep is running; skipping"))
+                return
 
-        for order in qs:
-            DeletionRequest.objects.get_or_create(
-                org=order.org,
-                order=order,
-                requested_by="SYSTEM",
-                defaults={"reason":"Retention period expired"}
+            now = timezone.now()
+            # Uses the (deletion_status, data_retention_until) index; keyset-paginated by id.
+            # Only open requests count: a rejected or executed one must not block a new request.
+            open_requests = DeletionRequest.objects.filter(
+                order_id=OuterRef("pk"), status__in=DeletionRequest.OPEN_STATUSES
             )
+            expired = (
+                AssessmentOrder.objects
+                .filter(deletion_status="ACTIVE", data_retention_until__lt=now)
+                .annotate(has_request=Exists(open_requests))
+                .order_by("id")
+            )
+
+            last_id = 0
+            scanned = created = 0
+            while True:
+                rows = list(expired.filter(id__gt=last_id).values_list("id", "org_id", "has_request")[:batch_size])
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                scanned += len(rows)
+
+                # One open deletion request per order, whoever raised it. has_request
+                # skips the known ones; the partial unique constraint drops any
+                # request another writer opened since this batch was read.
+                candidates = [
+                    DeletionRequest(
+                        org_id=org_id,
+                        order_id=order_id,
+                        requested_by="SYSTEM",
+                        reason=RETENTION_REASON,
+                        requested_at=now,
+                    )
+                    for order_id, org_id, has_request in rows
+                    if not has_request
+                ]
+                if candidates:
+                    with transaction.atomic():
+                        DeletionRequest.objects.bulk_create(candidates, ignore_conflicts=True)
+                        # ignore_conflicts leaves no pks; count what this run inserted
+                        created += DeletionRequest.objects.filter(
+                            order_id__in=[dr.order_id for dr in candidates],
+                            requested_by="SYSTEM",
+                            requested_at=now,
+                        ).count()
+
+                self.stdout.write(f"Scanned {scanned} expired orders, {created} deletion requests created")
+
+        self.rows_affected = created
+        self.stdout.write(
+            self.style.SUCCESS(f"Retention sweep complete: {created} new deletion requests ({scanned} expired orders)")
+        )
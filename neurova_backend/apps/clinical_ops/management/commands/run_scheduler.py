@@ -0,0 +1,44 @@
+"""
+Run periodic maintenance jobs with per-job leader election.
+Usage: python manage.py run_scheduler [--once] [--job retention_sweep ...]
+"""
+
+import signal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.clinical_ops.services.scheduler import Scheduler, load_jobs
+
+
+class Command(BaseCommand):
+    help = "Run settings.MAINTENANCE_SCHEDULE jobs; safe to start on every node"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Run due jobs once and exit")
+        parser.add_argument("--job", action="append", dest="jobs", help="Limit to this job (repeatable)")
+
+    def handle(self, *args, **options):
+        try:
+            jobs = load_jobs(only=options["jobs"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if not jobs:
+            raise CommandError("No scheduled jobs configured")
+
+        def report(run):
+            style = self.style.SUCCESS if run.status == run.STATUS_SUCCEEDED else self.style.ERROR
+            rows = f", {run.rows_affected} rows" if run.rows_affected is not None else ""
+            self.stdout.write(style(f"{run.job_name}: {run.status} in {run.duration_ms} ms{rows}"))
+
+        scheduler = Scheduler(jobs, on_run=report, use_jitter=not options["once"])
+
+        if options["once"]:
+            scheduler.tick()
+            return
+
+        signal.signal(signal.SIGTERM, scheduler.stop)
+        signal.signal(signal.SIGINT, scheduler.stop)
+        self.stdout.write(f"Scheduler {scheduler.node} running {len(jobs)} jobs")
+        scheduler.run_forever()
+        self.stdout.write("Scheduler stopped")
@@ -0,0 +1,32 @@
+"""
+Seal pending audit events into the hash chain.
+Usage: python manage.py seal_audit_log [--batch-size 5000] [--max-batches 0]
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.clinical_ops.audit.chain import DEFAULT_SEAL_BATCH, seal_batch
+
+
+class Command(BaseCommand):
+    help = "Append unsealed AuditEvent rows to the tamper-evident hash chain"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_SEAL_BATCH)
+        parser.add_argument("--max-batches", type=int, default=0, help="0 = until nothing is pending")
+
+    def handle(self, *args, **options):
+        batches = sealed = 0
+
+        while not options["max_batches"] or batches < options["max_batches"]:
+            checkpoint = seal_batch(options["batch_size"])
+            if checkpoint is None:
+                break
+            batches += 1
+            sealed += checkpoint.event_count
+            self.stdout.write(
+                f"Sealed seq {checkpoint.first_seq}-{checkpoint.last_seq} head={checkpoint.chain_hash}"
+            )
+
+        self.rows_affected = sealed
+        self.stdout.write(self.style.SUCCESS(f"Sealed {sealed} audit events in {batches} batches"))
@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.clinical_ops.models_idempotency import IdempotencyRecord
+from backend.clinical.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "Delete expired idempotency records and stale session idempotency keys"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def _delete_in_batches(self, qs, batch_size):
+        total = 0
+        while True:
+            pks = list(qs.values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                return total
+            deleted, _ = qs.model.objects.filter(pk__in=pks).delete()
+            total += deleted
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        now = timezone.now()
+
+        records = self._delete_in_batches(
+            IdempotencyRecord.objects.filter(expires_at__lt=now),
+            batch_size,
+        )
+
+        # Legacy per-session keys (SubmitCurrentTestView) share the same TTL
+        cutoff = now - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+        legacy = self._delete_in_batches(
+            IdempotencyKey.objects.filter(created_at__lt=cutoff),
+            batch_size,
+        )
+
+        self.rows_affected = records + legacy
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {records} expired idempotency records and {legacy} stale session keys"
+            )
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from common.rate_limit import get_store
+
+
+class Command(BaseCommand):
+    help = "Delete rate-limit buckets that have refilled completely (database backend)"
+
+    def handle(self, *args, **options):
+        self.rows_affected = get_store().sweep()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {self.rows_affected} idle rate-limit buckets"))
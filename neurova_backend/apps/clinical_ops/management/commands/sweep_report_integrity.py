@@ -0,0 +1,53 @@
+"""
+Verify stored report PDFs against their hashes and seal a daily Merkle root.
+Usage: python manage.py sweep_report_integrity [--workers 4] [--batch-size 200] [--max-age-hours 0] [--no-merkle]
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.clinical_ops.services.report_integrity import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_WORKERS,
+    seal_daily_root,
+    sweep,
+)
+
+
+class Command(BaseCommand):
+    help = "Background PDF integrity sweep with daily Merkle root"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument(
+            "--max-age-hours",
+            type=int,
+            default=0,
+            help="Skip files verified OK within this many hours (0 = verify everything)",
+        )
+        parser.add_argument("--no-merkle", action="store_true", help="Do not seal today's Merkle root")
+
+    def handle(self, *args, **options):
+        max_age = timedelta(hours=options["max_age_hours"]) if options["max_age_hours"] else None
+
+        stats = sweep(
+            workers=max(1, options["workers"]),
+            batch_size=options["batch_size"],
+            max_age=max_age,
+            stdout=self.stdout,
+        )
+
+        self.rows_affected = stats["checked"]
+        self.stdout.write(
+            f"Checked {stats['checked']} files: {stats['ok']} ok, {stats['mismatch']} mismatched, "
+            f"{stats['missing']} missing, {stats['skipped']} skipped, {stats['baselined']} baselined"
+        )
+
+        if not options["no_merkle"]:
+            root = seal_daily_root()
+            self.stdout.write(f"Merkle root {root.day}: {root.root_sha256} ({root.leaf_count} leaves)")
+
+        style = self.style.ERROR if stats["mismatch"] or stats["missing"] else self.style.SUCCESS
+        self.stdout.write(style("Integrity sweep complete"))
@@ -0,0 +1,48 @@
+"""
+Verify the audit hash chain.
+Usage: python manage.py verify_audit_chain [--from-checkpoint <id>] [--chunk-size 5000]
+
+Exits non-zero and reports the first break when the chain is not intact.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.clinical_ops.audit.chain import verify_chain
+from apps.clinical_ops.audit.models import AuditChainCheckpoint, AuditEvent
+
+
+class Command(BaseCommand):
+    help = "Recompute the AuditEvent hash chain and report the first break"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from-checkpoint", type=int, help="Resume after this checkpoint id")
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        checkpoint = None
+        if options["from_checkpoint"]:
+            checkpoint = AuditChainCheckpoint.objects.filter(id=options["from_checkpoint"]).first()
+            if checkpoint is None:
+                raise CommandError(f"Checkpoint {options['from_checkpoint']} not found")
+
+        result = verify_chain(
+            from_checkpoint=checkpoint,
+            chunk_size=options["chunk_size"],
+            progress=lambda n, seq: self.stdout.write(f"... {n} events verified (seq {seq})"),
+        )
+
+        unsealed = AuditEvent.objects.filter(chain_seq__isnull=True).count()
+
+        if not result["ok"]:
+            brk = result["break"]
+            raise CommandError(
+                f"Audit chain broken at seq {brk['chain_seq']} (event {brk['event_id']}): "
+                f"{brk['kind']} - {brk['message']}. {result['verified']} events verified before the break."
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Audit chain intact: {result['verified']} events verified up to seq {result['last_seq']} "
+                f"({unsealed} not yet sealed)"
+            )
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clinical_ops', '0023_idempotencyrecord'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessmentresponse',
+            name='client_submission_id',
+            field=models.UUIDField(blank=True, null=True, unique=True),
+        ),
+    ]
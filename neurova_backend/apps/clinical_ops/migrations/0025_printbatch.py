@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:01
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clinical_ops', '0024_assessmentresponse_client_submission_id'),
+        ('core', '0003_organization_external_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrintBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed')], default='PENDING', max_length=16)),
+                ('order_ids', models.JSONField(blank=True, default=list)),
+                ('filters', models.JSONField(blank=True, default=dict)),
+                ('rerender', models.BooleanField(default=False)),
+                ('merged_file', models.FileField(blank=True, null=True, upload_to='print_batches/%Y/%m/%d/')),
+                ('pdf_sha256', models.CharField(blank=True, max_length=64, null=True)),
+                ('report_count', models.PositiveIntegerField(default=0)),
+                ('page_count', models.PositiveIntegerField(default=0)),
+                ('skipped', models.JSONField(blank=True, default=list)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('created_by_user_id', models.CharField(blank=True, max_length=64, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('org', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='print_batches', to='core.organization')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['org', 'created_at'], name='clinical_op_org_id_f178ab_idx'), models.Index(fields=['status', 'created_at'], name='clinical_op_status_ca9c14_idx')],
+            },
+        ),
+    ]
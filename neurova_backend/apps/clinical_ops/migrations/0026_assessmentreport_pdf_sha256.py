@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clinical_ops', '0025_printbatch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessmentreport',
+            name='pdf_sha256',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
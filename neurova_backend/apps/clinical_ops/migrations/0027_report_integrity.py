@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:09
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clinical_ops', '0026_assessmentreport_pdf_sha256'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IntegrityMerkleRoot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('root_sha256', models.CharField(max_length=64)),
+                ('leaf_count', models.PositiveIntegerField()),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ReportIntegrityCheck',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=64)),
+                ('report_id', models.BigIntegerField()),
+                ('org_id', models.BigIntegerField(blank=True, null=True)),
+                ('file_name', models.CharField(max_length=255)),
+                ('file_size', models.BigIntegerField(blank=True, null=True)),
+                ('expected_sha256', models.CharField(max_length=64)),
+                ('observed_sha256', models.CharField(blank=True, max_length=64, null=True)),
+                ('status', models.CharField(choices=[('OK', 'OK'), ('MISMATCH', 'Hash mismatch'), ('MISSING', 'File missing')], default='OK', max_length=16)),
+                ('verified_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'verified_at'], name='clinical_op_status_1e45cf_idx')],
+                'constraints': [models.UniqueConstraint(fields=('source', 'report_id'), name='unique_integrity_check_report')],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clinical_ops', '0027_report_integrity'),
+        ('core', '0003_organization_external_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditChainCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_seq', models.BigIntegerField()),
+                ('last_seq', models.BigIntegerField(unique=True)),
+                ('last_event_id', models.BigIntegerField()),
+                ('chain_hash', models.CharField(max_length=64)),
+                ('event_count', models.PositiveIntegerField()),
+                ('sealed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='auditevent',
+            name='chain_hash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='auditevent',
+            name='chain_seq',
+            field=models.BigIntegerField(blank=True, null=True, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='auditevent',
+            index=models.Index(condition=models.Q(('chain_seq__isnull', True)), fields=['created_at', 'id'], name='audit_unsealed_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clinical_ops', '0028_audit_hash_chain'),
+        ('core', '0003_organization_external_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assessmentorder',
+            index=models.Index(fields=['deletion_status', 'data_retention_until'], name='clinical_op_deletio_04cf2f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assessmentorder',
+            index=models.Index(fields=['status', 'public_link_expires_at'], name='clinical_op_status_afa11a_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:17
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clinical_ops', '0030_scheduled_job_runs'),
+        ('core', '0003_organization_external_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PmsRollupState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True)),
+                ('high_water_mark', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='assessmentorder',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.CreateModel(
+            name='PmsDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('battery_code', models.CharField(max_length=64)),
+                ('battery_version', models.CharField(max_length=16)),
+                ('day', models.DateField()),
+                ('started', models.PositiveIntegerField(default=0)),
+                ('completed', models.PositiveIntegerField(default=0)),
+                ('abandoned', models.PositiveIntegerField(default=0)),
+                ('red_flags', models.PositiveIntegerField(default=0)),
+                ('quality_total', models.PositiveIntegerField(default=0)),
+                ('too_fast', models.PositiveIntegerField(default=0)),
+                ('straight_lining', models.PositiveIntegerField(default=0)),
+                ('inconsistency', models.PositiveIntegerField(default=0)),
+                ('duration_seconds_sum', models.BigIntegerField(default=0)),
+                ('reviewed', models.PositiveIntegerField(default=0)),
+                ('review_seconds_sum', models.BigIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('org', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.organization')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='clinical_op_day_a2bbd4_idx')],
+                'constraints': [models.UniqueConstraint(fields=('org', 'battery_code', 'battery_version', 'day'), name='unique_pms_rollup_bucket')],
+            },
+        ),
+    ]
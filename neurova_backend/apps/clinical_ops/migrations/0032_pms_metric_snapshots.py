@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clinical_ops', '0031_pms_daily_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PmsMetricSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=64)),
+                ('period_start', models.DateField()),
+                ('period_end', models.DateField()),
+                ('schema_version', models.CharField(max_length=16)),
+                ('rows', models.JSONField(default=list)),
+                ('duration_ms', models.PositiveIntegerField(default=0)),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('metric', 'period_start', 'period_end', 'schema_version'), name='unique_pms_metric_snapshot')],
+            },
+        ),
+    ]
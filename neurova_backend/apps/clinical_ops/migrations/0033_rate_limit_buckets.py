@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clinical_ops', '0032_pms_metric_snapshots'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RateLimitBucket',
+            fields=[
+                ('key', models.CharField(max_length=200, primary_key=True, serialize=False)),
+                ('tokens', models.FloatField()),
+                ('allowed', models.BooleanField(default=True)),
+                ('updated_at', models.FloatField()),
+                ('expires_at', models.FloatField(db_index=True)),
+            ],
+        ),
+        # Counters only; skip the WAL on every throttled request
+        migrations.RunSQL(
+            "ALTER TABLE clinical_ops_ratelimitbucket SET UNLOGGED",
+            reverse_sql="ALTER TABLE clinical_ops_ratelimitbucket SET LOGGED",
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clinical_ops', '0033_rate_limit_buckets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='printbatch',
+            name='printed_order_ids',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AlterField(
+            model_name='printbatch',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed'), ('PURGED', 'Purged')], default='PENDING', max_length=16),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clinical_ops', '0034_print_batch_printed_orders'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='assessmentorder',
+            name='report_failed_attempts',
+        ),
+        migrations.RemoveField(
+            model_name='assessmentorder',
+            name='report_failed_attempts_locked_until',
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:22
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def reject_duplicate_open_requests(apps, schema_editor):
+    """Keep the oldest open request per order so the constraint can be created."""
+    DeletionRequest = apps.get_model("clinical_ops", "DeletionRequest")
+    seen = set()
+    duplicates = []
+    open_requests = DeletionRequest.objects.filter(status__in=["REQUESTED", "APPROVED"]).order_by("order_id", "id")
+    for pk, order_id in open_requests.values_list("id", "order_id"):
+        if order_id in seen:
+            duplicates.append(pk)
+        seen.add(order_id)
+    DeletionRequest.objects.filter(pk__in=duplicates).update(status="REJECTED", processed_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clinical_ops', '0035_remove_order_failed_attempts'),
+        ('core', '0003_organization_external_id'),
+    ]
+
+    operations = [
+        migrations.RunPython(reject_duplicate_open_requests, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='deletionrequest',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['REQUESTED', 'APPROVED'])), fields=('order',), name='one_open_deletion_request_per_order'),
+        ),
+    ]
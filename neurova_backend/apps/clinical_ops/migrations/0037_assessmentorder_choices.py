@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clinical_ops', '0036_one_open_deletion_request'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='assessmentorder',
+            name='patient_acceptance_status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('ACCEPTED', 'Accepted'), ('REJECTED', 'Rejected'), ('REMARK', 'Remark')], default='PENDING', max_length=16),
+        ),
+        migrations.AlterField(
+            model_name='assessmentorder',
+            name='status',
+            field=models.CharField(choices=[('CREATED', 'Created'), ('IN_PROGRESS', 'In Progress'), ('COMPLETED', 'Completed'), ('AWAITING_REVIEW', 'Awaiting Review'), ('ACCEPTED', 'Accepted'), ('REJECTED', 'Rejected'), ('DELIVERED', 'Delivered'), ('CANCELLED', 'Cancelled'), ('REMARK', 'Remark')], default='CREATED', max_length=32),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:24
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clinical_ops', '0037_assessmentorder_choices'),
+        ('core', '0003_organization_external_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='printbatch',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['printed_order_ids'], name='print_batch_printed_gin', opclasses=['jsonb_path_ops']),
+        ),
+    ]
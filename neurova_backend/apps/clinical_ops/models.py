@@ -106,6 +106,7 @@ class AssessmentOrder(models.Model):
     started_at = models.DateTimeField(blank=True, null=True)
     completed_at = models.DateTimeField(blank=True, null=True)
     delivered_at = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # high-water mark for PMS rollups
 
     created_by_user_id = models.CharField(max_length=64, blank=True, null=True)
     verified_by_staff = models.BooleanField(default=False)
@@ -139,9 +140,6 @@ class AssessmentOrder(models.Model):
     data_retention_until = models.DateTimeField(null=True, blank=True)
     deletion_status = models.CharField(max_length=32,default="ACTIVE")  # ACTIVE / PENDING_DELETE / DELETED
 
-    report_failed_attempts = models.PositiveSmallIntegerField(default=0)
-    report_failed_attempts_locked_until = models.DateTimeField(null=True, blank=True)
-
     # Patient Acceptance Fields
     patient_acceptance_status = models.CharField(
         max_length=16,
@@ -158,6 +156,9 @@ class AssessmentOrder(models.Model):
             models.Index(fields=["org", "status", "created_at"]),
             models.Index(fields=["org", "battery_code"]),
             models.Index(fields=["public_token"]),
+            # retention_sweep / cleanup_expired_orders
+            models.Index(fields=["deletion_status", "data_retention_until"]),
+            models.Index(fields=["status", "public_link_expires_at"]),
         ]
 
     def save(self, *args, **kwargs):
@@ -168,6 +169,11 @@ class AssessmentOrder(models.Model):
 
         is_new = self.pk is None
 
+        # Partial saves still bump updated_at (PMS rollups read it incrementally)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "updated_at" not in update_fields:
+            kwargs["update_fields"] = [*update_fields, "updated_at"]
+
         result = super().save(*args, **kwargs)
 
         # Apply retention only once, after first insert
@@ -227,9 +233,14 @@ class ResponseQuality(models.Model):
 
 from .models_assessment import AssessmentResponse, AssessmentResult
 from .models_report import AssessmentReport
-from apps.clinical_ops.audit.models import AuditEvent
+from apps.clinical_ops.audit.models import AuditEvent, AuditChainCheckpoint
 from apps.clinical_ops.models_consent import ConsentRecord
 from apps.clinical_ops.models_deletion import DeletionRequest
 from apps.clinical_ops.battery_assessment_model import Assessment, Battery, BatteryAssessment
 from apps.clinical_ops.models_public_token import PublicAccessToken
-
+from apps.clinical_ops.models_idempotency import IdempotencyRecord
+from apps.clinical_ops.models_print_batch import PrintBatch
+from apps.clinical_ops.models_integrity import ReportIntegrityCheck, IntegrityMerkleRoot
+from apps.clinical_ops.models_scheduler import ScheduledJobRun
+from apps.clinical_ops.models_pms import PmsDailyRollup, PmsRollupState, PmsMetricSnapshot
+from apps.clinical_ops.models_rate_limit import RateLimitBucket
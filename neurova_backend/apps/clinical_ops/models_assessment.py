@@ -14,6 +14,9 @@ class AssessmentResponse(models.Model):
     duration_seconds = models.IntegerField(default=0)
     submitted_at = models.DateTimeField(default=timezone.now)
 
+    # client-generated id for offline kiosk submissions (dedupe on re-sync)
+    client_submission_id = models.UUIDField(null=True, blank=True, unique=True)
+
     class Meta:
         indexes = [
             models.Index(fields=["org", "submitted_at"]),
@@ -4,6 +4,9 @@ from apps.clinical_ops.models import AssessmentOrder
 from core.models import Organization
 
 class DeletionRequest(models.Model):
+    # At most one open request per order (one_open_deletion_request_per_order)
+    OPEN_STATUSES = ["REQUESTED", "APPROVED"]
+
     org = models.ForeignKey(Organization, on_delete=models.CASCADE)
     order = models.ForeignKey(AssessmentOrder, on_delete=models.CASCADE)
 
@@ -22,3 +25,10 @@ class DeletionRequest(models.Model):
         indexes = [
             models.Index(fields=["org", "status", "requested_at"]),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["order"],
+                condition=models.Q(status__in=["REQUESTED", "APPROVED"]),
+                name="one_open_deletion_request_per_order",
+            ),
+        ]
@@ -0,0 +1,46 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class IdempotencyRecord(models.Model):
+    """
+    Stored outcome of a mutating request, keyed by (scope, key).
+
+    A retry carrying the same X-Idempotency-Key replays the stored
+    response instead of executing the view again.
+    """
+
+    STATUS_PENDING = "PENDING"
+    STATUS_COMPLETED = "COMPLETED"
+
+    scope = models.CharField(max_length=128)
+    key = models.CharField(max_length=128)
+
+    status = models.CharField(max_length=16, default=STATUS_PENDING)
+
+    # sha256 of method + path + request payload (detects key reuse)
+    request_fingerprint = models.CharField(max_length=64)
+
+    # original response, replayed verbatim
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    response_headers = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    response_sha256 = models.CharField(max_length=64, blank=True, default="")
+
+    created_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["scope", "key"],
+                name="unique_idempotency_scope_key",
+            )
+        ]
+
+    def is_expired(self):
+        return timezone.now() > self.expires_at
+
+    def __str__(self):
+        return f"IdempotencyRecord(scope={self.scope}, key={self.key})"
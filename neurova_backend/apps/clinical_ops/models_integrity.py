@@ -0,0 +1,53 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ReportIntegrityCheck(models.Model):
+    """
+    Last background verification of one stored report PDF.
+
+    source distinguishes the two report tables:
+      clinical_ops.AssessmentReport - expected hash is report.pdf_sha256
+      reports.Report                - no stored hash; the first sweep records
+                                      a baseline and later sweeps compare to it
+    """
+    SOURCE_ASSESSMENT_REPORT = "clinical_ops.AssessmentReport"
+    SOURCE_REPORT = "reports.Report"
+
+    STATUS_OK = "OK"
+    STATUS_MISMATCH = "MISMATCH"
+    STATUS_MISSING = "MISSING"
+
+    STATUS_CHOICES = [
+        (STATUS_OK, "OK"),
+        (STATUS_MISMATCH, "Hash mismatch"),
+        (STATUS_MISSING, "File missing"),
+    ]
+
+    source = models.CharField(max_length=64)
+    report_id = models.BigIntegerField()
+    org_id = models.BigIntegerField(null=True, blank=True)
+
+    file_name = models.CharField(max_length=255)
+    file_size = models.BigIntegerField(null=True, blank=True)
+    expected_sha256 = models.CharField(max_length=64)
+    observed_sha256 = models.CharField(max_length=64, blank=True, null=True)
+
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_OK)
+    verified_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["source", "report_id"], name="unique_integrity_check_report"),
+        ]
+        indexes = [
+            models.Index(fields=["status", "verified_at"]),
+        ]
+
+
+class IntegrityMerkleRoot(models.Model):
+    """Daily Merkle root over every verified report hash (see services.report_integrity)."""
+    day = models.DateField(unique=True)
+    root_sha256 = models.CharField(max_length=64)
+    leaf_count = models.PositiveIntegerField()
+    computed_at = models.DateTimeField(default=timezone.now)
@@ -0,0 +1,73 @@
+from django.db import models
+from django.utils import timezone
+from core.models import Organization
+
+
+class PmsDailyRollup(models.Model):
+    """
+    Post-market surveillance counters per org, battery and day of order
+    creation (local time). Maintained by services.pms_rollup; only
+    ACTIVE (not deleted) orders are counted.
+    """
+    org = models.ForeignKey(Organization, on_delete=models.CASCADE)
+    battery_code = models.CharField(max_length=64)
+    battery_version = models.CharField(max_length=16)
+    day = models.DateField()
+
+    started = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    abandoned = models.PositiveIntegerField(default=0)
+    red_flags = models.PositiveIntegerField(default=0)
+
+    quality_total = models.PositiveIntegerField(default=0)
+    too_fast = models.PositiveIntegerField(default=0)
+    straight_lining = models.PositiveIntegerField(default=0)
+    inconsistency = models.PositiveIntegerField(default=0)
+    duration_seconds_sum = models.BigIntegerField(default=0)
+
+    reviewed = models.PositiveIntegerField(default=0)
+    review_seconds_sum = models.BigIntegerField(default=0)  # signed_at - completed_at
+
+    refreshed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["org", "battery_code", "battery_version", "day"],
+                name="unique_pms_rollup_bucket",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["day"]),
+        ]
+
+
+class PmsRollupState(models.Model):
+    """High-water mark of the incremental rollup job."""
+    name = models.CharField(max_length=64, unique=True)
+    high_water_mark = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+
+class PmsMetricSnapshot(models.Model):
+    """
+    Cached result of one PMS metric for one closed period. Closed
+    quarters are frozen for regulatory reporting, so the report engine
+    reuses these instead of re-querying.
+    """
+    metric = models.CharField(max_length=64)
+    period_start = models.DateField()
+    period_end = models.DateField()  # exclusive
+    schema_version = models.CharField(max_length=16)
+
+    rows = models.JSONField(default=list)
+    duration_ms = models.PositiveIntegerField(default=0)
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["metric", "period_start", "period_end", "schema_version"],
+                name="unique_pms_metric_snapshot",
+            ),
+        ]
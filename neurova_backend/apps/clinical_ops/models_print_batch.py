@@ -0,0 +1,52 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.db import models
+from django.utils import timezone
+from core.models import Organization
+
+
+class PrintBatch(models.Model):
+    """
+    One merged, paginated PDF of many reports for end-of-day printing
+    (AssessmentOrder.DELIVERY_PRINT).
+    """
+    STATUS_PENDING = "PENDING"
+    STATUS_RUNNING = "RUNNING"
+    STATUS_COMPLETED = "COMPLETED"
+    STATUS_FAILED = "FAILED"
+    STATUS_PURGED = "PURGED"  # merged file removed: it contained a deleted order
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_COMPLETED, "Completed"),
+        (STATUS_FAILED, "Failed"),
+        (STATUS_PURGED, "Purged"),
+    ]
+
+    org = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name="print_batches")
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
+
+    # Selection: explicit order ids, or a filter (see services.print_batch.select_print_orders)
+    order_ids = models.JSONField(default=list, blank=True)
+    filters = models.JSONField(default=dict, blank=True)
+    rerender = models.BooleanField(default=False)  # ignore stored PDFs and render fresh copies
+
+    merged_file = models.FileField(upload_to="print_batches/%Y/%m/%d/", null=True, blank=True)
+    pdf_sha256 = models.CharField(max_length=64, blank=True, null=True)
+    report_count = models.PositiveIntegerField(default=0)
+    page_count = models.PositiveIntegerField(default=0)
+    skipped = models.JSONField(default=list, blank=True)  # [{"order_id": .., "reason": ..}]
+    printed_order_ids = models.JSONField(default=list, blank=True)  # orders inside merged_file
+    error = models.TextField(blank=True, null=True)
+
+    created_by_user_id = models.CharField(max_length=64, blank=True, null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    completed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["org", "created_at"]),
+            models.Index(fields=["status", "created_at"]),
+            # deletion_executor finds the batches holding a deleted order
+            GinIndex(fields=["printed_order_ids"], opclasses=["jsonb_path_ops"], name="print_batch_printed_gin"),
+        ]
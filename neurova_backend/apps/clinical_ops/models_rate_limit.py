@@ -0,0 +1,21 @@
+from django.db import models
+
+
+class RateLimitBucket(models.Model):
+    """
+    One token bucket of common/rate_limit.py, keyed by
+    "<scope>:<endpoint class>:<identity>".
+
+    Rows are only written through DatabaseBucketStore's single-statement
+    upsert; timestamps are epoch seconds so the refill is plain arithmetic.
+    The table is UNLOGGED: counters do not need to survive a crash.
+    """
+
+    key = models.CharField(max_length=200, primary_key=True)
+    tokens = models.FloatField()
+    allowed = models.BooleanField(default=True)  # outcome of the last consume
+    updated_at = models.FloatField()
+    expires_at = models.FloatField(db_index=True)  # bucket full again after this
+
+    def __str__(self):
+        return f"RateLimitBucket(key={self.key}, tokens={self.tokens:.2f})"
@@ -8,6 +8,7 @@ class AssessmentReport(models.Model):
     order = models.OneToOneField(AssessmentOrder, on_delete=models.CASCADE, related_name="report")
 
     pdf_file = models.FileField(upload_to="clinical_reports/%Y/%m/%d/", null=True, blank=True)
+    pdf_sha256 = models.CharField(max_length=64, null=True, blank=True)  # integrity check + download ETag
 
     # sign-off fields (human or system)
     signoff_status = models.CharField(max_length=32, default="PENDING")  # PENDING/SIGNED/REJECTED
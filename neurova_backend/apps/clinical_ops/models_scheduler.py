@@ -0,0 +1,32 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ScheduledJobRun(models.Model):
+    """One execution of a maintenance job by `manage.py run_scheduler`."""
+    STATUS_RUNNING = "RUNNING"
+    STATUS_SUCCEEDED = "SUCCEEDED"
+    STATUS_FAILED = "FAILED"
+
+    STATUS_CHOICES = [
+        (STATUS_RUNNING, "Running"),
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    job_name = models.CharField(max_length=64)
+    node = models.CharField(max_length=128)  # hostname:pid of the leader that ran it
+
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_RUNNING)
+    started_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration_ms = models.PositiveIntegerField(null=True, blank=True)
+
+    rows_affected = models.BigIntegerField(null=True, blank=True)
+    output = models.TextField(blank=True, default="")
+    error = models.TextField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["job_name", "started_at"]),
+        ]
@@ -1,6 +1,14 @@
 import random
 from django.utils import timezone
 
+from common.rate_limit import get_store
+
+# Failed codes per order before downloads lock. The lock does not wear
+# off: it holds until a new code is issued (the counter only expires long
+# after any code it guarded).
+MAX_FAILED_ATTEMPTS = 5
+ATTEMPTS_TTL_SECONDS = 30 * 24 * 3600
+
 
 def generate_code() -> str:
     return f"{random.randint(100000, 999999)}"
@@ -11,6 +19,7 @@ def issue_report_access_code(order, minutes_valid=15):
     order.report_access_code = code
     order.report_access_code_expires_at = timezone.now() + timezone.timedelta(minutes=minutes_valid)
     order.save(update_fields=["report_access_code", "report_access_code_expires_at"])
+    clear_failed_access_codes(order)
     return code
 
 
@@ -20,3 +29,25 @@ def verify_report_access_code(order, code: str) -> bool:
     if timezone.now() > order.report_access_code_expires_at:
         return False
     return str(code) == str(order.report_access_code)
+
+
+# Failed attempts live in the shared rate-limit store, not on the order row
+def _attempts_key(order):
+    return f"report_access_code:{order.id}"
+
+
+def _count_attempts(order, amount):
+    return get_store().increment(_attempts_key(order), ATTEMPTS_TTL_SECONDS, amount=amount)
+
+
+def access_code_locked(order) -> bool:
+    return _count_attempts(order, 0) >= MAX_FAILED_ATTEMPTS
+
+
+def record_failed_access_code(order) -> bool:
+    """Count a wrong code; True when the order is now locked."""
+    return _count_attempts(order, 1) >= MAX_FAILED_ATTEMPTS
+
+
+def clear_failed_access_codes(order):
+    get_store().reset(_attempts_key(order))
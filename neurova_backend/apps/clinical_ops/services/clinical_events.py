@@ -0,0 +1,58 @@
+"""
+Clinical notifications pushed to the staff event stream
+(staff/events/stream, see api/v1/event_stream_views.py).
+
+Events carry ids and status only, never patient details; clients fetch
+the record through the normal (audited) endpoints.
+
+    result       new AssessmentResult without red flags
+    red_flag     new AssessmentResult with has_red_flags (e.g. SUICIDE_RISK)
+    report       report created or sign-off status changed
+    order        order status or delivery mode changed
+"""
+
+from common.event_bus import publish
+
+EVENT_RESULT = "result"
+EVENT_RED_FLAG = "red_flag"
+EVENT_REPORT = "report"
+EVENT_ORDER = "order"
+
+
+def publish_result(result):
+    summary = (result.result_json or {}).get("summary", {})
+    publish(
+        result.org_id,
+        EVENT_RED_FLAG if result.has_red_flags else EVENT_RESULT,
+        {
+            "order_id": result.order_id,
+            "primary_severity": result.primary_severity,
+            "has_red_flags": result.has_red_flags,
+            "red_flags": summary.get("red_flags") or [],
+            "computed_at": result.computed_at.isoformat(),
+        },
+    )
+
+
+def publish_report_status(report):
+    publish(
+        report.org_id,
+        EVENT_REPORT,
+        {
+            "order_id": report.order_id,
+            "signoff_status": report.signoff_status,
+        },
+    )
+
+
+def publish_order_status(order):
+    publish(
+        order.org_id,
+        EVENT_ORDER,
+        {
+            "order_id": order.id,
+            "status": order.status,
+            "delivery_mode": order.delivery_mode,
+        },
+    )
+
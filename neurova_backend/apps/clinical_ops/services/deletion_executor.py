@@ -1,30 +1,285 @@
+"""
+Deletion executor.
+
+execute_deletions() runs approved DeletionRequests in transaction
+batches: clinical payloads are removed with set-based deletes, orders
+are marked DELETED, and one DATA_DELETION_EXECUTED audit event is
+written per order (keyed by AssessmentOrder, bulk-inserted per batch).
+
+Print batches whose merged PDF contains a deleted order are marked
+PURGED and lose their file too; that PDF holds the order's report and
+the patient's name.
+
+Stored report PDFs are purged from storage only after the batch
+commits, in parallel and with retry (S3 uses DeleteObjects, 1000 keys
+per call). Anything that still fails is left for
+`manage.py reconcile_report_files`.
+"""
+
+import logging
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+from operator import or_
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
+
+from apps.clinical_ops.models import AssessmentOrder
 from apps.clinical_ops.models_deletion import DeletionRequest
 from apps.clinical_ops.models_assessment import AssessmentResponse, AssessmentResult
+from apps.clinical_ops.models_integrity import ReportIntegrityCheck
+from apps.clinical_ops.models_print_batch import PrintBatch
 from apps.clinical_ops.models_report import AssessmentReport
-from apps.clinical_ops.audit.logger import log_event
+from apps.clinical_ops.audit.logger import log_events
+from core.models import Organization
 
-def execute_deletion(dr: DeletionRequest):
-    order = dr.order
-
-    # Hard delete clinical payloads
-    AssessmentResponse.objects.filter(order=order).delete()
-    AssessmentResult.objects.filter(order=order).delete()
-    AssessmentReport.objects.filter(order=order).delete()
-
-    # Mark order as deleted (retain shell for audit)
-    order.deletion_status = "DELETED"
-    order.save(update_fields=["deletion_status"])
-
-    dr.status = "EXECUTED"
-    dr.processed_at = timezone.now()
-    dr.save(update_fields=["status", "processed_at"])
-
-    log_event(
-        org=order.org,
-        event_type="DATA_DELETION_EXECUTED",
-        entity_type="AssessmentOrder",
-        entity_id=order.id,
-        actor_role="System",
-        details={"reason": dr.reason}
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 200
+PURGE_WORKERS = 4
+PURGE_RETRIES = 3
+S3_DELETE_CHUNK = 1000
+
+# Background purges scheduled from request/transaction context
+_purge_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="storage-purge")
+
+
+# --------------------------------------------------
+# STORAGE PURGE
+# --------------------------------------------------
+
+def _retry(fn, attempts=PURGE_RETRIES):
+    delay = 0.5
+    for attempt in range(1, attempts + 1):
+        try:
+            return fn()
+        except Exception:
+            if attempt == attempts:
+                raise
+            time.sleep(delay)
+            delay *= 2
+
+
+def _purge_s3(storage, keys):
+    from storages.utils import clean_name
+
+    client = storage.connection.meta.client
+    failed = []
+
+    def delete_chunk(chunk):
+        pending = list(chunk)
+
+        def attempt():
+            nonlocal pending
+            result = client.delete_objects(
+                Bucket=storage.bucket_name,
+                Delete={"Objects": [{"Key": storage._normalize_name(clean_name(k))} for k in pending], "Quiet": True},
+            )
+            errors = {e["Key"] for e in result.get("Errors", [])}
+            pending = [k for k in pending if storage._normalize_name(clean_name(k)) in errors]
+            if pending:
+                raise IOError(f"{len(pending)} objects not deleted")
+
+        try:
+            _retry(attempt)
+        except Exception:
+            return pending
+        return []
+
+    chunks = [keys[i:i + S3_DELETE_CHUNK] for i in range(0, len(keys), S3_DELETE_CHUNK)]
+    with ThreadPoolExecutor(max_workers=PURGE_WORKERS) as pool:
+        for leftover in pool.map(delete_chunk, chunks):
+            failed.extend(leftover)
+    return failed
+
+
+def _purge_each(storage, keys):
+    def delete_one(key):
+        try:
+            _retry(lambda: storage.delete(key))
+            return None
+        except Exception:
+            return key
+
+    with ThreadPoolExecutor(max_workers=PURGE_WORKERS) as pool:
+        return [k for k in pool.map(delete_one, keys) if k]
+
+
+def purge_storage_objects(keys, storage=None):
+    """Delete stored files; returns the keys that could not be deleted."""
+    keys = [k for k in dict.fromkeys(keys) if k]
+    if not keys:
+        return []
+
+    storage = storage or default_storage
+    if hasattr(storage, "bucket_name") and hasattr(storage, "connection"):
+        failed = _purge_s3(storage, keys)
+    else:
+        failed = _purge_each(storage, keys)
+
+    if failed:
+        logger.error(f"Storage purge left {len(failed)} files behind: {failed[:20]}")
+    return failed
+
+
+def _schedule_purge(keys, wait):
+    if not keys:
+        return
+    if wait:
+        transaction.on_commit(lambda: purge_storage_objects(keys))
+    else:
+        transaction.on_commit(lambda: _purge_pool.submit(purge_storage_objects, keys))
+
+
+# --------------------------------------------------
+# EXECUTION
+# --------------------------------------------------
+
+def _print_batches_containing(org_ids, order_ids):
+    """
+    Print batches with a merged file that includes any of order_ids,
+    matched in SQL (jsonb containment on the GIN-indexed
+    printed_order_ids). Batches from before printed_order_ids was recorded
+    fall back to their selection, and filter-based ones that printed
+    anything are assumed to contain the orders.
+    """
+    printed = reduce(or_, (Q(printed_order_ids__contains=[order_id]) for order_id in order_ids))
+    selected = reduce(or_, (Q(order_ids__contains=[order_id]) for order_id in order_ids))
+    legacy = Q(printed_order_ids=[]) & (selected | (Q(order_ids=[]) & Q(report_count__gt=0)))
+    return list(
+        PrintBatch.objects
+        .filter(org_id__in=org_ids)
+        .exclude(merged_file="")
+        .exclude(merged_file__isnull=True)
+        .filter(printed | legacy)
+        .only("id", "org_id", "merged_file")
     )
+
+
+def _execute_batch(request_ids, *, approve, actor_user_id, actor_role, wait_for_purge):
+    statuses = ["APPROVED", "REQUESTED"] if approve else ["APPROVED"]
+
+    with transaction.atomic():
+        requests = list(
+            DeletionRequest.objects
+            .select_for_update(skip_locked=True)
+            .filter(id__in=request_ids, status__in=statuses)
+            .order_by("id")
+        )
+        if not requests:
+            return []
+
+        order_ids = {dr.order_id for dr in requests}
+        reports = list(
+            AssessmentReport.objects.filter(order_id__in=order_ids).values_list("id", "order_id", "pdf_file")
+        )
+        files_by_order = defaultdict(list)
+        for _, order_id, name in reports:
+            if name:
+                files_by_order[order_id].append(name)
+
+        # Hard delete clinical payloads
+        AssessmentResponse.objects.filter(order_id__in=order_ids).delete()
+        AssessmentResult.objects.filter(order_id__in=order_ids).delete()
+        AssessmentReport.objects.filter(order_id__in=order_ids).delete()
+        ReportIntegrityCheck.objects.filter(
+            source=ReportIntegrityCheck.SOURCE_ASSESSMENT_REPORT,
+            report_id__in=[r[0] for r in reports],
+        ).delete()
+
+        # Mark orders as deleted (retain shell for audit)
+        now = timezone.now()
+        AssessmentOrder.objects.filter(id__in=order_ids).update(deletion_status="DELETED", updated_at=now)
+
+        DeletionRequest.objects.filter(id__in=[dr.id for dr in requests]).update(
+            status="EXECUTED",
+            processed_at=now,
+        )
+
+        print_batches = _print_batches_containing({dr.org_id for dr in requests}, order_ids)
+        PrintBatch.objects.filter(id__in=[b.id for b in print_batches]).update(
+            status=PrintBatch.STATUS_PURGED,
+            merged_file="",
+            pdf_sha256=None,
+            error="Purged: contained a deleted order",
+        )
+
+        orgs = Organization.objects.in_bulk({dr.org_id for dr in requests})
+        events = [
+            dict(
+                org=orgs.get(dr.org_id),
+                event_type="DATA_DELETION_EXECUTED",
+                entity_type="AssessmentOrder",
+                entity_id=dr.order_id,
+                actor_user_id=actor_user_id,
+                actor_role=actor_role,
+                details={
+                    "deletion_request_id": dr.id,
+                    "requested_by": dr.requested_by,
+                    "reason": dr.reason,
+                    "files_purged": len(files_by_order.get(dr.order_id, [])),
+                },
+            )
+            for dr in requests
+        ]
+        events += [
+            dict(
+                org=orgs.get(batch.org_id),
+                event_type="PRINT_BATCH_PURGED",
+                entity_type="PrintBatch",
+                entity_id=batch.id,
+                actor_user_id=actor_user_id,
+                actor_role=actor_role,
+                details={"reason": "Contained a deleted order"},
+            )
+            for batch in print_batches
+        ]
+        log_events(events)
+
+        _schedule_purge(
+            [name for names in files_by_order.values() for name in names]
+            + [batch.merged_file.name for batch in print_batches],
+            wait=wait_for_purge,
+        )
+
+    return requests
+
+
+def execute_deletions(
+    request_ids,
+    *,
+    batch_size=DEFAULT_BATCH_SIZE,
+    approve=False,
+    actor_user_id=None,
+    actor_role="System",
+    wait_for_purge=False,
+    progress=None,
+):
+    """
+    Execute many DeletionRequests, batch_size per transaction.
+    approve=True also executes REQUESTED ones (approval is implied).
+    Returns the number of executed requests.
+    """
+    request_ids = list(request_ids)
+    executed = 0
+    for i in range(0, len(request_ids), batch_size):
+        done = _execute_batch(
+            request_ids[i:i + batch_size],
+            approve=approve,
+            actor_user_id=actor_user_id,
+            actor_role=actor_role,
+            wait_for_purge=wait_for_purge,
+        )
+        executed += len(done)
+        if progress:
+            progress(executed)
+    return executed
+
+
+def execute_deletion(dr: DeletionRequest):
+    execute_deletions([dr.id])
+    dr.refresh_from_db(fields=["status", "processed_at"])
@@ -0,0 +1,289 @@
+"""
+Offline kiosk sync ingestion.
+
+Kiosk tablets collect completed assessments while offline and upload
+them later as one signed batch. Each session carries a client-generated
+UUID so that re-uploading the same batch is harmless: already-ingested
+sessions are reported as DUPLICATE instead of being written twice.
+
+Batch payload (decrypted):
+{
+    "device_id": "kiosk-7",
+    "sessions": [
+        {
+            "client_session_id": "<uuid4>",
+            "order_id": 123,
+            "answers": [{"question_id": "phq9_q1", "value": 0}, ...],
+            "duration_seconds": 410,
+            "started_at": "2026-03-01T09:12:00+05:30",
+            "submitted_at": "2026-03-01T09:19:00+05:30"
+        }
+    ]
+}
+"""
+
+import hashlib
+import hmac
+import json
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.clinical_ops.models import AssessmentOrder, ResponseQuality
+from apps.clinical_ops.models_assessment import AssessmentResponse, AssessmentResult
+from apps.clinical_ops.services.clinical_events import publish_order_status, publish_result
+from apps.clinical_ops.services.quality import compute_quality
+from apps.clinical_ops.services.scoring_adapter import score_battery
+from apps.clinical_ops.audit.logger import log_events
+
+MAX_SESSIONS_PER_BATCH = 500
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+
+ITEM_ACCEPTED = "ACCEPTED"
+ITEM_DUPLICATE = "DUPLICATE"
+ITEM_REJECTED = "REJECTED"
+
+
+# --------------------------------------------------
+# SIGNATURE
+# --------------------------------------------------
+
+def kiosk_sync_configured() -> bool:
+    return bool(getattr(settings, "KIOSK_SYNC_SECRET", ""))
+
+
+def _secret() -> bytes:
+    # Never fall back to SECRET_KEY: it also signs staff JWTs
+    if not kiosk_sync_configured():
+        raise ImproperlyConfigured("KIOSK_SYNC_SECRET is not set")
+    return settings.KIOSK_SYNC_SECRET.encode("utf-8")
+
+
+def canonical_batch(device_id, sessions) -> bytes:
+    return json.dumps(
+        {"device_id": device_id, "sessions": sessions},
+        sort_keys=True,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def sign_batch(device_id, sessions) -> str:
+    return hmac.new(_secret(), canonical_batch(device_id, sessions), hashlib.sha256).hexdigest()
+
+
+def verify_batch_signature(device_id, sessions, signature) -> bool:
+    if not signature:
+        return False
+    return hmac.compare_digest(sign_batch(device_id, sessions), str(signature))
+
+
+# --------------------------------------------------
+# ITEM VALIDATION
+# --------------------------------------------------
+
+def _parse_item(item, now):
+    """Returns (parsed, error). parsed holds normalized values."""
+    if not isinstance(item, dict):
+        return None, "Session must be an object"
+
+    try:
+        client_id = uuid.UUID(str(item.get("client_session_id")))
+    except (TypeError, ValueError):
+        return None, "client_session_id must be a UUID"
+
+    try:
+        order_id = int(item.get("order_id"))
+    except (TypeError, ValueError):
+        return None, "order_id must be an integer"
+
+    answers = item.get("answers")
+    if not isinstance(answers, list) or not answers:
+        return None, "Answers required"
+
+    try:
+        duration_seconds = int(item.get("duration_seconds", 0))
+    except (TypeError, ValueError):
+        return None, "duration_seconds must be an integer"
+
+    submitted_at = parse_datetime(str(item.get("submitted_at") or ""))
+    if submitted_at is None:
+        return None, "submitted_at must be an ISO-8601 timestamp"
+    if timezone.is_naive(submitted_at):
+        submitted_at = timezone.make_aware(submitted_at)
+    if submitted_at > now + MAX_CLOCK_SKEW:
+        return None, "submitted_at is in the future"
+
+    started_at = parse_datetime(str(item.get("started_at") or ""))
+    if started_at is not None and timezone.is_naive(started_at):
+        started_at = timezone.make_aware(started_at)
+
+    return {
+        "client_id": client_id,
+        "order_id": order_id,
+        "answers": answers,
+        "duration_seconds": duration_seconds,
+        "submitted_at": submitted_at,
+        "started_at": started_at,
+    }, None
+
+
+# --------------------------------------------------
+# INGESTION
+# --------------------------------------------------
+
+@transaction.atomic
+def ingest_sessions(org, sessions, *, device_id=None, actor_user_id=None, request=None):
+    """
+    Ingest a batch of offline kiosk sessions for one organization.
+
+    Writes are set-based: existing submissions and target orders are
+    fetched with one query each, and responses, quality rows, results
+    and audit events are written with bulk_create.
+
+    Returns a manifest with one entry per input session, in input order.
+    """
+    now = timezone.now()
+    manifest = [None] * len(sessions)
+    parsed = {}
+    batch_ids = set()
+
+    for pos, item in enumerate(sessions):
+        values, error = _parse_item(item, now)
+        client_id = item.get("client_session_id") if isinstance(item, dict) else None
+        if error:
+            manifest[pos] = {"client_session_id": client_id, "status": ITEM_REJECTED, "message": error}
+        elif values["client_id"] in batch_ids:
+            manifest[pos] = {
+                "client_session_id": str(values["client_id"]),
+                "status": ITEM_DUPLICATE,
+                "message": "Repeated in batch",
+            }
+        else:
+            parsed[pos] = values
+            batch_ids.add(values["client_id"])
+
+    # ---- Already ingested (re-sync) ----
+    seen = dict(
+        AssessmentResponse.objects
+        .filter(client_submission_id__in=[v["client_id"] for v in parsed.values()])
+        .values_list("client_submission_id", "order_id")
+    )
+
+    # ---- Target orders, locked for the duration of the batch ----
+    orders = {
+        o.id: o
+        for o in AssessmentOrder.objects
+        .select_for_update()
+        .filter(org=org, id__in=[v["order_id"] for v in parsed.values()], deletion_status="ACTIVE")
+    }
+    answered = set(
+        AssessmentResponse.objects
+        .filter(order_id__in=orders.keys())
+        .values_list("order_id", flat=True)
+    )
+
+    responses, qualities, results, events, touched = [], [], [], [], []
+
+    for pos, v in parsed.items():
+        entry = {"client_session_id": str(v["client_id"]), "order_id": v["order_id"]}
+        manifest[pos] = entry
+
+        if v["client_id"] in seen:
+            entry.update(status=ITEM_DUPLICATE, message="Already ingested")
+            continue
+
+        order = orders.get(v["order_id"])
+        if order is None:
+            entry.update(status=ITEM_REJECTED, message="Order not found")
+            continue
+        if order.administration_mode != AssessmentOrder.MODE_KIOSK:
+            entry.update(status=ITEM_REJECTED, message="Order is not a kiosk order")
+            continue
+        if order.id in answered:
+            entry.update(status=ITEM_REJECTED, message="Order already submitted")
+            continue
+        if order.status not in (AssessmentOrder.STATUS_CREATED, AssessmentOrder.STATUS_IN_PROGRESS):
+            entry.update(status=ITEM_REJECTED, message=f"Order not in progress: {order.status}")
+            continue
+
+        answers_json = {"answers": v["answers"]}
+        try:
+            result_payload = score_battery(
+                battery_code=order.battery_code,
+                battery_version=order.battery_version,
+                answers_json=answers_json,
+            )
+        except ValueError as e:
+            entry.update(status=ITEM_REJECTED, message=str(e))
+            continue
+
+        quality = compute_quality(answers=v["answers"], duration_seconds=v["duration_seconds"])
+
+        responses.append(AssessmentResponse(
+            org=org,
+            order=order,
+            answers_json=answers_json,
+            duration_seconds=v["duration_seconds"],
+            submitted_at=v["submitted_at"],
+            client_submission_id=v["client_id"],
+        ))
+        qualities.append(ResponseQuality(
+            org=org,
+            order=order,
+            duration_seconds=v["duration_seconds"],
+            straight_lining_flag=quality["straight_lining_flag"],
+            too_fast_flag=quality["too_fast_flag"],
+            inconsistency_flag=quality["inconsistency_flag"],
+            notes=quality.get("notes"),
+        ))
+        results.append(AssessmentResult(
+            org=org,
+            order=order,
+            result_json=result_payload,
+            primary_severity=result_payload["summary"]["primary_severity"],
+            has_red_flags=result_payload["summary"]["has_red_flags"],
+        ))
+
+        order.status = AssessmentOrder.STATUS_COMPLETED
+        order.started_at = order.started_at or v["started_at"] or v["submitted_at"]
+        order.completed_at = v["submitted_at"]
+        touched.append(order)
+        answered.add(order.id)
+
+        events.append(dict(
+            org=org,
+            event_type="ASSESSMENT_SUBMITTED",
+            entity_type="AssessmentOrder",
+            entity_id=order.id,
+            actor_user_id=actor_user_id,
+            actor_role="Patient",
+            details={
+                "source": "KIOSK_SYNC",
+                "device_id": device_id,
+                "client_session_id": str(v["client_id"]),
+                "submitted_at": v["submitted_at"].isoformat(),
+            },
+            severity="INFO",
+        ))
+        entry.update(status=ITEM_ACCEPTED, message="Ingested")
+
+    AssessmentResponse.objects.bulk_create(responses)
+    ResponseQuality.objects.bulk_create(qualities)
+    AssessmentResult.objects.bulk_create(results)
+    for order in touched:
+        order.updated_at = now
+    AssessmentOrder.objects.bulk_update(touched, ["status", "started_at", "completed_at", "updated_at"])
+    log_events(events, request=request)
+
+    # Bulk writes skip post_save; announce to the staff event stream here
+    for result in results:
+        publish_result(result)
+    for order in touched:
+        publish_order_status(order)
+
+    return manifest
@@ -2,6 +2,7 @@ import io
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import mm
+from common.metrics import timed
 
 def _draw_kv(c, x, y, k, v, k_w=45*mm):
     c.setFont("Helvetica-Bold", 9)
@@ -9,6 +10,7 @@ def _draw_kv(c, x, y, k, v, k_w=45*mm):
     c.setFont("Helvetica", 9)
     c.drawString(x + k_w, y, str(v) if v is not None else "-")
 
+@timed("pdf_render")
 def generate_report_pdf_bytes(report_context: dict) -> bytes:
     """
     report_context expected keys:
@@ -1,4 +1,4 @@
-import io, hashlib, json
+import io, hashlib, json, time
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
 from reportlab.lib import colors
@@ -123,25 +123,25 @@ def generate_report_pdf_bytes_v2(report_context: dict) -> bytes:
         elements.append(Paragraph("Response Quality Flags (For Clinician Review)", H2))
 
         rq_rows = [
-        ["Duration (sec)", str(rq.get("duration_seconds","-"))],
-        ["Too Fast Flag", "YES" if rq.get("too_fast_flag") else "NO"],
-        ["Straight-lining Flag", "YES" if rq.get("straight_lining_flag") else "NO"],
-        ["Inconsistency Flag", "YES" if rq.get("inconsistency_flag") else "NO"],
-    ]
+            ["Duration (sec)", str(rq.get("duration_seconds","-"))],
+            ["Too Fast Flag", "YES" if rq.get("too_fast_flag") else "NO"],
+            ["Straight-lining Flag", "YES" if rq.get("straight_lining_flag") else "NO"],
+            ["Inconsistency Flag", "YES" if rq.get("inconsistency_flag") else "NO"],
+        ]
 
-    rq_table = Table(rq_rows, colWidths=[60*mm, 120*mm])
-    rq_table.setStyle(TableStyle([
-        ("GRID",(0,0),(-1,-1),0.25,colors.grey),
-        ("BACKGROUND",(0,0),(-1,0),colors.whitesmoke),
-        ("FONTNAME",(0,0),(0,-1),"Helvetica-Bold"),
-        ("FONTSIZE",(0,0),(-1,-1),9),
-        ("LEFTPADDING",(0,0),(-1,-1),6),
-        ("TOPPADDING",(0,0),(-1,-1),4),
-        ("BOTTOMPADDING",(0,0),(-1,-1),4),
-    ]))
+        rq_table = Table(rq_rows, colWidths=[60*mm, 120*mm])
+        rq_table.setStyle(TableStyle([
+            ("GRID",(0,0),(-1,-1),0.25,colors.grey),
+            ("BACKGROUND",(0,0),(-1,0),colors.whitesmoke),
+            ("FONTNAME",(0,0),(0,-1),"Helvetica-Bold"),
+            ("FONTSIZE",(0,0),(-1,-1),9),
+            ("LEFTPADDING",(0,0),(-1,-1),6),
+            ("TOPPADDING",(0,0),(-1,-1),4),
+            ("BOTTOMPADDING",(0,0),(-1,-1),4),
+        ]))
 
-    elements.append(rq_table)
-    elements.append(Spacer(1, 3*mm))
+        elements.append(rq_table)
+        elements.append(Spacer(1, 3*mm))
 
 
     # ===== RED FLAGS =====
@@ -271,3 +271,15 @@ def generate_report_pdf_bytes_v2(report_context: dict) -> bytes:
 
     buf.seek(0)
     return buf.read()
+
+
+def write_report_pdf_v2(report_context: dict, path: str) -> float:
+    """
+    Render a report straight to a file on disk; returns the render time
+    in seconds. This module imports no Django (nor common.metrics), so it
+    runs in a spawned process pool; callers record the pdf_render metric.
+    """
+    started = time.perf_counter()
+    with open(path, "wb") as fh:
+        fh.write(generate_report_pdf_bytes_v2(report_context))
+    return time.perf_counter() - started
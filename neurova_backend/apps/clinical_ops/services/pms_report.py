@@ -0,0 +1,333 @@
+"""
+Post-market surveillance (PMS) report engine.
+
+build_report() evaluates every registered metric for every quarter in
+the requested range. Independent (metric, quarter) queries run
+concurrently in a thread pool, each thread on its own DB connection.
+Closed quarters are served from PmsMetricSnapshot when cached, because
+a reported past quarter is frozen. A quarter only counts as closed
+PMS_SNAPSHOT_GRACE_DAYS after it ends, so late completions, sign-offs
+and rollup refreshes are still picked up before it is snapshotted.
+
+write_artifacts() writes the report as versioned JSON (with per-query
+timings) and long-format CSV (metric, period, row, field, value). Both
+are sorted deterministically, so two submissions can be diffed.
+
+Counters come from the daily rollups (services.pms_rollup); report,
+audit and delivery metrics query their source tables per quarter.
+Metric queries read from the replica when one is configured, unless
+this run just refreshed the rollups (then they stay on the primary).
+"""
+
+import contextvars
+import csv
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from apps.clinical_ops.audit.models import AuditEvent
+from apps.clinical_ops.models import AssessmentOrder
+from apps.clinical_ops.models_pms import PmsDailyRollup, PmsMetricSnapshot
+from apps.clinical_ops.models_report import AssessmentReport
+from apps.clinical_ops.services.pms_rollup import COUNTERS, refresh_rollups
+from common.db_router import replica_reads
+from common.tracing import span
+
+SCHEMA_VERSION = "1"
+DEFAULT_WORKERS = 4
+
+
+# --------------------------------------------------
+# PERIODS
+# --------------------------------------------------
+
+class Period:
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end  # exclusive
+
+    @property
+    def label(self):
+        return f"{self.start.year}-Q{(self.start.month - 1) // 3 + 1}"
+
+    @property
+    def closed(self):
+        grace = timedelta(days=getattr(settings, "PMS_SNAPSHOT_GRACE_DAYS", 30))
+        return self.end + grace <= timezone.localdate()
+
+    def bounds(self):
+        tz = timezone.get_current_timezone()
+        return (
+            timezone.make_aware(datetime.combine(self.start, datetime.min.time()), tz),
+            timezone.make_aware(datetime.combine(self.end, datetime.min.time()), tz),
+        )
+
+
+def quarters(date_from, date_to):
+    """Quarters overlapping [date_from, date_to], oldest first."""
+    start = date(date_from.year, 3 * ((date_from.month - 1) // 3) + 1, 1)
+    periods = []
+    while start <= date_to:
+        month = start.month + 3
+        end = date(start.year + (month > 12), (month - 1) % 12 + 1, 1)
+        periods.append(Period(start, end))
+        start = end
+    return periods
+
+
+# --------------------------------------------------
+# METRICS
+# --------------------------------------------------
+
+def _rate(part, total):
+    return round(part / total * 100, 2) if total else 0.0
+
+
+def _rollup_totals(period, *group):
+    qs = PmsDailyRollup.objects.filter(day__gte=period.start, day__lt=period.end)
+    if group:
+        return list(
+            qs.values(*group).annotate(**{name: Sum(name) for name in COUNTERS}).order_by(*group)
+        )
+    totals = qs.aggregate(**{name: Sum(name) for name in COUNTERS})
+    return [{name: value or 0 for name, value in totals.items()}]
+
+
+def assessments(period):
+    [t] = _rollup_totals(period)
+    return [{
+        "started": t["started"],
+        "completed": t["completed"],
+        "abandoned": t["abandoned"],
+        "abandonment_rate_pct": _rate(t["abandoned"], t["started"]),
+        "red_flags": t["red_flags"],
+        "red_flag_rate_pct": _rate(t["red_flags"], t["completed"]),
+    }]
+
+
+def review_time(period):
+    [t] = _rollup_totals(period)
+    avg = t["review_seconds_sum"] / t["reviewed"] / 3600 if t["reviewed"] else 0.0
+    return [{"reviewed": t["reviewed"], "avg_hours": round(avg, 2)}]
+
+
+def response_quality(period):
+    [t] = _rollup_totals(period)
+    avg = t["duration_seconds_sum"] / t["quality_total"] if t["quality_total"] else 0.0
+    return [{
+        "total": t["quality_total"],
+        "too_fast": t["too_fast"],
+        "straight_lining": t["straight_lining"],
+        "inconsistency": t["inconsistency"],
+        "avg_duration_seconds": round(avg, 2),
+    }]
+
+
+def instruments(period):
+    return [
+        {"battery_code": r["battery_code"], "battery_version": r["battery_version"], "count": r["started"]}
+        for r in _rollup_totals(period, "battery_code", "battery_version")
+        if r["started"]
+    ]
+
+
+def reports_generated(period):
+    lo, hi = period.bounds()
+    return [{"count": AssessmentReport.objects.filter(generated_at__gte=lo, generated_at__lt=hi).count()}]
+
+
+def audit_events(period):
+    lo, hi = period.bounds()
+    rows = (
+        AuditEvent.objects.filter(created_at__gte=lo, created_at__lt=hi)
+        .values("event_type")
+        .annotate(count=Count("id"), unique_entities=Count("entity_id", distinct=True))
+        .order_by("-count", "event_type")[:10]
+    )
+    return [dict(r) for r in rows]
+
+
+def delivery_modes(period):
+    lo, hi = period.bounds()
+    rows = (
+        AssessmentOrder.objects.filter(
+            status=AssessmentOrder.STATUS_DELIVERED,
+            deletion_status="ACTIVE",
+            created_at__gte=lo,
+            created_at__lt=hi,
+        )
+        .values("delivery_mode")
+        .annotate(count=Count("id"))
+        .order_by("-count", "delivery_mode")
+    )
+    return [dict(r) for r in rows]
+
+
+METRICS = {
+    "assessments": assessments,
+    "review_time": review_time,
+    "response_quality": response_quality,
+    "instruments": instruments,
+    "reports_generated": reports_generated,
+    "audit_events": audit_events,
+    "delivery_modes": delivery_modes,
+}
+
+
+# --------------------------------------------------
+# ENGINE
+# --------------------------------------------------
+
+def _evaluate(metric, period, own_connection):
+    started = time.perf_counter()
+    try:
+        with replica_reads(), span("pms_metric", metric=metric, period=period.label):
+            rows, error = METRICS[metric](period), None
+    except Exception as e:
+        rows, error = [], f"{type(e).__name__}: {e}"
+    finally:
+        if own_connection:
+            connections.close_all()
+    return rows, error, int((time.perf_counter() - started) * 1000)
+
+
+@span("pms.build_report")
+def build_report(date_from, date_to=None, *, workers=DEFAULT_WORKERS, use_cache=True, refresh=True):
+    """Evaluate all metrics for every quarter in range; returns the report dict."""
+    date_to = date_to or timezone.localdate()
+    started = time.perf_counter()
+
+    if refresh:
+        refresh_rollups()
+
+    periods = quarters(date_from, date_to)
+    cached = {}
+    if use_cache:
+        for snap in PmsMetricSnapshot.objects.filter(
+            schema_version=SCHEMA_VERSION,
+            period_start__in=[p.start for p in periods if p.closed],
+        ):
+            cached[(snap.metric, snap.period_start, snap.period_end)] = snap
+
+    entries = []
+    todo = []
+    for metric in METRICS:
+        for period in periods:
+            entry = {
+                "metric": metric,
+                "period": period.label,
+                "start": period.start.isoformat(),
+                "end": period.end.isoformat(),
+                "closed": period.closed,
+                "cached": False,
+            }
+            snap = cached.get((metric, period.start, period.end))
+            if snap is not None:
+                entry.update(cached=True, rows=snap.rows, error=None, duration_ms=0)
+            else:
+                todo.append((entry, metric, period))
+            entries.append(entry)
+
+    if workers > 1 and len(todo) > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pms-report") as pool:
+            # Each task carries the caller's routing state (a fresh refresh pins to primary)
+            futures = [
+                pool.submit(contextvars.copy_context().run, _evaluate, metric, period, True)
+                for _, metric, period in todo
+            ]
+            results = [f.result() for f in futures]
+    else:
+        results = [_evaluate(metric, period, own_connection=False) for _, metric, period in todo]
+
+    snapshots = []
+    for (entry, metric, period), (rows, error, duration_ms) in zip(todo, results):
+        entry.update(rows=rows, error=error, duration_ms=duration_ms)
+        if period.closed and error is None:
+            snapshots.append(PmsMetricSnapshot(
+                metric=metric,
+                period_start=period.start,
+                period_end=period.end,
+                schema_version=SCHEMA_VERSION,
+                rows=rows,
+                duration_ms=duration_ms,
+            ))
+    PmsMetricSnapshot.objects.bulk_create(
+        snapshots,
+        update_conflicts=True,
+        unique_fields=["metric", "period_start", "period_end", "schema_version"],
+        update_fields=["rows", "duration_ms", "computed_at"],
+    )
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "engine_version": settings.ENGINE_VERSION,
+        "app_version": settings.APP_VERSION,
+        "generated_at": timezone.now().isoformat(),
+        "range": {"from": date_from.isoformat(), "to": date_to.isoformat()},
+        "total_ms": int((time.perf_counter() - started) * 1000),
+        "metrics": entries,
+    }
+
+
+# --------------------------------------------------
+# ARTIFACTS
+# --------------------------------------------------
+
+def artifact_basename(report):
+    return f"pms_report_v{report['schema_version']}_{report['range']['from']}_{report['range']['to']}"
+
+
+def write_artifacts(report, output_dir=None):
+    """Write <basename>.json and <basename>.csv; returns both paths."""
+    output_dir = output_dir or settings.PMS_REPORT_DIR
+    os.makedirs(output_dir, exist_ok=True)
+    base = os.path.join(output_dir, artifact_basename(report))
+
+    json_path = f"{base}.json"
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True, default=str)
+        f.write("\n")
+
+    csv_path = f"{base}.csv"
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["schema_version", "metric", "period", "row", "field", "value"])
+        for entry in report["metrics"]:
+            for index, row in enumerate(entry["rows"]):
+                for field in sorted(row):
+                    writer.writerow([report["schema_version"], entry["metric"], entry["period"], index, field, row[field]])
+
+    return json_path, csv_path
+
+
+def render_text(report):
+    """Human-readable summary for the console."""
+    lines = [
+        "=" * 80,
+        "POST-MARKET SURVEILLANCE METRICS",
+        f"Generated: {report['generated_at']} | Range: {report['range']['from']} .. {report['range']['to']}",
+        "=" * 80,
+    ]
+    current = None
+    for entry in report["metrics"]:
+        if entry["metric"] != current:
+            current = entry["metric"]
+            lines += ["", current.upper().replace("_", " "), "-" * 80]
+        source = "cached" if entry["cached"] else f"{entry['duration_ms']} ms"
+        if entry["error"]:
+            lines.append(f"{entry['period']}: ERROR {entry['error']}")
+            continue
+        if not entry["rows"]:
+            lines.append(f"{entry['period']}: No data available ({source})")
+        for row in entry["rows"]:
+            values = " | ".join(f"{k}: {v}" for k, v in row.items())
+            lines.append(f"{entry['period']}: {values} ({source})")
+    lines += ["", f"Completed in {report['total_ms']} ms"]
+    return "\n".join(lines)
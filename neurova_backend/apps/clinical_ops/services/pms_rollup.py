@@ -0,0 +1,196 @@
+"""
+Incremental daily rollups for post-market surveillance (PMS) metrics.
+
+PmsDailyRollup holds one row per (org, battery, version, day of order
+creation). refresh_rollups() finds the buckets touched since the stored
+high-water mark (order updated_at, result computed_at, quality
+created_at, report signed_at), recomputes only those days from source
+and replaces their rows. PMS reports then sum a handful of rollup rows
+per quarter instead of scanning the whole order history.
+
+A small overlap is re-read behind the mark so rows committed by
+transactions that started before the previous run are not missed.
+
+Response-quality counters are bucketed by the order's creation day
+(the quality row is written at submission, normally the same day).
+"""
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import Coalesce, TruncDate, TruncQuarter
+from django.utils import timezone
+
+from apps.clinical_ops.models import AssessmentOrder, ResponseQuality
+from apps.clinical_ops.models_assessment import AssessmentResult
+from apps.clinical_ops.models_pms import PmsDailyRollup, PmsRollupState
+from apps.clinical_ops.models_report import AssessmentReport
+from common.db_locks import advisory_lock
+
+STATE_NAME = "daily"
+OVERLAP = timedelta(minutes=5)
+
+COMPLETED_STATUSES = [
+    AssessmentOrder.STATUS_COMPLETED,
+    AssessmentOrder.STATUS_AWAITING_REVIEW,
+    AssessmentOrder.STATUS_DELIVERED,
+]
+ABANDONED_STATUSES = [
+    AssessmentOrder.STATUS_CREATED,
+    AssessmentOrder.STATUS_IN_PROGRESS,
+]
+
+COUNTERS = [
+    "started", "completed", "abandoned", "red_flags",
+    "quality_total", "too_fast", "straight_lining", "inconsistency", "duration_seconds_sum",
+    "reviewed", "review_seconds_sum",
+]
+
+_REVIEWED = Q(
+    completed_at__isnull=False,
+    report__signoff_status="SIGNED",
+    report__signed_at__isnull=False,
+)
+
+
+# --------------------------------------------------
+# DIRTY BUCKETS
+# --------------------------------------------------
+
+def dirty_buckets(since=None):
+    """{org_id: {day, ...}} for orders touched at or after since (None = all)."""
+    if since is None:
+        sources = [(AssessmentOrder.objects.all(), "created_at")]
+    else:
+        sources = [
+            (AssessmentOrder.objects.filter(updated_at__gte=since), "created_at"),
+            (AssessmentResult.objects.filter(computed_at__gte=since), "order__created_at"),
+            (ResponseQuality.objects.filter(created_at__gte=since), "order__created_at"),
+            (AssessmentReport.objects.filter(signed_at__gte=since), "order__created_at"),
+        ]
+
+    buckets = defaultdict(set)
+    for qs, created_field in sources:
+        rows = qs.annotate(day=TruncDate(created_field)).values_list("org_id", "day").distinct()
+        for org_id, day in rows:
+            buckets[org_id].add(day)
+    return buckets
+
+
+def _day_bounds(day):
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(day, time.min), tz)
+    return start, start + timedelta(days=1)
+
+
+# --------------------------------------------------
+# RECOMPUTE
+# --------------------------------------------------
+
+def compute_rows(org_id, days):
+    """Aggregate source rows for one org's days into unsaved PmsDailyRollup objects."""
+    lo, _ = _day_bounds(min(days))
+    _, hi = _day_bounds(max(days))
+
+    rows = (
+        AssessmentOrder.objects
+        .filter(org_id=org_id, deletion_status="ACTIVE", created_at__gte=lo, created_at__lt=hi)
+        .annotate(day=TruncDate("created_at"))
+        .filter(day__in=days)
+        .values("battery_code", "battery_version", "day")
+        .annotate(
+            started=Count("id"),
+            completed=Count("id", filter=Q(status__in=COMPLETED_STATUSES)),
+            abandoned=Count("id", filter=Q(status__in=ABANDONED_STATUSES)),
+            red_flags=Count("id", filter=Q(status__in=COMPLETED_STATUSES, result__has_red_flags=True)),
+            quality_total=Count("response_quality"),
+            too_fast=Count("id", filter=Q(response_quality__too_fast_flag=True)),
+            straight_lining=Count("id", filter=Q(response_quality__straight_lining_flag=True)),
+            inconsistency=Count("id", filter=Q(response_quality__inconsistency_flag=True)),
+            duration_seconds_sum=Coalesce(Sum("response_quality__duration_seconds"), 0),
+            reviewed=Count("id", filter=_REVIEWED),
+            review_time=Sum(
+                ExpressionWrapper(F("report__signed_at") - F("completed_at"), output_field=DurationField()),
+                filter=_REVIEWED,
+            ),
+        )
+    )
+
+    now = timezone.now()
+    result = []
+    for row in rows:
+        review_time = row.pop("review_time")
+        result.append(PmsDailyRollup(
+            org_id=org_id,
+            review_seconds_sum=int(review_time.total_seconds()) if review_time else 0,
+            refreshed_at=now,
+            **row,
+        ))
+    return result
+
+
+def rebuild_buckets(buckets):
+    """Replace the rollup rows of the given {org_id: days} buckets. Returns rows written."""
+    written = 0
+    for org_id, days in buckets.items():
+        days = sorted(days)
+        rows = compute_rows(org_id, days)
+        with transaction.atomic():
+            PmsDailyRollup.objects.filter(org_id=org_id, day__in=days).delete()
+            PmsDailyRollup.objects.bulk_create(rows)
+        written += len(rows)
+    return written
+
+
+def refresh_rollups(full=False):
+    """
+    Bring rollups up to date. full=True rebuilds every bucket.
+    Returns a stats dict, or None when another refresh holds the lock.
+    """
+    with advisory_lock("clinical_ops.pms_rollup") as acquired:
+        if not acquired:
+            return None
+
+        state, _ = PmsRollupState.objects.get_or_create(name=STATE_NAME)
+        run_started = timezone.now()
+
+        if full or state.high_water_mark is None:
+            PmsDailyRollup.objects.all().delete()
+            buckets = dirty_buckets()
+        else:
+            buckets = dirty_buckets(state.high_water_mark - OVERLAP)
+
+        written = rebuild_buckets(buckets)
+
+        state.high_water_mark = run_started
+        state.updated_at = timezone.now()
+        state.save(update_fields=["high_water_mark", "updated_at"])
+
+    return {
+        "orgs": len(buckets),
+        "days": sum(len(days) for days in buckets.values()),
+        "rows": written,
+    }
+
+
+# --------------------------------------------------
+# READ
+# --------------------------------------------------
+
+def quarterly_rollup(start_date=None, org_id=None, by_battery=False):
+    """Sum rollups per quarter (most recent first); optionally per battery."""
+    qs = PmsDailyRollup.objects.all()
+    if start_date is not None:
+        qs = qs.filter(day__gte=start_date)
+    if org_id is not None:
+        qs = qs.filter(org_id=org_id)
+
+    group = ["quarter", "battery_code", "battery_version"] if by_battery else ["quarter"]
+    return list(
+        qs.annotate(quarter=TruncQuarter("day"))
+        .values(*group)
+        .annotate(**{name: Sum(name) for name in COUNTERS})
+        .order_by("-quarter", *group[1:])
+    )
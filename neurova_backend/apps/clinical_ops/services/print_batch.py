@@ -0,0 +1,277 @@
+"""
+End-of-day print batches.
+
+Collects the report PDFs of many orders (stored copy when present,
+fresh render otherwise), renders missing ones in a process pool, and
+merges everything behind a cover sheet into one paginated PDF.
+
+Stored copies are hashed while copied and checked against
+AssessmentReport.pdf_sha256, like patient downloads; a mismatch is
+skipped (and audited), never printed.
+
+Parts live in a temporary directory on disk and the merged result is
+hashed and streamed into storage chunk by chunk. The merge itself holds
+every page in memory until it is written (pypdf), so memory grows with
+the batch's page count; MAX_ORDERS_PER_BATCH bounds it.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.files import File
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from pypdf import PdfReader, PdfWriter
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from apps.clinical_ops.audit.logger import log_event
+from apps.clinical_ops.models import AssessmentOrder
+from apps.clinical_ops.models_assessment import AssessmentResult
+from apps.clinical_ops.models_print_batch import PrintBatch
+from apps.clinical_ops.models_report import AssessmentReport
+from apps.clinical_ops.services.pdf_report_v2 import write_report_pdf_v2
+from apps.clinical_ops.services.report_context import build_report_context
+from common.metrics import STAGE_LATENCY
+
+MAX_ORDERS_PER_BATCH = 1000
+DEFAULT_WORKERS = 4
+CHUNK_SIZE = 64 * 1024
+
+PRINTABLE_STATUSES = [
+    AssessmentOrder.STATUS_AWAITING_REVIEW,
+    AssessmentOrder.STATUS_COMPLETED,
+    AssessmentOrder.STATUS_ACCEPTED,
+    AssessmentOrder.STATUS_REMARK,
+    AssessmentOrder.STATUS_DELIVERED,
+]
+
+
+# --------------------------------------------------
+# SELECTION
+# --------------------------------------------------
+
+def select_print_orders(org, order_ids=None, filters=None):
+    """
+    Explicit order ids win; otherwise pick DELIVERY_PRINT orders,
+    optionally restricted to a completion date ({"date": "YYYY-MM-DD"}).
+    """
+    qs = AssessmentOrder.objects.filter(
+        org=org,
+        deletion_status="ACTIVE",
+        status__in=PRINTABLE_STATUSES,
+    )
+
+    if order_ids:
+        qs = qs.filter(id__in=order_ids)
+    else:
+        filters = filters or {}
+        qs = qs.filter(delivery_mode=filters.get("delivery_mode", AssessmentOrder.DELIVERY_PRINT))
+        day = parse_date(str(filters.get("date") or ""))
+        if day:
+            qs = qs.filter(completed_at__date=day)
+
+    return qs.select_related("patient").order_by("id")[:MAX_ORDERS_PER_BATCH]
+
+
+# --------------------------------------------------
+# PARTS
+# --------------------------------------------------
+
+def _copy_stored_pdf(report, path):
+    """Copy the stored PDF to path; returns its sha256."""
+    hasher = hashlib.sha256()
+    with report.pdf_file.open("rb") as src, open(path, "wb") as dst:
+        for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+            hasher.update(chunk)
+            dst.write(chunk)
+    return hasher.hexdigest()
+
+
+def _log_tamper(batch, report, actual):
+    log_event(
+        org=batch.org,
+        event_type="REPORT_TAMPER_DETECTED",
+        entity_type="AssessmentOrder",
+        entity_id=report.order_id,
+        actor_role="System",
+        details={
+            "print_batch_id": batch.id,
+            "expected_sha256": report.pdf_sha256,
+            "actual_sha256": actual,
+        },
+        severity="CRITICAL",
+    )
+
+
+def _write_cover(batch, rows, path):
+    styles = getSampleStyleSheet()
+    doc = SimpleDocTemplate(
+        path,
+        pagesize=A4,
+        leftMargin=16 * mm,
+        rightMargin=16 * mm,
+        topMargin=14 * mm,
+        bottomMargin=14 * mm,
+        title=f"Print Batch {batch.id}",
+    )
+
+    table = Table(
+        [["#", "Order", "Patient", "Battery", "Pages", "Source"]] + rows,
+        repeatRows=1,
+        colWidths=[10 * mm, 18 * mm, 62 * mm, 50 * mm, 15 * mm, 22 * mm],
+    )
+    table.setStyle(TableStyle([
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#EEEEEE")),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+    ]))
+
+    doc.build([
+        Paragraph(f"Print Batch #{batch.id} - {batch.org.name}", styles["Heading1"]),
+        Paragraph(f"Generated {timezone.localtime().strftime('%d %B %Y, %I:%M %p')}", styles["Normal"]),
+        Paragraph(f"{len(rows)} report(s)", styles["Normal"]),
+        Spacer(1, 6 * mm),
+        table,
+    ])
+
+
+def _render_parts(jobs, workers):
+    """jobs: [(ctx, path)]. Renders inline for a single worker."""
+    if workers <= 1 or len(jobs) <= 1:
+        seconds = [write_report_pdf_v2(ctx, path) for ctx, path in jobs]
+    else:
+        # spawn: children never inherit the parent's database connections
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            seconds = list(pool.map(write_report_pdf_v2, *zip(*jobs)))
+
+    # Workers stay metrics-free; their render times are recorded here
+    for elapsed in seconds:
+        STAGE_LATENCY.labels(stage="pdf_render").observe(elapsed)
+
+
+# --------------------------------------------------
+# RUN
+# --------------------------------------------------
+
+def run_print_batch(batch: PrintBatch, workers=DEFAULT_WORKERS) -> PrintBatch:
+    batch.status = PrintBatch.STATUS_RUNNING
+    batch.save(update_fields=["status"])
+
+    workdir = tempfile.mkdtemp(prefix=f"print_batch_{batch.id}_")
+    try:
+        orders = list(select_print_orders(batch.org, batch.order_ids, batch.filters))
+        reports = {
+            r.order_id: r
+            for r in AssessmentReport.objects.filter(order__in=orders).exclude(pdf_file="")
+        }
+        scored = set(
+            AssessmentResult.objects.filter(order__in=orders).values_list("order_id", flat=True)
+        )
+
+        parts, jobs, skipped = [], [], []
+        for order in orders:
+            path = os.path.join(workdir, f"order_{order.id}.pdf")
+            report = reports.get(order.id)
+
+            if report and report.pdf_file and not batch.rerender:
+                actual = _copy_stored_pdf(report, path)
+                if report.pdf_sha256 and actual != report.pdf_sha256:
+                    os.remove(path)
+                    _log_tamper(batch, report, actual)
+                    skipped.append({"order_id": order.id, "reason": "PDF integrity check failed"})
+                    continue
+                source = "STORED"
+            elif order.id in scored:
+                jobs.append((build_report_context(order), path))
+                source = "RENDERED"
+            else:
+                skipped.append({"order_id": order.id, "reason": "No assessment result"})
+                continue
+
+            parts.append((order, path, source))
+
+        if batch.order_ids:
+            found = {o.id for o in orders}
+            skipped += [
+                {"order_id": oid, "reason": "Not printable"}
+                for oid in batch.order_ids if oid not in found
+            ]
+
+        _render_parts(jobs, workers)
+
+        rows, page_count = [], 0
+        for n, (order, path, source) in enumerate(parts, start=1):
+            pages = len(PdfReader(path).pages)
+            page_count += pages
+            rows.append([n, order.id, order.patient.full_name, order.battery_code, pages, source])
+
+        cover_path = os.path.join(workdir, "cover.pdf")
+        _write_cover(batch, rows, cover_path)
+
+        writer = PdfWriter()
+        writer.append(cover_path, outline_item="Cover sheet")
+        for order, path, _ in parts:
+            writer.append(path, outline_item=f"Order {order.id} - {order.patient.full_name}")
+
+        merged_path = os.path.join(workdir, "merged.pdf")
+        with open(merged_path, "wb") as fh:
+            writer.write(fh)
+        writer.close()
+
+        hasher = hashlib.sha256()
+        with open(merged_path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(CHUNK_SIZE), b""):
+                hasher.update(chunk)
+
+        with open(merged_path, "rb") as fh:
+            batch.merged_file.save(f"PRINT_BATCH_{batch.id}.pdf", File(fh), save=False)
+
+        batch.pdf_sha256 = hasher.hexdigest()
+        batch.report_count = len(parts)
+        batch.printed_order_ids = [order.id for order, _, _ in parts]
+        batch.page_count = page_count + len(PdfReader(cover_path).pages)
+        batch.skipped = skipped
+        batch.status = PrintBatch.STATUS_COMPLETED
+        batch.completed_at = timezone.now()
+        batch.error = None
+        batch.save()
+
+        log_event(
+            org=batch.org,
+            event_type="PRINT_BATCH_GENERATED",
+            entity_type="PrintBatch",
+            entity_id=batch.id,
+            actor_user_id=batch.created_by_user_id,
+            actor_role="System",
+            details={
+                "report_count": batch.report_count,
+                "page_count": batch.page_count,
+                "skipped": len(skipped),
+                "pdf_sha256": batch.pdf_sha256,
+            },
+            severity="INFO",
+        )
+
+    except Exception as e:
+        batch.status = PrintBatch.STATUS_FAILED
+        batch.error = str(e)
+        batch.completed_at = timezone.now()
+        batch.save(update_fields=["status", "error", "completed_at"])
+        raise
+
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return batch
@@ -1,74 +1,82 @@
 from datetime import timedelta
+from django.db.models import F
 from django.utils import timezone
 from rest_framework.exceptions import PermissionDenied
 from apps.clinical_ops.models_public_token import PublicAccessToken
-from apps.clinical_ops.audit.logger import log_event
+from apps.clinical_ops.audit.logger import alog_event, log_event
+from common.metrics import TOKEN_ROTATIONS
+from common.tracing import span
 
 MAX_FAILED_ATTEMPTS = 5
 TOKEN_EXPIRY_MINUTES = 60 * 24  # Ultra short expiry
 
 
-def validate_and_rotate_url_token(raw_token, request):
-
-    token_hash = PublicAccessToken.hash_token(raw_token)
+def _denied(message, outcome):
+    TOKEN_ROTATIONS.labels(outcome=outcome).inc()
+    return PermissionDenied(message)
 
-    try:
-        token_obj = PublicAccessToken.objects.select_related("order").get(
-            token_hash=token_hash
-        )
-    except PublicAccessToken.DoesNotExist:
-        raise PermissionDenied("Invalid token")
 
+def _check_state(token_obj):
     # Locked?
     if token_obj.is_locked:
-        raise PermissionDenied("Token locked")
+        raise _denied("Token locked", "locked")
 
     # Expired?
     if token_obj.is_expired():
-        raise PermissionDenied("Token expired")
+        raise _denied("Token expired", "expired")
 
     # Already used?
     if token_obj.is_used:
-        raise PermissionDenied("Token already used")
+        raise _denied("Token already used", "used")
 
-    current_ip = request.META.get("REMOTE_ADDR")
-    current_ua = request.META.get("HTTP_USER_AGENT", "")
 
-    # IP Binding Check
+def _binding_mismatch(token_obj, current_ip, current_ua):
+    """(message, outcome) when the token is bound to another IP / device."""
     if token_obj.bound_ip and token_obj.bound_ip != current_ip:
-        token_obj.failed_attempts += 1
-        token_obj.save(update_fields=["failed_attempts"])
-        raise PermissionDenied("IP mismatch")
-
-    # Device Binding Check
+        return "IP mismatch", "ip_mismatch"
     if token_obj.bound_user_agent and token_obj.bound_user_agent != current_ua:
-        token_obj.failed_attempts += 1
-        token_obj.save(update_fields=["failed_attempts"])
-        raise PermissionDenied("Device mismatch")
+        return "Device mismatch", "device_mismatch"
+    return None
 
-    # Bind on first use
-    if not token_obj.bound_ip:
-        token_obj.bound_ip = current_ip
 
-    if not token_obj.bound_user_agent:
-        token_obj.bound_user_agent = current_ua
+# ------------------------------
+# SHARED BY THE SYNC AND ASYNC PATHS
+# ------------------------------
 
-    token_obj.save(update_fields=["bound_ip", "bound_user_agent"])
+def _client(request):
+    return request.META.get("REMOTE_ADDR"), request.META.get("HTTP_USER_AGENT", "")
 
-    # ------------------------------
-    # MARK OLD TOKEN AS USED
-    # ------------------------------
-    token_obj.is_used = True
-    token_obj.last_used_at = timezone.now()
-    token_obj.save(update_fields=["is_used", "last_used_at"])
 
-    # ------------------------------
-    # CREATE NEW TOKEN ROW
-    # ------------------------------
-    new_raw_token = PublicAccessToken.generate_raw_token()
+def _failed_attempt(token_obj):
+    """Queryset and values counting one binding mismatch."""
+    return (
+        PublicAccessToken.objects.filter(pk=token_obj.pk),
+        {"failed_attempts": F("failed_attempts") + 1},
+    )
 
-    PublicAccessToken.objects.create(
-        order=token_obj.order,
+
+def _claim(token_obj, current_ip, current_ua):
+    """
+    Queryset and values that mark the token used (binding it on first
+    use). The is_used=False filter makes the claim atomic: of two
+    concurrent requests with the same token only one updates a row.
+    """
+    return (
+        PublicAccessToken.objects.filter(pk=token_obj.pk, is_used=False),
+        {
+            "bound_ip": token_obj.bound_ip or current_ip,
+            "bound_user_agent": token_obj.bound_user_agent or current_ua,
+            "is_used": True,
+            "last_used_at": timezone.now(),
+        },
+    )
+
+
+def _successor(order, current_ip, current_ua):
+    """(raw token, unsaved PublicAccessToken) replacing the claimed one."""
+    new_raw_token = PublicAccessToken.generate_raw_token()
+    token = PublicAccessToken(
+        order=order,
         token_hash=PublicAccessToken.hash_token(new_raw_token),
         expires_at=timezone.now() + timedelta(minutes=TOKEN_EXPIRY_MINUTES),
         bound_ip=current_ip,
@@ -76,23 +84,109 @@ def validate_and_rotate_url_token(raw_token, request):
         failed_attempts=0,
         is_used=False
     )
+    return new_raw_token, token
 
-    # ------------------------------
-    # UPDATE ORDER WITH NEW TOKEN
-    # ------------------------------
-    token_obj.order.public_token = new_raw_token
-    token_obj.order.save(update_fields=["public_token"])
 
-    # Audit Log
-    log_event(
-        org=token_obj.order.org,
+def _rotation_event(order, current_ip, request):
+    return dict(
+        org=order.org,
         event_type="PUBLIC_TOKEN_ROTATED",
         entity_type="AssessmentOrder",
-        entity_id=token_obj.order.id,
+        entity_id=order.id,
         actor_role="PublicUser",
         details={"ip": current_ip},
         request=request,
         severity="SECURITY"
     )
 
-    return token_obj.order, new_raw_token
+
+@span("validate_and_rotate_url_token")
+def validate_and_rotate_url_token(raw_token, request):
+
+    token_hash = PublicAccessToken.hash_token(raw_token)
+
+    try:
+        token_obj = PublicAccessToken.objects.select_related("order").get(
+            token_hash=token_hash
+        )
+    except PublicAccessToken.DoesNotExist:
+        raise _denied("Invalid token", "invalid")
+
+    _check_state(token_obj)
+
+    current_ip, current_ua = _client(request)
+
+    mismatch = _binding_mismatch(token_obj, current_ip, current_ua)
+    if mismatch:
+        queryset, values = _failed_attempt(token_obj)
+        queryset.update(**values)
+        raise _denied(*mismatch)
+
+    # ------------------------------
+    # CLAIM OLD TOKEN (bind + mark used)
+    # ------------------------------
+    queryset, values = _claim(token_obj, current_ip, current_ua)
+    if not queryset.update(**values):
+        raise _denied("Token already used", "used")
+
+    # ------------------------------
+    # CREATE NEW TOKEN ROW
+    # ------------------------------
+    new_raw_token, successor = _successor(token_obj.order, current_ip, current_ua)
+    successor.save()
+
+    # ------------------------------
+    # UPDATE ORDER WITH NEW TOKEN
+    # ------------------------------
+    order = token_obj.order
+    order.public_token = new_raw_token
+    order.save(update_fields=["public_token"])
+
+    # Audit Log
+    log_event(**_rotation_event(order, current_ip, request))
+    TOKEN_ROTATIONS.labels(outcome="rotated").inc()
+
+    return order, new_raw_token
+
+
+async def avalidate_and_rotate_url_token(raw_token, request):
+    """
+    validate_and_rotate_url_token for async views: the same checks, claim
+    and rotation helpers through the async ORM. The order comes back with
+    org and patient loaded so callers never trigger a lazy (sync) query.
+    """
+    with span("validate_and_rotate_url_token"):
+        token_hash = PublicAccessToken.hash_token(raw_token)
+
+        try:
+            token_obj = await PublicAccessToken.objects.select_related(
+                "order", "order__org", "order__patient"
+            ).aget(token_hash=token_hash)
+        except PublicAccessToken.DoesNotExist:
+            raise _denied("Invalid token", "invalid")
+
+        _check_state(token_obj)
+
+        current_ip, current_ua = _client(request)
+
+        mismatch = _binding_mismatch(token_obj, current_ip, current_ua)
+        if mismatch:
+            queryset, values = _failed_attempt(token_obj)
+            await queryset.aupdate(**values)
+            raise _denied(*mismatch)
+
+        queryset, values = _claim(token_obj, current_ip, current_ua)
+        if not await queryset.aupdate(**values):
+            raise _denied("Token already used", "used")
+
+        new_raw_token, successor = _successor(token_obj.order, current_ip, current_ua)
+        await successor.asave()
+
+        order = token_obj.order
+        order.public_token = new_raw_token
+        await order.asave(update_fields=["public_token"])
+
+        await alog_event(**_rotation_event(order, current_ip, request))
+        TOKEN_ROTATIONS.labels(outcome="rotated").inc()
+
+        return order, new_raw_token
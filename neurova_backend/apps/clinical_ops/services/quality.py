@@ -1,3 +1,7 @@
+from common.tracing import span
+
+
+@span("compute_quality")
 def compute_quality(duration_seconds: int, answers: list) -> dict:
     """
     answers: list of dicts: {"question_id": "...", "value": int}
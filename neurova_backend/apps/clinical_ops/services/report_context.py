@@ -2,7 +2,9 @@ from apps.clinical_ops.models import AssessmentOrder
 from apps.clinical_ops.models_assessment import AssessmentResult
 from apps.clinical_ops.models_report import AssessmentReport
 from django.utils.timezone import localtime
+from common.metrics import timed
 
+@timed("report_context")
 def build_report_context(order: AssessmentOrder) -> dict:
     # Must exist
     result = AssessmentResult.objects.get(order=order)
@@ -0,0 +1,196 @@
+"""
+Report file delivery backends.
+
+Views finish their authorization, integrity check and audit logging,
+then hand the stored file to the configured backend
+(settings.REPORT_DELIVERY_BACKEND):
+
+    stream     Python streams the file (ranges, ETag) - always available
+    accel      nginx serves it via X-Accel-Redirect
+    sendfile   Apache/lighttpd serve it via X-Sendfile
+    presigned  302 to a short-lived signed object-storage URL
+
+Offloading backends fall back to streaming when the storage cannot
+support them (e.g. accel on S3, presigned on local disk).
+
+nginx example for accel:
+    location /protected-media/ {
+        internal;
+        alias /srv/neurova/media/;
+    }
+"""
+
+import logging
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseRedirect
+from django.utils.http import http_date
+
+from common.http_conditional import aranged_file_response, ranged_file_response
+
+logger = logging.getLogger(__name__)
+
+
+def _local_path(field_file):
+    try:
+        return field_file.storage.path(field_file.name)
+    except NotImplementedError:
+        return None
+
+
+def _offload_response(header, value, *, etag, last_modified, content_type, filename, disposition):
+    response = HttpResponse(content_type=content_type)
+    response[header] = value
+    if etag:
+        response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(int(last_modified.timestamp()))
+    response["Cache-Control"] = "private, no-cache"
+    response["Content-Disposition"] = f'{disposition}; filename="{filename}"'
+    return response
+
+
+class StreamDelivery:
+    name = "stream"
+
+    def supports(self, field_file):
+        return True
+
+    def deliver(self, request, field_file, *, etag, last_modified, content_type, filename, disposition):
+        return ranged_file_response(
+            request,
+            field_file.open("rb"),
+            size=field_file.size,
+            etag=etag,
+            last_modified=last_modified,
+            content_type=content_type,
+            filename=filename,
+            disposition=disposition,
+        )
+
+
+class AccelRedirectDelivery:
+    name = "accel"
+
+    def supports(self, field_file):
+        return _local_path(field_file) is not None
+
+    def deliver(self, request, field_file, **kwargs):
+        prefix = getattr(settings, "REPORT_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+        uri = prefix.rstrip("/") + "/" + quote(field_file.name.lstrip("/"))
+        return _offload_response("X-Accel-Redirect", uri, **kwargs)
+
+
+class SendfileDelivery:
+    name = "sendfile"
+
+    def supports(self, field_file):
+        return _local_path(field_file) is not None
+
+    def deliver(self, request, field_file, **kwargs):
+        return _offload_response("X-Sendfile", _local_path(field_file), **kwargs)
+
+
+class PresignedUrlDelivery:
+    name = "presigned"
+
+    def supports(self, field_file):
+        # Object storages (django-storages S3) sign URLs and accept expire=
+        return _local_path(field_file) is None
+
+    def presigned_url(self, field_file, *, content_type, filename, disposition):
+        ttl = getattr(settings, "REPORT_PRESIGNED_URL_TTL_SECONDS", 60)
+        return field_file.storage.url(
+            field_file.name,
+            parameters={
+                "ResponseContentType": content_type,
+                "ResponseContentDisposition": f'{disposition}; filename="{filename}"',
+            },
+            expire=ttl,
+        )
+
+    def deliver(self, request, field_file, *, etag, last_modified, content_type, filename, disposition):
+        response = HttpResponseRedirect(
+            self.presigned_url(
+                field_file,
+                content_type=content_type,
+                filename=filename,
+                disposition=disposition,
+            )
+        )
+        # The signed URL is a credential: never cache the redirect
+        response["Cache-Control"] = "no-store"
+        return response
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (StreamDelivery(), AccelRedirectDelivery(), SendfileDelivery(), PresignedUrlDelivery())
+}
+
+
+def get_delivery_backend(field_file):
+    name = getattr(settings, "REPORT_DELIVERY_BACKEND", "stream")
+    backend = BACKENDS.get(name)
+
+    if backend is None:
+        logger.warning(f"Unknown REPORT_DELIVERY_BACKEND {name!r}; streaming instead")
+        return BACKENDS["stream"]
+    if not backend.supports(field_file):
+        return BACKENDS["stream"]
+    return backend
+
+
+def deliver_report_file(
+    request,
+    field_file,
+    *,
+    etag=None,
+    last_modified=None,
+    content_type="application/pdf",
+    filename,
+    disposition="attachment",
+):
+    """
+    Hand a stored report to the configured backend. Call only after
+    authorization, integrity verification and audit logging.
+    """
+    return get_delivery_backend(field_file).deliver(
+        request,
+        field_file,
+        etag=etag,
+        last_modified=last_modified,
+        content_type=content_type,
+        filename=filename,
+        disposition=disposition,
+    )
+
+
+async def adeliver_report_file(
+    request,
+    field_file,
+    *,
+    etag=None,
+    last_modified=None,
+    content_type="application/pdf",
+    filename,
+    disposition="attachment",
+):
+    """deliver_report_file for async views; streaming never blocks the event loop."""
+    backend = get_delivery_backend(field_file)
+    options = dict(
+        etag=etag,
+        last_modified=last_modified,
+        content_type=content_type,
+        filename=filename,
+        disposition=disposition,
+    )
+    if backend.name != StreamDelivery.name:
+        # Header-only responses (offload / signed URL); may still touch storage
+        return await sync_to_async(backend.deliver, thread_sensitive=False)(request, field_file, **options)
+
+    fileobj = await sync_to_async(field_file.open, thread_sensitive=False)("rb")
+    size = await sync_to_async(lambda: field_file.size, thread_sensitive=False)()
+    return aranged_file_response(request, fileobj, size=size, **options)
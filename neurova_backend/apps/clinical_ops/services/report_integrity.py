@@ -0,0 +1,268 @@
+"""
+Background integrity verification for stored report PDFs.
+
+`manage.py sweep_report_integrity` re-hashes every AssessmentReport and
+reports.Report PDF in a bounded thread pool, records the outcome in
+ReportIntegrityCheck and raises REPORT_TAMPER_DETECTED when a file no
+longer matches. It then seals the day with a Merkle root over all
+verified hashes, so one value attests to the whole corpus.
+
+Downloads use current_pdf_sha256(): a file verified within
+REPORT_INTEGRITY_TRUST_HOURS (same size as when verified) is trusted
+without another full read.
+
+Merkle construction: leaves are sha256("<source>:<report_id>:<sha256>")
+ordered by (source, report_id); pairs are hashed upward and an odd
+node is paired with itself. An empty corpus has root sha256(b"").
+"""
+
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.clinical_ops.audit.logger import log_events
+from apps.clinical_ops.models_integrity import IntegrityMerkleRoot, ReportIntegrityCheck
+from apps.clinical_ops.models_report import AssessmentReport
+from core.models import Organization
+from reports.models import Report
+
+CHUNK_SIZE = 64 * 1024
+DEFAULT_WORKERS = 4
+DEFAULT_BATCH_SIZE = 200
+
+
+# --------------------------------------------------
+# HASHING
+# --------------------------------------------------
+
+def hash_field_file(field_file):
+    """Returns (sha256_hex, size) or None when the file is missing."""
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        with field_file.storage.open(field_file.name, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                hasher.update(chunk)
+                size += len(chunk)
+    except (FileNotFoundError, OSError):
+        return None
+    return hasher.hexdigest(), size
+
+
+def _trust_window():
+    return timedelta(hours=getattr(settings, "REPORT_INTEGRITY_TRUST_HOURS", 24))
+
+
+def current_pdf_sha256(report):
+    """
+    sha256 of an AssessmentReport's stored PDF for download-time checks.
+    Skips the full read when a recent sweep verified the same file.
+    """
+    if report.pdf_sha256:
+        recent = ReportIntegrityCheck.objects.filter(
+            source=ReportIntegrityCheck.SOURCE_ASSESSMENT_REPORT,
+            report_id=report.id,
+            status=ReportIntegrityCheck.STATUS_OK,
+            expected_sha256=report.pdf_sha256,
+            verified_at__gte=timezone.now() - _trust_window(),
+        ).values_list("file_size", flat=True).first()
+
+        if recent is not None and recent == report.pdf_file.size:
+            return report.pdf_sha256
+
+    hasher = hashlib.sha256()
+    with report.pdf_file.open("rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+# --------------------------------------------------
+# SWEEP
+# --------------------------------------------------
+
+def _sources():
+    """(source, queryset, org field, entity_type, entity id getter, stored-hash getter)"""
+    yield (
+        ReportIntegrityCheck.SOURCE_ASSESSMENT_REPORT,
+        AssessmentReport.objects.exclude(pdf_file="").exclude(pdf_file__isnull=True)
+        .only("id", "org_id", "order_id", "pdf_file", "pdf_sha256"),
+        "org_id",
+        "AssessmentOrder",
+        lambda r: r.order_id,
+        lambda r: r.pdf_sha256,
+    )
+    yield (
+        ReportIntegrityCheck.SOURCE_REPORT,
+        Report.objects.exclude(pdf_file="").exclude(pdf_file__isnull=True)
+        .only("id", "organization_id", "pdf_file"),
+        "organization_id",
+        "Report",
+        lambda r: r.id,
+        lambda r: None,
+    )
+
+
+def _batched(queryset, batch_size):
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(id__gt=last_id).order_by("id")[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1].id
+
+
+def sweep(*, workers=DEFAULT_WORKERS, batch_size=DEFAULT_BATCH_SIZE, max_age=None, stdout=None):
+    """
+    Verify every stored report PDF. With max_age, files verified OK more
+    recently than that are skipped. Returns counters.
+    """
+    stats = {"checked": 0, "ok": 0, "mismatch": 0, "missing": 0, "skipped": 0, "baselined": 0}
+    now = timezone.now()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for source, queryset, org_field, entity_type, entity_id, stored_hash in _sources():
+            for batch in _batched(queryset, batch_size):
+                existing = {
+                    c.report_id: c
+                    for c in ReportIntegrityCheck.objects.filter(
+                        source=source, report_id__in=[r.id for r in batch]
+                    )
+                }
+
+                todo = []
+                for report in batch:
+                    check = existing.get(report.id)
+                    if (
+                        max_age is not None and check is not None
+                        and check.status == ReportIntegrityCheck.STATUS_OK
+                        and check.verified_at >= now - max_age
+                    ):
+                        stats["skipped"] += 1
+                        continue
+                    todo.append(report)
+
+                results = pool.map(lambda r: hash_field_file(r.pdf_file), todo)
+
+                created, updated, tampered = [], [], []
+                for report, result in zip(todo, results):
+                    stats["checked"] += 1
+                    check = existing.get(report.id)
+                    expected = stored_hash(report) or (check.expected_sha256 if check else None)
+
+                    observed, size = result if result else (None, None)
+                    if expected is None and observed is not None:
+                        expected = observed  # first sight of a file without a stored hash
+                        stats["baselined"] += 1
+
+                    if observed is None:
+                        state = ReportIntegrityCheck.STATUS_MISSING
+                    elif observed != expected:
+                        state = ReportIntegrityCheck.STATUS_MISMATCH
+                    else:
+                        state = ReportIntegrityCheck.STATUS_OK
+                    stats[state.lower()] += 1
+
+                    previous = check.status if check else None
+                    if state != ReportIntegrityCheck.STATUS_OK and previous != state:
+                        tampered.append((report, state, expected, observed))
+
+                    if check is None:
+                        check = ReportIntegrityCheck(source=source, report_id=report.id)
+                        created.append(check)
+                    else:
+                        updated.append(check)
+
+                    check.org_id = getattr(report, org_field)
+                    check.file_name = report.pdf_file.name[:255]
+                    check.file_size = size
+                    check.expected_sha256 = expected or ""
+                    check.observed_sha256 = observed
+                    check.status = state
+                    check.verified_at = timezone.now()
+
+                ReportIntegrityCheck.objects.bulk_create(created)
+                ReportIntegrityCheck.objects.bulk_update(
+                    updated,
+                    ["org_id", "file_name", "file_size", "expected_sha256", "observed_sha256", "status", "verified_at"],
+                )
+
+                if tampered:
+                    orgs = Organization.objects.in_bulk({getattr(r, org_field) for r, *_ in tampered})
+                    log_events([
+                        dict(
+                            org=orgs.get(getattr(report, org_field)),
+                            event_type="REPORT_TAMPER_DETECTED",
+                            entity_type=entity_type,
+                            entity_id=entity_id(report),
+                            actor_role="System",
+                            details={
+                                "detected_by": "INTEGRITY_SWEEP",
+                                "source": source,
+                                "report_id": report.id,
+                                "reason": state,
+                                "expected_sha256": expected,
+                                "observed_sha256": observed,
+                            },
+                            severity="CRITICAL",
+                        )
+                        for report, state, expected, observed in tampered
+                    ])
+
+                if stdout:
+                    stdout.write(f"{source}: verified {stats['checked']} files so far")
+
+    return stats
+
+
+# --------------------------------------------------
+# MERKLE ROOT
+# --------------------------------------------------
+
+def merkle_leaf(source, report_id, sha256_hex):
+    return hashlib.sha256(f"{source}:{report_id}:{sha256_hex}".encode("utf-8")).digest()
+
+
+def merkle_root(leaves):
+    """leaves: iterable of 32-byte digests, already in canonical order."""
+    level = list(leaves)
+    if not level:
+        return hashlib.sha256(b"").hexdigest()
+
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [
+            hashlib.sha256(level[i] + level[i + 1]).digest()
+            for i in range(0, len(level), 2)
+        ]
+    return level[0].hex()
+
+
+def corpus_leaves():
+    rows = (
+        ReportIntegrityCheck.objects
+        .filter(status=ReportIntegrityCheck.STATUS_OK)
+        .order_by("source", "report_id")
+        .values_list("source", "report_id", "expected_sha256")
+        .iterator(chunk_size=5000)
+    )
+    return [merkle_leaf(*row) for row in rows]
+
+
+def seal_daily_root(day=None):
+    day = day or timezone.localdate()
+    leaves = corpus_leaves()
+    root, _ = IntegrityMerkleRoot.objects.update_or_create(
+        day=day,
+        defaults={
+            "root_sha256": merkle_root(leaves),
+            "leaf_count": len(leaves),
+            "computed_at": timezone.now(),
+        },
+    )
+    return root
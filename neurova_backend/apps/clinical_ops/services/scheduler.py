@@ -0,0 +1,202 @@
+"""
+In-process scheduler for periodic maintenance jobs.
+
+`manage.py run_scheduler` can run on every node. Jobs come from
+settings.MAINTENANCE_SCHEDULE and are plain management commands:
+
+    MAINTENANCE_SCHEDULE = {"retention_sweep": {"interval": 3600, "args": []}}
+
+Coordination lives in Postgres, so there is nothing else to deploy:
+  - a job runs only on the node holding advisory lock
+    "scheduler.<job>"; the others skip it
+  - when a job is due is derived from its latest ScheduledJobRun, so a
+    node that just lost the race does not run it again right after
+  - failures retry after exponential backoff
+    (SCHEDULER_BACKOFF_BASE_SECONDS * 2^(failures-1), capped at
+    SCHEDULER_BACKOFF_MAX_SECONDS) instead of the full interval
+  - every node adds random jitter (SCHEDULER_JITTER * interval) before
+    trying, so a fleet does not stampede the lock at the same instant
+
+Commands may set self.rows_affected; it is recorded with the run.
+"""
+
+import logging
+import os
+import random
+import socket
+import time
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command, get_commands, load_command_class
+from django.db import close_old_connections
+from django.utils import timezone
+
+from apps.clinical_ops.models_scheduler import ScheduledJobRun
+from common.db_locks import advisory_lock
+from common.db_router import routing_scope
+
+logger = logging.getLogger(__name__)
+
+MAX_OUTPUT_CHARS = 10000
+
+
+class Job:
+    def __init__(self, name, interval, args=()):
+        self.name = name
+        self.interval = timedelta(seconds=interval)
+        self.args = list(args)
+
+    @property
+    def lock_name(self):
+        return f"scheduler.{self.name}"
+
+    def __repr__(self):
+        return f"Job({self.name!r}, every {self.interval})"
+
+
+def load_jobs(schedule=None, only=None):
+    schedule = schedule if schedule is not None else getattr(settings, "MAINTENANCE_SCHEDULE", {})
+    jobs = [
+        Job(name, spec["interval"], spec.get("args", ()))
+        for name, spec in schedule.items()
+        if not only or name in only
+    ]
+
+    known = get_commands()
+    for job in jobs:
+        if job.name not in known:
+            raise ValueError(f"Scheduled job {job.name!r} is not a management command")
+    return jobs
+
+
+def node_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# --------------------------------------------------
+# DUE TIME
+# --------------------------------------------------
+
+def backoff(failures):
+    base = getattr(settings, "SCHEDULER_BACKOFF_BASE_SECONDS", 60)
+    cap = getattr(settings, "SCHEDULER_BACKOFF_MAX_SECONDS", 3600)
+    return timedelta(seconds=min(base * 2 ** max(failures - 1, 0), cap))
+
+
+def jitter(job):
+    fraction = getattr(settings, "SCHEDULER_JITTER", 0.1)
+    return timedelta(seconds=random.uniform(0, fraction * job.interval.total_seconds()))
+
+
+def due_at(job):
+    """When the job should next run, from its run history (shared by all nodes)."""
+    recent = list(
+        ScheduledJobRun.objects
+        .filter(job_name=job.name)
+        .order_by("-started_at")
+        .values("status", "started_at", "finished_at")[:10]
+    )
+    if not recent:
+        return timezone.now()
+
+    last = recent[0]
+    if last["status"] == ScheduledJobRun.STATUS_FAILED:
+        failures = 0
+        for run in recent:
+            if run["status"] != ScheduledJobRun.STATUS_FAILED:
+                break
+            failures += 1
+        return (last["finished_at"] or last["started_at"]) + min(backoff(failures), job.interval)
+
+    # SUCCEEDED, or RUNNING left behind by a node that died mid-run
+    return last["started_at"] + job.interval
+
+
+# --------------------------------------------------
+# EXECUTION
+# --------------------------------------------------
+
+def run_job(job, node=None):
+    """
+    Run the job if this node wins its lock and it is still due.
+    Returns the ScheduledJobRun, or None when skipped.
+    """
+    with advisory_lock(job.lock_name) as acquired:
+        if not acquired:
+            return None
+        if due_at(job) > timezone.now():
+            return None  # another node ran it meanwhile
+
+        run = ScheduledJobRun.objects.create(job_name=job.name, node=node or node_name())
+        output = StringIO()
+        started = time.monotonic()
+
+        try:
+            command = load_command_class(get_commands()[job.name], job.name)
+            with routing_scope():
+                call_command(command, *job.args, stdout=output, stderr=output)
+            run.status = ScheduledJobRun.STATUS_SUCCEEDED
+            run.rows_affected = getattr(command, "rows_affected", None)
+        except Exception as e:
+            logger.error(f"Scheduled job {job.name} failed: {str(e)}", exc_info=True)
+            run.status = ScheduledJobRun.STATUS_FAILED
+            run.error = f"{type(e).__name__}: {e}"
+
+        run.finished_at = timezone.now()
+        run.duration_ms = int((time.monotonic() - started) * 1000)
+        run.output = output.getvalue()[-MAX_OUTPUT_CHARS:]
+        run.save(update_fields=["status", "finished_at", "duration_ms", "rows_affected", "output", "error"])
+        return run
+
+
+class Scheduler:
+    """Single-threaded loop; one instance per process."""
+
+    def __init__(self, jobs, *, node=None, max_sleep=30, on_run=None, use_jitter=True):
+        self.jobs = jobs
+        self.use_jitter = use_jitter
+        self.node = node or node_name()
+        self.max_sleep = max_sleep
+        self.on_run = on_run
+        self.stopped = False
+        self._next_try = {}
+
+    def stop(self, *args):
+        self.stopped = True
+
+    def _schedule(self, job):
+        delay = jitter(job) if self.use_jitter else timedelta(0)
+        self._next_try[job.name] = due_at(job) + delay
+
+    def tick(self):
+        """Run every job whose local try-time has passed; returns the runs."""
+        close_old_connections()
+        runs = []
+        for job in self.jobs:
+            if job.name not in self._next_try:
+                self._schedule(job)
+            if self._next_try[job.name] > timezone.now():
+                continue
+
+            run = run_job(job, node=self.node)
+            if run is not None:
+                runs.append(run)
+                if self.on_run:
+                    self.on_run(run)
+            self._schedule(job)
+        return runs
+
+    def seconds_until_next(self):
+        if not self._next_try:
+            return 0
+        wait = (min(self._next_try.values()) - timezone.now()).total_seconds()
+        return min(max(wait, 1), self.max_sleep)
+
+    def run_forever(self):
+        while not self.stopped:
+            self.tick()
+            deadline = time.monotonic() + self.seconds_until_next()
+            while not self.stopped and time.monotonic() < deadline:
+                time.sleep(min(1, deadline - time.monotonic()))
@@ -11,6 +11,8 @@ Supported Tests:
 - STOP_BANG
 """
 
+from common.metrics import timed
+
 
 # --------------------------------------------------
 # BATTERY → TEST MAPPING
@@ -235,6 +237,7 @@ def calculate_primary_severity(per_test, red_flags):
 # MAIN BATTERY SCORER
 # --------------------------------------------------
 
+@timed("score_battery")
 def score_battery(battery_code: str, battery_version: str, answers_json: dict) -> dict:
 
     answers = answers_json.get("answers", [])
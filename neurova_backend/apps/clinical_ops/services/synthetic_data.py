@@ -0,0 +1,395 @@
+"""
+Deterministic synthetic clinical data for scale testing.
+
+generate() creates organizations, patients and orders across every
+status, plus responses, response quality, results (scored by the real
+scoring adapter), reports, consent records, public tokens and audit
+events. Rows are written with bulk_create, one transaction per chunk,
+so a large run (e.g. 10M audit events) keeps steady memory and its
+progress survives interruption.
+
+Output depends only on the seed, the end date and the scale arguments.
+Generated organizations share a code prefix, so purge() can remove
+them again (cascading to everything below). Only purge scratch
+databases: deleting sealed audit events breaks chain verification.
+
+Distributions:
+  - batteries are weighted towards the core screening batteries
+  - every order has a latent symptom burden drawn from Beta(2, 5). Item
+    answers follow it, so most scores are minimal or mild with a long
+    severe tail, and PHQ-9 item 9 is positive more often as burden rises.
+  - creation times spread over the last `days` days, in clinic hours
+"""
+
+import hashlib
+import random
+import uuid
+from datetime import datetime, time, timedelta
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from apps.clinical_ops.audit.models import AuditEvent
+from apps.clinical_ops.models import AssessmentOrder, Patient, ResponseQuality
+from apps.clinical_ops.models_assessment import AssessmentResponse, AssessmentResult
+from apps.clinical_ops.models_consent import ConsentRecord
+from apps.clinical_ops.models_public_token import PublicAccessToken
+from apps.clinical_ops.models_report import AssessmentReport
+from apps.clinical_ops.services.retention_policy import compute_retention_date
+from apps.clinical_ops.services.scoring_adapter import BATTERY_TESTS, score_battery
+from core.models import Organization
+
+DEFAULT_PREFIX = "SYN"
+DEFAULT_CHUNK_SIZE = 5000
+
+BATTERY_WEIGHTS = {
+    "MENTAL_HEALTH_CORE_V1": 30,
+    "CMHA_V1": 15,
+    "DEP_SCREEN_V1": 15,
+    "ANX_SCREEN_V1": 12,
+    "STRESS_BURNOUT_V1": 8,
+    "EWB_INDEX_V1": 6,
+    "SLEEP_RISK_V1": 5,
+    "SUBSTANCE_SCREEN_V1": 5,
+    "MOOD_RISK_V1": 4,
+}
+
+STATUS_WEIGHTS = {
+    AssessmentOrder.STATUS_CREATED: 8,
+    AssessmentOrder.STATUS_IN_PROGRESS: 4,
+    AssessmentOrder.STATUS_COMPLETED: 8,
+    AssessmentOrder.STATUS_AWAITING_REVIEW: 10,
+    AssessmentOrder.STATUS_ACCEPTED: 5,
+    AssessmentOrder.STATUS_REJECTED: 2,
+    AssessmentOrder.STATUS_DELIVERED: 55,
+    AssessmentOrder.STATUS_CANCELLED: 5,
+    AssessmentOrder.STATUS_REMARK: 3,
+}
+
+NOT_SUBMITTED = {
+    AssessmentOrder.STATUS_CREATED,
+    AssessmentOrder.STATUS_IN_PROGRESS,
+    AssessmentOrder.STATUS_CANCELLED,
+}
+UNREPORTED = NOT_SUBMITTED | {AssessmentOrder.STATUS_COMPLETED}
+SIGNED = {
+    AssessmentOrder.STATUS_ACCEPTED,
+    AssessmentOrder.STATUS_DELIVERED,
+    AssessmentOrder.STATUS_REMARK,
+}
+
+DELIVERY_WEIGHTS = {
+    AssessmentOrder.DELIVERY_HOSPITAL_ONLY: 40,
+    AssessmentOrder.DELIVERY_ALLOW_PATIENT_DOWNLOAD: 35,
+    AssessmentOrder.DELIVERY_EMAIL: 12,
+    AssessmentOrder.DELIVERY_SMS: 8,
+    AssessmentOrder.DELIVERY_PRINT: 5,
+}
+
+# (question ids, max value) per test, matching scoring_adapter's ids
+TEST_ITEMS = {
+    "PHQ9": ([f"phq9_q{i}" for i in range(1, 10)], 3),
+    "GAD7": ([f"gad7_q{i}" for i in range(1, 8)], 3),
+    "MDQ": ([f"mdq_q{i}" for i in range(1, 14)] + ["mdq_cluster"], 1),
+    "PSS10": ([f"pss10_q{i}" for i in range(1, 11)], 4),
+    "AUDIT": ([f"audit_q{i}" for i in range(1, 11)], 4),
+    "STOP_BANG": ([f"stop_bang_q{i}" for i in range(1, 9)], 1),
+}
+
+AUDIT_EVENT_WEIGHTS = {
+    "PUBLIC_TOKEN_ROTATED": 30,
+    "QUESTIONS_VIEWED": 12,
+    "CONSENT_VIEWED": 10,
+    "CONSENT_CAPTURED": 10,
+    "ASSESSMENT_SUBMITTED": 10,
+    "REPORT_GENERATED": 8,
+    "REPORT_SIGNED": 6,
+    "ORDER_DELIVERED": 6,
+    "STAFF_REPORT_DOWNLOAD": 4,
+    "REPORT_ACCESS_CODE_ISSUED": 2,
+    "REPORT_DOWNLOAD_SUCCESS": 1,
+    "SECURITY_VIOLATION": 1,
+}
+
+CONSENT_TEXT = "I consent to the processing of my responses for clinical screening (synthetic)."
+
+# Smallest well-formed single-page PDF; every --with-pdfs report stores a copy
+TINY_PDF = (
+    b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+    b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 200 200]>>endobj\n"
+    b"trailer<</Root 1 0 R>>\n%%EOF\n"
+)
+
+
+def _weighted(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+class SyntheticDataGenerator:
+    def __init__(self, *, seed=0, end_date=None, days=365, chunk_size=DEFAULT_CHUNK_SIZE,
+                 prefix=DEFAULT_PREFIX, with_pdfs=False, progress=None):
+        self.rng = random.Random(seed)
+        self.end_date = end_date or timezone.localdate()
+        self.days = days
+        self.chunk_size = chunk_size
+        self.prefix = prefix
+        self.with_pdfs = with_pdfs
+        self.progress = progress or (lambda message: None)
+        self.tz = timezone.get_current_timezone()
+        self.counts = {}
+
+    # ----------------------------------------------
+    # helpers
+    # ----------------------------------------------
+
+    def _uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _created_at(self):
+        day = self.end_date - timedelta(days=self.rng.randrange(self.days))
+        hour = min(max(int(self.rng.gauss(12, 3)), 8), 19)
+        moment = datetime.combine(day, time(hour, self.rng.randrange(60), self.rng.randrange(60)))
+        return timezone.make_aware(moment, self.tz)
+
+    def _bulk(self, model, rows):
+        created = model.objects.bulk_create(rows, batch_size=self.chunk_size)
+        self.counts[model.__name__] = self.counts.get(model.__name__, 0) + len(created)
+        return created
+
+    def _answers(self, battery_code, burden):
+        answers = []
+        for test in BATTERY_TESTS[battery_code]:
+            ids, top = TEST_ITEMS[test]
+            for qid in ids:
+                if qid == "phq9_q9":
+                    value = self.rng.randint(1, 3) if self.rng.random() < burden ** 2 * 0.5 else 0
+                else:
+                    value = min(top, max(0, round(self.rng.gauss(burden * top * 1.2, 0.6))))
+                answers.append({"question_id": qid, "value": value})
+            if test == "MDQ":
+                answers.append({"question_id": "mdq_impairment", "value": min(3, int(burden * 4))})
+        return answers
+
+    # ----------------------------------------------
+    # phases
+    # ----------------------------------------------
+
+    def create_orgs(self, count):
+        orgs = [
+            Organization(
+                external_id=self._uuid(),
+                name=f"Synthetic Hospital {i:04d}",
+                code=f"{self.prefix}-{i:04d}",
+                org_type=self.rng.choice(["HOSPITAL", "HOSPITAL", "DIAGNOSTIC"]),
+            )
+            for i in range(1, count + 1)
+        ]
+        with transaction.atomic():
+            return self._bulk(Organization, orgs)
+
+    def create_patients(self, orgs, count):
+        # Larger hospitals see more patients
+        org_weights = [self.rng.paretovariate(1.5) for _ in orgs]
+        patients = []
+        for chunk_start in range(0, count, self.chunk_size):
+            rows = []
+            for i in range(chunk_start, min(count, chunk_start + self.chunk_size)):
+                org = self.rng.choices(orgs, weights=org_weights)[0]
+                rows.append(Patient(
+                    org=org,
+                    mrn=f"{self.prefix}{i:09d}",
+                    full_name=f"Synthetic Patient {i}",
+                    age=min(90, max(18, int(self.rng.gauss(38, 14)))),
+                    sex=self.rng.choices(["FEMALE", "MALE", "OTHER"], weights=[52, 47, 1])[0],
+                    phone=f"9{self.rng.randrange(10 ** 9):09d}",
+                    created_at=self._created_at(),
+                ))
+            with transaction.atomic():
+                patients.extend((p.id, p.org_id) for p in self._bulk(Patient, rows))
+            self.progress(f"patients: {len(patients)}/{count}")
+        return patients
+
+    def create_orders(self, patients, count):
+        """Orders and everything hanging off them; returns [(order_id, org_id, created_at)]."""
+        created = []
+        for chunk_start in range(0, count, self.chunk_size):
+            specs = []
+            for _ in range(min(self.chunk_size, count - chunk_start)):
+                patient_id, org_id = self.rng.choice(patients)
+                specs.append(self._order_spec(patient_id, org_id))
+            with transaction.atomic():
+                orders = self._bulk(AssessmentOrder, [s["order"] for s in specs])
+                for spec, order in zip(specs, orders):
+                    spec["order_id"] = order.id
+                self._create_children(specs)
+            created.extend((o.id, o.org_id, o.created_at) for o in orders)
+            self.progress(f"orders: {len(created)}/{count}")
+        return created
+
+    def _order_spec(self, patient_id, org_id):
+        rng = self.rng
+        battery = _weighted(rng, BATTERY_WEIGHTS)
+        status = _weighted(rng, STATUS_WEIGHTS)
+        created_at = self._created_at()
+        submitted = status not in NOT_SUBMITTED
+        started_at = created_at + timedelta(minutes=rng.randint(1, 120)) if status != AssessmentOrder.STATUS_CREATED else None
+        duration = int(rng.lognormvariate(6, 0.5))  # median ~400s
+        completed_at = started_at + timedelta(seconds=duration) if submitted else None
+        delivered_at = (
+            completed_at + timedelta(hours=rng.expovariate(1 / 18))
+            if status == AssessmentOrder.STATUS_DELIVERED else None
+        )
+        raw_token = f"{rng.getrandbits(192):048x}"
+
+        order = AssessmentOrder(
+            org_id=org_id,
+            patient_id=patient_id,
+            battery_code=battery,
+            administration_mode=rng.choice([AssessmentOrder.MODE_KIOSK, AssessmentOrder.MODE_QR_PHONE, AssessmentOrder.MODE_QR_PHONE, AssessmentOrder.MODE_ASSISTED]),
+            encounter_type=rng.choice(["OPD", "OPD", "OPD", "IPD", "WELLNESS"]),
+            status=status,
+            created_at=created_at,
+            started_at=started_at,
+            completed_at=completed_at,
+            delivered_at=delivered_at,
+            verified_by_staff=True,
+            public_token=raw_token,
+            public_link_expires_at=created_at + timedelta(days=7),
+            delivery_mode=_weighted(rng, DELIVERY_WEIGHTS) if delivered_at else AssessmentOrder.DELIVERY_HOSPITAL_ONLY,
+            data_retention_until=compute_retention_date(created_at),
+        )
+        spec = {"order": order, "org_id": org_id, "raw_token": raw_token, "duration": duration}
+        if submitted:
+            burden = rng.betavariate(2, 5)
+            spec["answers"] = self._answers(battery, burden)
+            spec["too_fast"] = duration < 90
+            spec["inconsistency"] = rng.random() < 0.03
+        return spec
+
+    def _create_children(self, specs):
+        rng = self.rng
+        tokens, consents, responses, qualities, results, reports = [], [], [], [], [], []
+
+        for spec in specs:
+            order = spec["order"]
+            order_id, org_id = spec["order_id"], spec["org_id"]
+            tokens.append(PublicAccessToken(
+                order_id=order_id,
+                token_hash=PublicAccessToken.hash_token(spec["raw_token"]),
+                expires_at=order.public_link_expires_at,
+                bound_user_agent="",
+            ))
+            if order.started_at is None:
+                continue
+
+            consents.append(ConsentRecord(
+                org_id=org_id,
+                order_id=order_id,
+                consent_given_by="SELF" if rng.random() < 0.95 else "GUARDIAN",
+                allow_patient_copy=rng.random() < 0.6,
+                consent_text_snapshot=CONSENT_TEXT,
+                consented_at=order.started_at,
+            ))
+            if "answers" not in spec:
+                continue
+
+            answers = spec["answers"]
+            responses.append(AssessmentResponse(
+                org_id=org_id,
+                order_id=order_id,
+                answers_json={"answers": answers},
+                duration_seconds=spec["duration"],
+                submitted_at=order.completed_at,
+            ))
+            qualities.append(ResponseQuality(
+                org_id=org_id,
+                order_id=order_id,
+                duration_seconds=spec["duration"],
+                too_fast_flag=spec["too_fast"],
+                straight_lining_flag=len({a["value"] for a in answers}) == 1,
+                inconsistency_flag=spec["inconsistency"],
+                created_at=order.completed_at,
+            ))
+            scored = score_battery(order.battery_code, order.battery_version, {"answers": answers})
+            results.append(AssessmentResult(
+                org_id=org_id,
+                order_id=order_id,
+                result_json=scored,
+                primary_severity=scored["summary"]["primary_severity"],
+                has_red_flags=scored["summary"]["has_red_flags"],
+                computed_at=order.completed_at,
+            ))
+
+            if order.status in UNREPORTED:
+                continue
+            generated_at = order.completed_at + timedelta(minutes=rng.randint(5, 240))
+            signed = order.status in SIGNED
+            report = AssessmentReport(
+                org_id=org_id,
+                order_id=order_id,
+                signoff_status="SIGNED" if signed else ("REJECTED" if order.status == AssessmentOrder.STATUS_REJECTED else "PENDING"),
+                signed_by_name="Dr Synthetic" if signed else None,
+                signed_by_role="Psychiatrist" if signed else None,
+                signed_at=generated_at + timedelta(hours=rng.expovariate(1 / 6)) if signed else None,
+                signoff_method="CLINICIAN" if signed else "SYSTEM",
+                generated_at=generated_at,
+            )
+            if self.with_pdfs:
+                report.pdf_file.name = default_storage.save(
+                    f"clinical_reports/synthetic/{order_id}.pdf", ContentFile(TINY_PDF)
+                )
+                report.pdf_sha256 = hashlib.sha256(TINY_PDF).hexdigest()
+            reports.append(report)
+
+        self._bulk(PublicAccessToken, tokens)
+        self._bulk(ConsentRecord, consents)
+        self._bulk(AssessmentResponse, responses)
+        self._bulk(ResponseQuality, qualities)
+        self._bulk(AssessmentResult, results)
+        self._bulk(AssessmentReport, reports)
+
+    def create_audit_events(self, orders, count):
+        rng = self.rng
+        written = 0
+        for chunk_start in range(0, count, self.chunk_size):
+            rows = []
+            for _ in range(min(self.chunk_size, count - chunk_start)):
+                order_id, org_id, created_at = rng.choice(orders)
+                event_type = _weighted(rng, AUDIT_EVENT_WEIGHTS)
+                staff = event_type in {"REPORT_GENERATED", "REPORT_SIGNED", "ORDER_DELIVERED", "STAFF_REPORT_DOWNLOAD"}
+                rows.append(AuditEvent(
+                    org_id=org_id,
+                    event_type=event_type,
+                    entity_type="AssessmentOrder",
+                    entity_id=str(order_id),
+                    actor_user_id=str(rng.randint(1, 50)) if staff else None,
+                    actor_role="CLINICIAN" if staff else "PublicUser",
+                    ip_address=f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}",
+                    user_agent="synthetic",
+                    severity="SECURITY" if event_type in {"PUBLIC_TOKEN_ROTATED", "SECURITY_VIOLATION"} else "INFO",
+                    details={"synthetic": True},
+                    app_version="1.0",
+                    created_at=created_at + timedelta(minutes=rng.randint(0, 72 * 60)),
+                ))
+            with transaction.atomic():
+                self._bulk(AuditEvent, rows)
+            written += len(rows)
+            if written % (self.chunk_size * 20) == 0 or written == count:
+                self.progress(f"audit events: {written}/{count}")
+
+    def generate(self, *, orgs, patients, orders, audit_events):
+        """Create everything; returns {model name: rows created}."""
+        org_rows = self.create_orgs(orgs)
+        patient_rows = self.create_patients(org_rows, patients)
+        order_rows = self.create_orders(patient_rows, orders)
+        if order_rows:
+            self.create_audit_events(order_rows, audit_events)
+        return dict(self.counts)
+
+
+def purge(prefix=DEFAULT_PREFIX):
+    """Delete every organization generated with this prefix (and its data)."""
+    return Organization.objects.filter(code__startswith=f"{prefix}-").delete()[0]
@@ -0,0 +1,34 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.clinical_ops.models import AssessmentOrder
+from apps.clinical_ops.models_assessment import AssessmentResult
+from apps.clinical_ops.models_report import AssessmentReport
+from apps.clinical_ops.services.clinical_events import (
+    publish_order_status,
+    publish_report_status,
+    publish_result,
+)
+
+# Status changes are always saved with update_fields; a full save() of an
+# existing row (e.g. report regeneration) is not announced.
+ORDER_FIELDS = {"status", "delivery_mode"}
+REPORT_FIELDS = {"signoff_status"}
+
+
+@receiver(post_save, sender=AssessmentResult)
+def announce_result(sender, instance, created, **kwargs):
+    if created:
+        publish_result(instance)
+
+
+@receiver(post_save, sender=AssessmentReport)
+def announce_report_status(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields and REPORT_FIELDS & set(update_fields)):
+        publish_report_status(instance)
+
+
+@receiver(post_save, sender=AssessmentOrder)
+def announce_order_status(sender, instance, created, update_fields=None, **kwargs):
+    if not created and update_fields and ORDER_FIELDS & set(update_fields):
+        publish_order_status(instance)
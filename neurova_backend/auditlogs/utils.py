@@ -2,14 +2,14 @@ from auditlogs.models import AuditLog
 
 
 def log_event(request, org, action, entity_type, entity_id, meta=None):
-    actor = None
+    actor_id = None
     ip = ""
     user_agent = ""
 
     if request is not None:
-        # actor
+        # actor (request.user may be a claims-only TokenPrincipal)
         if hasattr(request, "user") and getattr(request.user, "is_authenticated", False):
-            actor = request.user
+            actor_id = request.user.pk
 
         # request metadata
         if hasattr(request, "META"):
@@ -18,7 +18,7 @@ def log_event(request, org, action, entity_type, entity_id, meta=None):
 
     AuditLog.objects.create(
         organization=org,
-        actor=actor,
+        actor_id=actor_id,
         action=action,
         entity_type=entity_type,
         entity_id=str(entity_id),
@@ -6,4 +6,5 @@ class ClinicalConfig(AppConfig):
     def ready(self):
         # Phase E: register submodule models
         from backend.clinical.policies import models  # noqa
+        from backend.clinical.policies import signals  # noqa
         from backend.clinical.signoff import models  # noqa
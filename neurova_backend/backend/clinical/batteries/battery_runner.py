@@ -73,3 +73,59 @@ def advance_to_next_test(session: BatterySession):
     # If we return TRUE here, view returns next_test info.
     
     return False  # no next test, ready to complete
+
+
+def submit_remaining_tests(session: BatterySession, battery: dict, submissions: list):
+    """
+    Persist every remaining test of the battery in one pass.
+
+    `submissions` must already be validated against
+    battery["tests"][session.current_test_index:], in order.
+    Runs opened by the per-test flow are filled in; the rest are
+    bulk-created. Caller owns the transaction and the session lock.
+    """
+    now = timezone.now()
+    start_index = session.current_test_index
+
+    open_runs = {
+        tr.test_order_index: tr
+        for tr in TestRun.objects.filter(
+            session=session,
+            test_order_index__gte=start_index,
+        )
+    }
+
+    to_create = []
+    to_update = []
+    for offset, item in enumerate(submissions):
+        idx = start_index + offset
+        tr = open_runs.get(idx)
+        if tr is not None:
+            tr.raw_responses = item["raw_responses"]
+            tr.time_submitted = now
+            to_update.append(tr)
+            continue
+        to_create.append(
+            TestRun(
+                organization_id=session.organization_id,
+                session=session,
+                test_code=item["test_code"],
+                test_order_index=idx,
+                raw_responses=item["raw_responses"],
+                time_started=now,
+                time_submitted=now,
+            )
+        )
+
+    if to_update:
+        TestRun.objects.bulk_update(to_update, ["raw_responses", "time_submitted"])
+    if to_create:
+        TestRun.objects.bulk_create(to_create)
+
+    session.status = "COMPLETED"
+    session.current_test_index = len(battery["tests"]) - 1
+    session.started_at = session.started_at or now
+    session.completed_at = now
+    session.save(update_fields=["status", "current_test_index", "started_at", "completed_at"])
+
+    return to_update + to_create
@@ -1,18 +1,110 @@
+"""
+Org clinical policy lookups.
+
+get_policy() is the hot-path accessor: it returns an immutable
+PolicySnapshot cached per process for POLICY_CACHE_TTL_SECONDS. Saving or
+deleting an OrgClinicalPolicy bumps a version stamp in the Django cache
+(signals.py); a cached snapshot whose stamp no longer matches is reloaded
+straight away, so edits do not wait for the TTL wherever the cache
+backend is shared between processes.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+
 from .models import OrgClinicalPolicy
 from backend.clinical.batteries.battery_runner import load_battery_registry
 
-def get_or_create_policy(org_id):
+
+@dataclass(frozen=True)
+class PolicySnapshot:
+    organization_id: str
+    enabled_batteries: frozenset
+    signoff_required: bool
+    token_validity_hours: int
+
+    @classmethod
+    def from_policy(cls, pol):
+        return cls(
+            organization_id=str(pol.organization_id),
+            enabled_batteries=frozenset(pol.enabled_batteries or []),
+            signoff_required=pol.signoff_required,
+            token_validity_hours=pol.token_validity_hours,
+        )
+
+
+_snapshots = {}  # org key -> (expires_at monotonic, version, PolicySnapshot)
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _registry_battery_codes():
+    return tuple(b["battery_code"] for b in load_battery_registry())
+
+
+def _org_key(org_id):
+    return str(OrgClinicalPolicy._meta.get_field("organization_id").to_python(org_id))
+
+
+def _version_key(key):
+    return f"clinical_policy_version:{key}"
+
+
+def bump_policy_version(org_id):
+    """Invalidate cached snapshots of this org's policy (all processes sharing the cache)."""
+    key = _org_key(org_id)
+    cache.set(_version_key(key), time.time_ns(), timeout=None)
+    with _lock:
+        _snapshots.pop(key, None)
+
+
+def _get_or_create(org_id):
     pol = OrgClinicalPolicy.objects.filter(organization_id=org_id).first()
     if pol:
-        return pol
-    reg = load_battery_registry()
-    all_codes = [b["battery_code"] for b in reg]
-    return OrgClinicalPolicy.objects.create(
+        return pol, False
+    pol = OrgClinicalPolicy.objects.create(
         organization_id=org_id,
-        enabled_batteries=all_codes,
+        enabled_batteries=list(_registry_battery_codes()),
         signoff_required=True,
     )
+    return pol, True
 
-def battery_enabled(pol, battery_code):
-    return battery_code in (pol.enabled_batteries or [])
 
+def get_or_create_policy(org_id):
+    return _get_or_create(org_id)[0]
+
+
+def get_policy(org_id):
+    """Cached PolicySnapshot for org_id, creating the default policy on first use."""
+    key = _org_key(org_id)
+    version = cache.get(_version_key(key))
+    entry = _snapshots.get(key)
+    if entry and entry[0] > time.monotonic() and entry[1] == version:
+        return entry[2]
+
+    pol, created = _get_or_create(org_id)
+    if created:
+        # Our own post_save just bumped the stamp; the row we hold is current
+        version = cache.get(_version_key(key))
+    snapshot = PolicySnapshot.from_policy(pol)
+    ttl = getattr(settings, "POLICY_CACHE_TTL_SECONDS", 300)
+    with _lock:
+        _snapshots[key] = (time.monotonic() + ttl, version, snapshot)
+    return snapshot
+
+
+def clear_policy_cache():
+    with _lock:
+        _snapshots.clear()
+
+
+def battery_enabled(pol, battery_code):
+    enabled = pol.enabled_batteries
+    if not isinstance(enabled, frozenset):
+        enabled = frozenset(enabled or [])
+    return battery_code in enabled
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import OrgClinicalPolicy
+from .services import bump_policy_version
+
+
+@receiver(post_save, sender=OrgClinicalPolicy)
+@receiver(post_delete, sender=OrgClinicalPolicy)
+def invalidate_policy_cache(sender, instance, **kwargs):
+    bump_policy_version(instance.organization_id)
@@ -1,10 +1,15 @@
+import hashlib
+import json
 from io import BytesIO
+
+from django.core.serializers.json import DjangoJSONEncoder
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
 from reportlab.pdfgen import canvas
 from reportlab.lib import colors
 
 from .report_composer_v1 import compose_sections_v1
+from common.metrics import timed
 
 
 PAGE_W, PAGE_H = A4
@@ -20,6 +25,9 @@ SECTION_GAP = 6.5 * mm
 FONT_MAIN = "Helvetica"
 FONT_BOLD = "Helvetica-Bold"
 
+# Bump whenever the same report_json would render different bytes
+RENDERER_VERSION = "1"
+
 
 # -------------------------------------------------
 # Helpers
@@ -74,9 +82,21 @@ def _draw_footer(c: canvas.Canvas, page_no: int):
 # -------------------------------------------------
 # MAIN RENDERER
 # -------------------------------------------------
+def report_pdf_etag_v1(report_json: dict) -> str:
+    """
+    sha256 identifying the PDF this renderer produces for report_json,
+    without rendering it. Any change to report_json (e.g. clinical
+    sign-off) or to RENDERER_VERSION gives a new value.
+    """
+    body = json.dumps(report_json, sort_keys=True, separators=(",", ":"), cls=DjangoJSONEncoder)
+    return hashlib.sha256(f"{RENDERER_VERSION}:{body}".encode()).hexdigest()
+
+
+@timed("pdf_render")
 def render_pdf_from_report_json_v1(report_json: dict) -> bytes:
     buf = BytesIO()
-    c = canvas.Canvas(buf, pagesize=A4, pageCompression=0)
+    # invariant: same report_json -> byte-identical PDF (see report_pdf_etag_v1)
+    c = canvas.Canvas(buf, pagesize=A4, pageCompression=0, invariant=1)
 
     # --- PHASE 1: DRAFT WATERMARK ---
     review_status = report_json.get("review_status", "DRAFT")
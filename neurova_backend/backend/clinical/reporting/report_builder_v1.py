@@ -18,6 +18,8 @@ from backend.clinical.scoring.scoring_engine import (
 import json
 import os
 
+from common.tracing import span
+
 # -------------------------------------------------
 # Canonical Report Versioning (Phase Ω)
 # -------------------------------------------------
@@ -76,6 +78,7 @@ def _test_name(test_code):
     return names.get(test_code, test_code)
 
 
+@span("generate_report_for_order_v1")
 @transaction.atomic
 def generate_report_for_order_v1(order: ClinicalOrder) -> ClinicalReport:
     """
@@ -1,7 +1,10 @@
 from typing import Dict, Any
 from datetime import datetime
 
+from common.tracing import span
 
+
+@span("build_report_json_v1")
 def build_report_json_v1(
     report_id,
     org,
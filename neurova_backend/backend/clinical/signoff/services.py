@@ -26,6 +26,6 @@ def apply_clinical_signoff(
 
     report.report_json = report_json
     report.status = "SIGNED"
-    report.save(update_fields=["report_json", "status"])
+    report.save(update_fields=["report_json", "status", "updated_at"])
 
     return report
@@ -0,0 +1,100 @@
+import uuid
+import pytest
+from django.test import Client
+from backend.clinical.org.models import Organization
+from backend.clinical.models import BatterySession, TestRun
+
+
+CMHA_TESTS = ["PHQ9", "MDQ", "GAD7", "PSS10", "AUDIT", "STOP_BANG"]
+
+
+def _create_cmha_session(c, org):
+    resp = c.post("/api/v1/clinical/orders/",
+                  data={
+                      "organization_id": str(org.id),
+                      "patient_name": "Kiosk Patient",
+                      "encounter_type": "OPD",
+                      "administration_mode": "IN_CLINIC",
+                      "battery_code": "CMHA_V1",
+                  },
+                  content_type="application/json")
+    assert resp.status_code == 201
+    return resp.json()["data"]["session_id"]
+
+
+def _start(c, session_id):
+    resp = c.post(f"/api/v1/clinical/sessions/{session_id}/start/", content_type="application/json")
+    assert resp.status_code == 200
+
+
+@pytest.mark.django_db
+def test_submit_all_completes_battery_in_one_request():
+    c = Client()
+    org = Organization.objects.create(id=uuid.uuid4(), name="Org", address="Addr")
+    session_id = _create_cmha_session(c, org)
+    _start(c, session_id)
+
+    payload = {"tests": [{"test_code": code, "raw_responses": [0, 1, 0]} for code in CMHA_TESTS]}
+    resp = c.post(f"/api/v1/clinical/sessions/{session_id}/submit_all/",
+                  data=payload, content_type="application/json")
+
+    assert resp.status_code == 200
+    assert resp.json()["data"]["completed"] is True
+
+    session = BatterySession.objects.select_related("order").get(id=session_id)
+    assert session.status == "COMPLETED"
+    assert session.order.status == "COMPLETED"
+    runs = list(TestRun.objects.filter(session=session).order_by("test_order_index"))
+    assert [r.test_code for r in runs] == CMHA_TESTS
+    assert all(r.time_submitted for r in runs)
+
+
+@pytest.mark.django_db
+def test_submit_all_resumes_after_partial_per_test_flow():
+    c = Client()
+    org = Organization.objects.create(id=uuid.uuid4(), name="Org", address="Addr")
+    session_id = _create_cmha_session(c, org)
+
+    _start(c, session_id)
+    c.post(f"/api/v1/clinical/sessions/{session_id}/submit_current/",
+           data={"raw_responses": [0] * 9, "test_code": "PHQ9"},
+           content_type="application/json")
+
+    payload = {"tests": [{"test_code": code, "raw_responses": [1]} for code in CMHA_TESTS[1:]]}
+    resp = c.post(f"/api/v1/clinical/sessions/{session_id}/submit_all/",
+                  data=payload, content_type="application/json")
+
+    assert resp.status_code == 200
+    assert TestRun.objects.filter(session_id=session_id).count() == len(CMHA_TESTS)
+
+
+@pytest.mark.django_db
+def test_submit_all_rejects_out_of_order_tests():
+    c = Client()
+    org = Organization.objects.create(id=uuid.uuid4(), name="Org", address="Addr")
+    session_id = _create_cmha_session(c, org)
+    _start(c, session_id)
+
+    swapped = [CMHA_TESTS[1], CMHA_TESTS[0]] + CMHA_TESTS[2:]
+    payload = {"tests": [{"test_code": code, "raw_responses": [0]} for code in swapped]}
+    resp = c.post(f"/api/v1/clinical/sessions/{session_id}/submit_all/",
+                  data=payload, content_type="application/json")
+
+    assert resp.status_code == 409
+    assert resp.json()["data"]["expected_test_codes"] == CMHA_TESTS
+    assert TestRun.objects.filter(session_id=session_id).count() == 0
+
+
+@pytest.mark.django_db
+def test_submit_all_requires_a_started_session():
+    c = Client()
+    org = Organization.objects.create(id=uuid.uuid4(), name="Org", address="Addr")
+    session_id = _create_cmha_session(c, org)
+
+    payload = {"tests": [{"test_code": code, "raw_responses": [0]} for code in CMHA_TESTS]}
+    resp = c.post(f"/api/v1/clinical/sessions/{session_id}/submit_all/",
+                  data=payload, content_type="application/json")
+
+    assert resp.status_code == 409
+    assert BatterySession.objects.get(id=session_id).status == "NOT_STARTED"
+    assert TestRun.objects.filter(session_id=session_id).count() == 0
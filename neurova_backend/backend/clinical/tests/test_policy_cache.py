@@ -0,0 +1,51 @@
+import uuid
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from backend.clinical.policies.models import OrgClinicalPolicy
+from backend.clinical.policies.services import (
+    PolicySnapshot,
+    battery_enabled,
+    clear_policy_cache,
+    get_policy,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_policy_cache()
+    yield
+    clear_policy_cache()
+
+
+@pytest.mark.django_db
+def test_policy_is_served_from_cache_after_first_lookup():
+    org_id = uuid.uuid4()
+    first = get_policy(org_id)
+    assert isinstance(first, PolicySnapshot)
+    assert first.token_validity_hours == 48
+    assert battery_enabled(first, "CMHA_V1")
+
+    with CaptureQueriesContext(connection) as queries:
+        assert get_policy(org_id) is get_policy(str(org_id))
+    assert len(queries) == 0
+
+
+@pytest.mark.django_db
+def test_saving_policy_invalidates_cached_snapshot():
+    org_id = uuid.uuid4()
+    get_policy(org_id)
+
+    pol = OrgClinicalPolicy.objects.get(organization_id=org_id)
+    pol.token_validity_hours = 6
+    pol.enabled_batteries = ["PHQ9_ONLY"]
+    pol.save()
+
+    snapshot = get_policy(org_id)
+    assert snapshot.token_validity_hours == 6
+    assert snapshot.enabled_batteries == frozenset({"PHQ9_ONLY"})
+    assert not battery_enabled(snapshot, "CMHA_V1")
+    # Plain model instances still work
+    assert battery_enabled(pol, "PHQ9_ONLY")
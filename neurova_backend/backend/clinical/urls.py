@@ -5,6 +5,7 @@ from backend.clinical.views import (
     StartSessionView,
     GetCurrentTestView,
     SubmitCurrentTestView,
+    SubmitBatteryView,
     GenerateReportView,
     GetClinicalReportPDFView,
     ClinicalOrderStatusUpdateView,
@@ -56,6 +57,15 @@ urlpatterns = [
         name="clinical-submit-current-test",
     ),
 
+    # -------------------------------------------------
+    # 6.4b SUBMIT WHOLE BATTERY (SINGLE REQUEST)
+    # -------------------------------------------------
+    path(
+        "sessions/<uuid:session_id>/submit_all/",
+        SubmitBatteryView.as_view(),
+        name="clinical-submit-battery",
+    ),
+
     # -------------------------------------------------
     # 6.5 GENERATE REPORT (FREEZE JSON)
     # -------------------------------------------------
@@ -6,7 +6,7 @@ from rest_framework.exceptions import PermissionDenied
 from django.utils import timezone
 from django.db import transaction
 from django.shortcuts import get_object_or_404
-from django.http import HttpResponse
+import hashlib
 
 from common.permissions import IsClinician
 from rest_framework.permissions import AllowAny
@@ -23,13 +23,17 @@ from backend.clinical.batteries.battery_runner import (
     open_current_test_run,
     advance_to_next_test,
     get_battery_def,
+    submit_remaining_tests,
 )
 
 from backend.clinical.audit.services import audit
 from backend.clinical.constants import ORDER_STATUS_FLOW
 
 from backend.clinical.reporting.generate import generate_report_for_order_v1
-from backend.clinical.reporting.pdf_renderer_v1 import render_pdf_from_report_json_v1
+from backend.clinical.reporting.pdf_renderer_v1 import (
+    render_pdf_from_report_json_v1,
+    report_pdf_etag_v1,
+)
 
 from backend.clinical.security.org_guard import (
     get_request_org_id,
@@ -38,6 +42,13 @@ from backend.clinical.security.org_guard import (
 
 from reports.models import ClinicalReport
 from backend.clinical.models import IdempotencyKey
+from common.idempotency import idempotent
+from common.http_conditional import (
+    is_not_modified,
+    not_modified_response,
+    ranged_bytes_response,
+    strong_etag,
+)
 
 
 
@@ -330,6 +341,97 @@ class SubmitCurrentTestView(APIView):
                 status=status.HTTP_200_OK,
             )
 
+# -------------------------------------------------
+# 6.4b SUBMIT WHOLE BATTERY (SINGLE REQUEST)
+# -------------------------------------------------
+class SubmitBatteryView(APIView):
+    """
+    Submits every remaining test of a started (IN_PROGRESS) session in
+    one round trip; start it through sessions/<id>/start/ first.
+
+    Payload: {"tests": [{"test_code": "PHQ9", "raw_responses": [...]}, ...]}
+    Test codes must match the battery definition from the session's
+    current index onward, in order. All TestRun rows are written and
+    the session/order completed in a single transaction.
+    """
+    permission_classes = [AllowAny]
+
+    @idempotent("clinical.sessions.submit_all")
+    @transaction.atomic
+    def post(self, request, session_id):
+        session = get_object_or_404(
+            BatterySession.objects.select_for_update().select_related("order"),
+            id=session_id,
+        )
+
+        # Same rule as submit_current: the session must be started first
+        if session.status != "IN_PROGRESS":
+            return Response(
+                {"success": False, "message": "Session is not in progress", "data": None},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        submissions = request.data.get("tests")
+        if not isinstance(submissions, list) or not submissions:
+            return Response(
+                {"success": False, "message": "tests must be a non-empty list", "data": None},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        for item in submissions:
+            if (
+                not isinstance(item, dict)
+                or not item.get("test_code")
+                or item.get("raw_responses") is None
+            ):
+                return Response(
+                    {
+                        "success": False,
+                        "message": "Each test requires test_code and raw_responses",
+                        "data": None,
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        battery = get_battery_def(session.order.battery_code)
+        expected = battery["tests"][session.current_test_index:]
+        submitted = [item["test_code"] for item in submissions]
+
+        # 🔒 Same integrity rule as submit_current: order must match the battery
+        if submitted != expected:
+            return Response(
+                {
+                    "success": False,
+                    "message": "Invalid test submission order",
+                    "data": {
+                        "expected_test_codes": expected,
+                        "submitted_test_codes": submitted,
+                    },
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        runs = submit_remaining_tests(session, battery, submissions)
+
+        order = session.order
+        order.status = "COMPLETED"
+        order.save(update_fields=["status"])
+
+        return Response(
+            {
+                "success": True,
+                "message": "Battery submitted successfully",
+                "data": {
+                    "completed": True,
+                    "session_id": str(session.id),
+                    "submitted_test_codes": submitted,
+                    "test_runs": len(runs),
+                },
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
 # -------------------------------------------------
 # 6.5 GENERATE REPORT (PHASE 1)
 # -------------------------------------------------
@@ -357,7 +459,7 @@ class GenerateReportView(APIView):
         # ---- STEP 3: PHASE 1 explicit lifecycle ----
         report.validation_status = ClinicalReport.DATA_VALIDATED
         report.review_status = ClinicalReport.REVIEW_DRAFT
-        report.save(update_fields=["validation_status", "review_status"])
+        report.save(update_fields=["validation_status", "review_status", "updated_at"])
 
         return Response(
             {
@@ -465,10 +567,31 @@ class GetClinicalReportPDFView(APIView):
                 status=status.HTTP_409_CONFLICT,
             )
 
+        from backend.clinical.audit.models import ClinicalAuditEvent
+
+        # Rendering is deterministic, so report_json plus the renderer version
+        # identify the bytes; sign-off rewrites report_json and moves both validators
+        etag = strong_etag(report_pdf_etag_v1(report.report_json))
+        last_modified = report.updated_at
+        if is_not_modified(request, etag, last_modified):
+            ClinicalAuditEvent.objects.create(
+                organization_id=order.organization_id,
+                event_type="PDF_EXPORTED",
+                actor=str(request.user.id) if request.user.is_authenticated else "anonymous",
+                order_id=order.id,
+                report_id=report.id,
+                meta={"file_name": f"report_{order_id}.pdf", "not_modified": True},
+            )
+            return not_modified_response(etag, last_modified)
+
         pdf_bytes = render_pdf_from_report_json_v1(report.report_json)
+        pdf_sha256 = hashlib.sha256(pdf_bytes).hexdigest()
+
+        if report.pdf_sha256 != pdf_sha256:
+            # First export, or report_json / renderer changed: record the bytes served
+            ClinicalReport.objects.filter(pk=report.pk).update(pdf_sha256=pdf_sha256)
 
         # STEP 4: AUDIT LOG (Was Missing!)
-        from backend.clinical.audit.models import ClinicalAuditEvent
         ClinicalAuditEvent.objects.create(
             organization_id=order.organization_id,
             event_type="PDF_EXPORTED",
@@ -478,6 +601,11 @@ class GetClinicalReportPDFView(APIView):
             meta={"file_name": f"report_{order_id}.pdf"},
         )
 
-        response = HttpResponse(pdf_bytes, content_type="application/pdf")
-        response["Content-Disposition"] = f'inline; filename="report_{order_id}.pdf"'
-        return response
+        return ranged_bytes_response(
+            request,
+            pdf_bytes,
+            etag=etag,
+            last_modified=last_modified,
+            filename=f"report_{order_id}.pdf",
+            disposition="inline",
+        )
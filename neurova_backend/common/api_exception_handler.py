@@ -1,6 +1,8 @@
 import logging
+from rest_framework.exceptions import Throttled
 from rest_framework.views import exception_handler
 from apps.clinical_ops.audit.models import AuditEvent
+from common.metrics import THROTTLE_REJECTIONS, route_of
 
 logger = logging.getLogger("neurova.api")
 
@@ -25,6 +27,9 @@ def neurova_exception_handler(exc, context):
 
     status_code = response.status_code if response else 500
 
+    if isinstance(exc, Throttled) and request is not None:
+        THROTTLE_REJECTIONS.labels(route=route_of(request)).inc()
+
     # Log SECURITY (401/403) and SYSTEM (500) errors to DB
     if status_code in [401, 403, 500]:
         try:
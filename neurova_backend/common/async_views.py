@@ -0,0 +1,152 @@
+"""
+Base classes for natively async (ASGI) views.
+
+AsyncAPIView speaks the same wire format as the DRF views, so clients
+cannot tell them apart:
+
+    - {"success", "message", "data"} envelopes; successful "data" is
+      replaced by "encrypted_data" exactly like @encrypt_response
+    - request bodies are read like @decrypt_request (request.decrypted_data)
+    - authentication_classes (DRF authenticators, e.g.
+      ClaimsJWTAuthentication) run first; when set, a request without
+      valid credentials is a 401
+    - then the shared token-bucket throttles (common/rate_limit.py);
+      a rejection is a 429 with Retry-After, as from DRF
+    - PermissionDenied -> 403, anything else -> 500 with error_message
+
+AsyncPublicView is the variant for the token-in-URL patient endpoints.
+
+Usage:
+    class PublicThing(AsyncPublicView):
+        throttle_scope = "public_read"
+        error_message = "Unable to load thing."
+
+        async def get(self, request, token):
+            order, new_token = await avalidate_and_rotate_url_token(token, request)
+            return self.respond({"order_id": order.id}, "Loaded", public_token=new_token)
+
+Handlers must only use the async ORM (or wrap sync code in
+sync_to_async); a lazy FK access raises SynchronousOnlyOperation.
+"""
+
+import json
+import logging
+import math
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated, PermissionDenied
+
+from common.crypto_utils import decrypt_data, encrypt_data, is_encrypted_format
+from common.metrics import THROTTLE_REJECTIONS, route_of
+from common.rate_limit import ClientIPThrottle, PublicTokenThrottle
+
+logger = logging.getLogger(__name__)
+
+
+def envelope(success, message, data=None, status_code=status.HTTP_200_OK, **extra):
+    """JsonResponse in the standard envelope; successful data is encrypted."""
+    body = {"success": success, **extra}
+    if message is not None:
+        body["message"] = message
+    if success and data is not None:
+        body["encrypted_data"] = encrypt_data(data)
+    else:
+        body["data"] = data
+    return JsonResponse(body, status=status_code)
+
+
+class AsyncAPIView(View):
+    authentication_classes = []
+    throttle_scope = None
+    throttle_classes = []
+    error_message = "Unable to process request."
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Token-authenticated JSON API, like DRF's APIView
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def perform_authentication(self, request):
+        """Sets request.user / request.auth from the first authenticator that accepts."""
+        if not self.authentication_classes:
+            return
+        for auth_class in self.authentication_classes:
+            result = await sync_to_async(auth_class().authenticate)(request)
+            if result is not None:
+                request.user, request.auth = result
+                return
+        raise NotAuthenticated()
+
+    async def check_throttles(self, request):
+        """Seconds to wait when throttled, else None."""
+        for throttle_class in self.throttle_classes:
+            throttle = throttle_class()
+            allowed = await sync_to_async(throttle.allow_request)(request, self)
+            if not allowed:
+                return throttle.wait() or 0
+        return None
+
+    def decrypt_body(self, request):
+        """Sets request.decrypted_data; returns an error response or None."""
+        request.decrypted_data = {}
+        try:
+            payload = json.loads(request.body or b"{}")
+        except ValueError:
+            return envelope(False, "Invalid JSON body", status_code=status.HTTP_400_BAD_REQUEST)
+        if not is_encrypted_format(payload):
+            return None
+
+        encrypted = payload.get("encrypted_data")
+        if not encrypted or not isinstance(encrypted, str):
+            return envelope(
+                False,
+                "Invalid encrypted_data field: must be non-empty string",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            request.decrypted_data = decrypt_data(encrypted)
+        except ValueError:
+            return envelope(False, "Invalid encrypted payload: decryption failed", status_code=status.HTTP_400_BAD_REQUEST)
+        return None
+
+    def respond(self, data, message, public_token=None, status_code=status.HTTP_200_OK):
+        response = envelope(True, message, data, status_code=status_code)
+        if public_token:
+            # Return rotated token
+            response["X-Public-Token"] = public_token
+        return response
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            await self.perform_authentication(request)
+        except (AuthenticationFailed, NotAuthenticated) as e:
+            return envelope(False, str(e.detail), status_code=status.HTTP_401_UNAUTHORIZED)
+
+        wait = await self.check_throttles(request)
+        if wait is not None:
+            THROTTLE_REJECTIONS.labels(route=route_of(request)).inc()
+            seconds = math.ceil(wait)
+            response = envelope(
+                False,
+                f"Request was throttled. Expected available in {seconds} seconds.",
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                error_code="throttled",
+            )
+            response["Retry-After"] = str(seconds)
+            return response
+
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except PermissionDenied as e:
+            return envelope(False, str(e.detail), status_code=status.HTTP_403_FORBIDDEN)
+        except Exception as e:
+            logger.error(f"Error in {type(self).__name__}: {str(e)}", exc_info=True)
+            return envelope(False, self.error_message, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AsyncPublicView(AsyncAPIView):
+    throttle_classes = [PublicTokenThrottle, ClientIPThrottle]
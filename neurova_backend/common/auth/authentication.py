@@ -0,0 +1,94 @@
+# common/auth/authentication.py
+
+from functools import cached_property
+from uuid import UUID
+
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from core.models import Organization
+
+CLAIM_NAMES = ("org_id", "org_external_id", "role")
+
+
+# ==============================
+# REQUEST PRINCIPAL
+# ==============================
+class ClaimsProfile:
+    """
+    Stand-in for UserProfile built from token claims.
+    organization only carries id and external_id; any other field is a
+    deferred field and loads from the DB on first access.
+    """
+
+    def __init__(self, org_id, org_external_id, role):
+        self.organization_id = org_id
+        self.role = role
+        self.organization = Organization.from_db(
+            DEFAULT_DB_ALIAS,
+            ["id", "external_id"],
+            [org_id, UUID(org_external_id)],
+        )
+
+
+class TokenPrincipal:
+    """
+    request.user for staff JWTs.
+    id / username / profile come from the access token; anything else
+    (get_full_name, first_name, is_staff ...) loads the real User once.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, validated_token):
+        self.id = self.pk = validated_token[api_settings.USER_ID_CLAIM]
+        self.username = validated_token.get("username", "")
+        self.profile = ClaimsProfile(
+            validated_token["org_id"],
+            validated_token["org_external_id"],
+            validated_token["role"],
+        )
+
+    @cached_property
+    def user(self):
+        return get_user_model().objects.get(**{api_settings.USER_ID_FIELD: self.id})
+
+    def get_username(self):
+        return self.username
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.user, name)
+
+    def __str__(self):
+        return self.username
+
+
+# ==============================
+# AUTHENTICATION
+# ==============================
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication without the per-request user / profile / organization
+    queries: tokens issued by AppTokenObtainPairSerializer carry org and
+    role claims, so request.user is a TokenPrincipal.
+
+    Tokens without the claims (users without a profile, tokens minted
+    before the claims existed) fall back to the DB lookup.
+
+    Revocation: access tokens are short lived; logout blacklists the
+    refresh token and AppTokenRefreshSerializer re-checks the user
+    (active, profile, organization) before minting the next access token.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM in validated_token and all(
+            validated_token.get(name) for name in CLAIM_NAMES
+        ):
+            return TokenPrincipal(validated_token)
+        return super().get_user(validated_token)
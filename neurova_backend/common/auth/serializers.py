@@ -15,6 +15,19 @@ from rest_framework_simplejwt.exceptions import TokenError
 User = get_user_model()
 
 
+def stamp_org_claims(token, user):
+    """
+    Copy the organization and role onto a token so ClaimsJWTAuthentication
+    can build request.user without touching the database.
+    """
+    profile = user.profile
+    token["org_id"] = profile.organization_id
+    token["org_external_id"] = str(profile.organization.external_id)
+    token["role"] = profile.role
+    token["username"] = user.get_username()
+    return token
+
+
 # ==============================
 # LOGIN SERIALIZER
 # ==============================
@@ -23,6 +36,13 @@ class AppTokenObtainPairSerializer(TokenObtainPairSerializer):
     Generates JWT tokens + validated organization context
     """
 
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        if hasattr(user, "profile") and user.profile.organization_id:
+            stamp_org_claims(token, user)
+        return token
+
     def validate(self, attrs):
         try:
             data = super().validate(attrs)
@@ -83,11 +103,18 @@ class AppTokenRefreshSerializer(TokenRefreshSerializer):
         if not user or not hasattr(user, "profile") or not user.profile.organization:
             raise AuthenticationFailed("User organization context invalid")
 
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive")
+
         profile = user.profile
         organization = profile.organization
 
+        # Re-read org / role from the DB so a role change or org move
+        # reaches the next access token, not only the next login.
+        access = stamp_org_claims(refresh.access_token, user)
+
         return {
-            "access_token": data["access"],
+            "access_token": str(access),
             "refresh_token": data["refresh"],  # NEW rotated refresh
             "expires_in": settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"].seconds,
             "org_id": str(organization.external_id),
@@ -28,6 +28,7 @@ import base64
 import json
 import os
 import logging
+from common.metrics import timed
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +45,7 @@ if len(ENCRYPTION_KEY) not in [16, 24, 32]:
     ENCRYPTION_KEY = b'dev-key-16-bytes'  # 16 bytes for AES-128
 
 
+@timed("encrypt")
 def encrypt_data(data: dict) -> str:
     """
     Encrypt dictionary data using AES-256-CBC.
@@ -91,6 +93,7 @@ def encrypt_data(data: dict) -> str:
         raise Exception(f"Encryption error: {e}")
 
 
+@timed("decrypt")
 def decrypt_data(encrypted: str) -> dict:
     """
     Decrypt AES-256-CBC encrypted data.
@@ -0,0 +1,64 @@
+"""
+Postgres advisory locks for jobs that must not overlap.
+
+Usage:
+    from common.db_locks import advisory_lock, advisory_xact_lock
+
+    with advisory_lock("retention_sweep") as acquired:
+        if not acquired:
+            return  # another run holds it
+
+    with transaction.atomic():
+        advisory_xact_lock("audit_chain_seal")  # released at commit/rollback
+
+Lock names are hashed to a signed 64-bit key. On other database
+vendors the helpers are no-ops that always "acquire".
+"""
+
+from contextlib import contextmanager
+import hashlib
+
+from django.db import connection
+
+
+def lock_key(name: str) -> int:
+    return int.from_bytes(hashlib.sha256(name.encode("utf-8")).digest()[:8], "big", signed=True)
+
+
+def _is_postgres():
+    return connection.vendor == "postgresql"
+
+
+def advisory_xact_lock(name: str, wait: bool = True) -> bool:
+    """Transaction-scoped lock; call inside transaction.atomic()."""
+    if not _is_postgres():
+        return True
+    with connection.cursor() as cursor:
+        if wait:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [lock_key(name)])
+            return True
+        cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", [lock_key(name)])
+        return cursor.fetchone()[0]
+
+
+@contextmanager
+def advisory_lock(name: str):
+    """
+    Session-scoped, non-blocking lock held for the with-block.
+    Yields True when acquired, False when another session holds it.
+    """
+    if not _is_postgres():
+        yield True
+        return
+
+    key = lock_key(name)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(%s)", [key])
+        acquired = cursor.fetchone()[0]
+
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", [key])
@@ -0,0 +1,83 @@
+"""
+Database connection management.
+
+With psycopg 3 and psycopg_pool installed (requirements.txt), every
+process keeps a pool per alias using Django's native pool support:
+
+    DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE   pool bounds (per process)
+    DB_POOL_TIMEOUT                       seconds to wait for a free connection
+    DB_POOL_MAX_IDLE / DB_POOL_MAX_LIFETIME  recycle idle / old connections
+
+Pooled connections are health-checked on checkout. Setting
+DB_POOL_ENABLED=false (or running on psycopg2) falls back to persistent
+connections: CONN_MAX_AGE=DB_CONN_MAX_AGE with CONN_HEALTH_CHECKS.
+
+pool_stats() feeds the readiness endpoint (core/health.py). This
+module is imported by settings, so it must not touch django.db at
+import time.
+"""
+
+try:
+    import psycopg  # noqa: F401
+    from psycopg_pool import ConnectionPool
+except ImportError:  # psycopg2 deployments
+    ConnectionPool = None
+
+
+def pooling_available():
+    return ConnectionPool is not None
+
+
+def configure_connections(databases, *, pool_enabled, min_size, max_size, timeout, max_idle,
+                          max_lifetime, conn_max_age):
+    """Apply pooling (or persistent-connection) settings to every alias in place."""
+    for config in databases.values():
+        options = config.setdefault("OPTIONS", {})
+        if pool_enabled and pooling_available():
+            options["pool"] = {
+                "min_size": min_size,
+                "max_size": max_size,
+                "timeout": timeout,
+                "max_idle": max_idle,
+                "max_lifetime": max_lifetime,
+            }
+            config["CONN_MAX_AGE"] = 0  # the pool owns connection lifetime
+        else:
+            options.pop("pool", None)
+            config["CONN_MAX_AGE"] = conn_max_age
+        # Pool: Django passes ConnectionPool.check_connection; persistent: ping before reuse
+        config["CONN_HEALTH_CHECKS"] = True
+    return databases
+
+
+def pool_stats(alias="default"):
+    """Per-process pool counters for one alias."""
+    from django.db import connections
+
+    conn = connections[alias]
+    if not conn.settings_dict.get("OPTIONS", {}).get("pool"):
+        return {
+            "mode": "persistent",
+            "conn_max_age": conn.settings_dict.get("CONN_MAX_AGE"),
+            "health_checks": conn.settings_dict.get("CONN_HEALTH_CHECKS", False),
+        }
+
+    stats = conn.pool.get_stats()
+    requests = stats.get("requests_num", 0)
+    wait_ms = stats.get("requests_wait_ms", 0)
+    size = stats.get("pool_size", 0)
+    available = stats.get("pool_available", 0)
+    return {
+        "mode": "pool",
+        "min_size": stats.get("pool_min"),
+        "max_size": stats.get("pool_max"),
+        "size": size,
+        "available": available,
+        "in_use": size - available,
+        "waiting": stats.get("requests_waiting", 0),
+        "requests": requests,
+        "wait_ms_total": wait_ms,
+        "avg_wait_ms": round(wait_ms / requests, 2) if requests else 0.0,
+        "timeouts": stats.get("requests_errors", 0),
+        "health_check_failures": stats.get("connections_lost", 0),
+    }
@@ -0,0 +1,99 @@
+"""
+Primary/replica database routing.
+
+When settings.DATABASES has a "replica" alias (POSTGRES_REPLICA_HOST),
+reads made inside replica_reads() - views decorated with
+@read_from_replica, the PMS report engine - go to the replica.
+Everything else stays on "default":
+
+  - writes, and select_for_update() querysets (Django routes those
+    through db_for_write)
+  - reads inside transaction.atomic() on the primary
+  - every read after the first write of the current request/command,
+    so a client always reads its own writes
+
+ReplicaPinningMiddleware (common/replica_middleware.py) resets the
+state per request. Without a replica alias the router is a no-op.
+
+Two local databases are enough to try it: point POSTGRES_REPLICA_DB at
+a copy of the primary (tests mirror the replica onto default).
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_ALIAS = "replica"
+
+_replica_reads = ContextVar("replica_reads", default=False)
+_pinned_to_primary = ContextVar("pinned_to_primary", default=False)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def pin_to_primary():
+    _pinned_to_primary.set(True)
+
+
+def is_pinned_to_primary():
+    return _pinned_to_primary.get()
+
+
+@contextmanager
+def replica_reads():
+    """Route reads in this block to the replica (unless pinned)."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@contextmanager
+def routing_scope():
+    """Fresh routing state for one request or job."""
+    reads = _replica_reads.set(False)
+    pinned = _pinned_to_primary.set(False)
+    try:
+        yield
+    finally:
+        _pinned_to_primary.reset(pinned)
+        _replica_reads.reset(reads)
+
+
+def read_from_replica(view_func):
+    """Decorator for read-only view methods."""
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        with replica_reads():
+            return view_func(*args, **kwargs)
+    return wrapper
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if (
+            _replica_reads.get()
+            and not _pinned_to_primary.get()
+            and replica_configured()
+            and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return REPLICA_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Same data on both aliases
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_ALIAS
@@ -0,0 +1,202 @@
+"""
+Org-scoped event fan-out for Server-Sent Events streams.
+
+Publishers call publish() from ordinary (sync) code; the message goes out
+when the surrounding transaction commits. Every process keeps one
+EventHub of connected stream subscribers and delivers each message to
+the subscribers of its org; nothing polls the database per client.
+
+    EVENT_BUS_BACKEND=postgres  publish = pg_notify on the primary; the
+                                first subscriber in a process starts one
+                                LISTEN connection feeding the hub (default)
+    EVENT_BUS_BACKEND=local     in-process hand-off only (dev, tests,
+                                single-worker deployments)
+
+Messages are small JSON dicts ({"org", "event", "data"}); NOTIFY payloads
+are capped at 8000 bytes, so never publish full records.
+
+Usage:
+    from common.event_bus import publish
+    publish(order.org_id, "order.status", {"order_id": order.id, "status": order.status})
+
+    subscription = await subscribe(org_id)
+    try:
+        message = await subscription.get()
+    finally:
+        unsubscribe(subscription)
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "clinical_events"
+RECONNECT_SECONDS = 5
+
+
+# --------------------------------------------------
+# HUB
+# --------------------------------------------------
+
+class Subscription:
+    """One stream client: a bounded queue owned by its event loop."""
+
+    def __init__(self, org, loop, max_queue):
+        self.org = org
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        # Set when messages were dropped; the stream tells the client to resync
+        self.overflowed = False
+
+    def put(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class EventHub:
+    """Subscribers of this process, by org. deliver() is thread-safe."""
+
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def add(self, subscription):
+        with self._lock:
+            self._subscribers.setdefault(subscription.org, set()).add(subscription)
+
+    def remove(self, subscription):
+        with self._lock:
+            subs = self._subscribers.get(subscription.org)
+            if subs:
+                subs.discard(subscription)
+                if not subs:
+                    del self._subscribers[subscription.org]
+
+    def deliver(self, message):
+        with self._lock:
+            subs = list(self._subscribers.get(message.get("org"), ()))
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub.put, message)
+            except RuntimeError:
+                # Loop already closed; the stream is gone
+                self.remove(sub)
+
+
+hub = EventHub()
+
+
+# --------------------------------------------------
+# BROKERS
+# --------------------------------------------------
+
+class LocalBroker:
+    """Delivers straight to this process's hub."""
+
+    def publish(self, message):
+        hub.deliver(message)
+
+    async def ensure_listening(self):
+        return None
+
+
+class PostgresBroker:
+    """pg_notify to publish; one LISTEN connection per process to receive."""
+
+    def __init__(self, using="default"):
+        self.using = using
+        self._task = None
+
+    def publish(self, message):
+        with connections[self.using].cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [CHANNEL, json.dumps(message)])
+
+    def _conninfo(self):
+        params = connections[self.using].get_connection_params()
+        # Django-specific adapters; the listener only reads text payloads
+        for key in ("cursor_factory", "context", "prepare_threshold"):
+            params.pop(key, None)
+        return params
+
+    async def ensure_listening(self):
+        loop = asyncio.get_running_loop()
+        task = self._task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._task = loop.create_task(self._listen(self._conninfo()))
+
+    async def _listen(self, conninfo):
+        import psycopg
+
+        while True:
+            try:
+                conn = await psycopg.AsyncConnection.connect(autocommit=True, **conninfo)
+                async with conn:
+                    await conn.execute(f"LISTEN {CHANNEL}")
+                    async for notify in conn.notifies():
+                        try:
+                            hub.deliver(json.loads(notify.payload))
+                        except ValueError:
+                            logger.warning("Dropped malformed event bus payload")
+            except psycopg.OperationalError as e:
+                logger.warning(f"Event bus listener disconnected: {e}; retrying in {RECONNECT_SECONDS}s")
+                await asyncio.sleep(RECONNECT_SECONDS)
+
+
+@lru_cache(maxsize=None)
+def _broker_for(backend):
+    if backend == "postgres":
+        return PostgresBroker()
+    if backend == "local":
+        return LocalBroker()
+    raise ImproperlyConfigured(f"Unknown EVENT_BUS_BACKEND: {backend}")
+
+
+def get_broker():
+    return _broker_for(getattr(settings, "EVENT_BUS_BACKEND", "postgres"))
+
+
+# --------------------------------------------------
+# API
+# --------------------------------------------------
+
+def publish(org_id, event, data):
+    """Send {"org", "event", "data"} to the org's streams once the transaction commits."""
+    message = {"org": str(org_id), "event": event, "data": data}
+    broker = get_broker()
+
+    def send():
+        try:
+            broker.publish(message)
+        except Exception as e:
+            # Notifications are best effort; the inbox stays the source of truth
+            logger.error(f"Event bus publish failed: {str(e)}", exc_info=True)
+
+    transaction.on_commit(send)
+
+
+async def subscribe(org_id):
+    subscription = Subscription(
+        str(org_id),
+        asyncio.get_running_loop(),
+        getattr(settings, "EVENT_STREAM_MAX_QUEUE", 100),
+    )
+    hub.add(subscription)
+    await get_broker().ensure_listening()
+    return subscription
+
+
+def unsubscribe(subscription):
+    hub.remove(subscription)
@@ -0,0 +1,262 @@
+"""
+HTTP conditional and range helpers for report downloads.
+
+Strong validators come from the stored PDF sha256, so a client that
+already holds the file revalidates with a header exchange
+(If-None-Match -> 304), and an interrupted download resumes with
+Range -> 206 instead of starting over.
+
+Usage:
+    etag = strong_etag(report.pdf_sha256)
+    if is_not_modified(request, etag, report.generated_at):
+        return not_modified_response(etag, report.generated_at)
+    return ranged_file_response(request, report.pdf_file.open("rb"), ...)
+
+Only single byte ranges are served; multi-range requests get the
+full body (RFC 9110 allows ignoring Range).
+
+Async views use aranged_file_response: under ASGI Django would read a
+sync iterator fully into memory, so the body is an async iterator
+whose reads run in the thread pool.
+"""
+
+import re
+
+from asgiref.sync import sync_to_async
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+
+CHUNK_SIZE = 64 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def strong_etag(sha256_hex):
+    return quote_etag(sha256_hex) if sha256_hex else None
+
+
+def _timestamp(last_modified):
+    return int(last_modified.timestamp()) if last_modified else None
+
+
+def _etag_matches(header, etag, weak=True):
+    if not header or not etag:
+        return False
+    tags = parse_etags(header)
+    if "*" in tags:
+        return True
+    if weak:
+        bare = etag.removeprefix("W/")
+        return any(t.removeprefix("W/") == bare for t in tags)
+    return etag in tags and not etag.startswith("W/")
+
+
+def is_not_modified(request, etag, last_modified=None):
+    """If-None-Match wins; If-Modified-Since only applies without it."""
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match:
+        return _etag_matches(if_none_match, etag)
+
+    since = parse_http_date_safe(request.META.get("HTTP_IF_MODIFIED_SINCE", ""))
+    modified = _timestamp(last_modified)
+    return since is not None and modified is not None and modified <= since
+
+
+def _set_validators(response, etag, last_modified):
+    if etag:
+        response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(_timestamp(last_modified))
+    # Clinical documents: cache per user only, always revalidate
+    response["Cache-Control"] = "private, no-cache"
+    response["Accept-Ranges"] = "bytes"
+
+
+def not_modified_response(etag, last_modified=None):
+    response = HttpResponse(status=304)
+    _set_validators(response, etag, last_modified)
+    return response
+
+
+def parse_range(header, size):
+    """
+    Returns (start, end) inclusive, None for "serve everything",
+    or False when the range cannot be satisfied.
+    """
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None  # malformed or multi-range: ignore
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, end
+
+
+def _if_range_allows(request, etag, last_modified):
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        return _etag_matches(if_range, etag, weak=False)
+    since = parse_http_date_safe(if_range)
+    return since is not None and _timestamp(last_modified) == since
+
+
+def _iter_range(fileobj, start, length):
+    try:
+        fileobj.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = fileobj.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        fileobj.close()
+
+
+async def _aiter_range(fileobj, start, length):
+    read = sync_to_async(fileobj.read, thread_sensitive=False)
+    try:
+        await sync_to_async(fileobj.seek, thread_sensitive=False)(start)
+        remaining = length
+        while remaining > 0:
+            chunk = await read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        await sync_to_async(fileobj.close, thread_sensitive=False)()
+
+
+def _requested_range(request, size, etag, last_modified):
+    if not _if_range_allows(request, etag, last_modified):
+        return None
+    return parse_range(request.META.get("HTTP_RANGE"), size)
+
+
+def _unsatisfiable(size, etag, last_modified):
+    response = HttpResponse(status=416)
+    response["Content-Range"] = f"bytes */{size}"
+    _set_validators(response, etag, last_modified)
+    return response
+
+
+def _finish(response, etag, last_modified, filename, disposition):
+    if filename:
+        response["Content-Disposition"] = f'{disposition}; filename="{filename}"'
+    _set_validators(response, etag, last_modified)
+    return response
+
+
+def ranged_file_response(
+    request,
+    fileobj,
+    *,
+    size,
+    etag=None,
+    last_modified=None,
+    content_type="application/pdf",
+    filename=None,
+    disposition="attachment",
+):
+    """
+    Stream fileobj as 200, 206 (single Range) or 416, never buffering
+    the body. fileobj must be seekable and is closed by the response.
+    """
+    byte_range = _requested_range(request, size, etag, last_modified)
+
+    if byte_range is False:
+        fileobj.close()
+        return _unsatisfiable(size, etag, last_modified)
+
+    if byte_range is None:
+        response = FileResponse(fileobj, content_type=content_type)
+        response["Content-Length"] = str(size)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _iter_range(fileobj, start, length),
+            status=206,
+            content_type=content_type,
+        )
+        response["Content-Length"] = str(length)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    return _finish(response, etag, last_modified, filename, disposition)
+
+
+def ranged_bytes_response(
+    request,
+    data,
+    *,
+    etag=None,
+    last_modified=None,
+    content_type="application/pdf",
+    filename=None,
+    disposition="attachment",
+):
+    """Same contract as ranged_file_response for a body already in memory."""
+    size = len(data)
+    byte_range = _requested_range(request, size, etag, last_modified)
+
+    if byte_range is False:
+        return _unsatisfiable(size, etag, last_modified)
+
+    if byte_range is None:
+        response = HttpResponse(data, content_type=content_type)
+    else:
+        start, end = byte_range
+        response = HttpResponse(data[start:end + 1], status=206, content_type=content_type)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    return _finish(response, etag, last_modified, filename, disposition)
+
+
+def aranged_file_response(
+    request,
+    fileobj,
+    *,
+    size,
+    etag=None,
+    last_modified=None,
+    content_type="application/pdf",
+    filename=None,
+    disposition="attachment",
+):
+    """ranged_file_response with an async body, for async views."""
+    byte_range = _requested_range(request, size, etag, last_modified)
+
+    if byte_range is False:
+        fileobj.close()
+        return _unsatisfiable(size, etag, last_modified)
+
+    start, end = byte_range or (0, size - 1)
+    length = end - start + 1
+    response = StreamingHttpResponse(
+        _aiter_range(fileobj, start, length),
+        status=206 if byte_range else 200,
+        content_type=content_type,
+    )
+    response["Content-Length"] = str(length)
+    if byte_range:
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    return _finish(response, etag, last_modified, filename, disposition)
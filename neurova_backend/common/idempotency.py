@@ -0,0 +1,252 @@
+"""
+Idempotency Decorator for Django REST Framework Views
+
+Lets clients retry mutating requests safely. A request carrying an
+X-Idempotency-Key header is executed once; retries with the same key
+replay the original response (status, body and selected headers)
+instead of repeating the work.
+
+Records are keyed by (scope, key) where scope combines the endpoint
+name with the caller: the user id for staff, and for anonymous routes
+the resource in the URL (the order behind a public token, which stays
+the same across rotations, or e.g. the session id). Keys chosen by two
+patients therefore never collide.
+The request fingerprint covers the decrypted payload, so a client that
+re-encrypts the same body on retry (fresh IV) still replays; only a
+different logical payload under the same key is rejected (422).
+
+Records expire after IDEMPOTENCY_KEY_TTL_HOURS and are removed by
+`manage.py sweep_idempotency_keys`.
+
+Usage:
+    from common.idempotency import idempotent
+
+    class MyView(APIView):
+        @idempotent("staff.orders.create")
+        @decrypt_request
+        @encrypt_response
+        def post(self, request):
+            ...
+
+Place it outermost so the stored body is the final (encrypted) payload.
+"""
+
+from datetime import timedelta
+from functools import wraps
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from common.crypto_utils import decrypt_data, is_encrypted_format
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "X-Idempotency-Key"
+REPLAY_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 128
+
+# Response headers that are part of the replayed result
+REPLAYED_HEADERS = ("X-Public-Token",)
+
+
+def _ttl():
+    return timedelta(hours=getattr(settings, "IDEMPOTENCY_KEY_TTL_HOURS", 24))
+
+
+def _canonical(data) -> str:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), cls=DjangoJSONEncoder)
+
+
+def _logical_payload(request):
+    """Decrypted body for encrypted requests; the body as sent otherwise."""
+    if hasattr(request, "decrypted_data"):
+        return request.decrypted_data
+    payload = getattr(request, "data", None)
+    if is_encrypted_format(payload):
+        encrypted = payload.get("encrypted_data")
+        if isinstance(encrypted, str) and encrypted:
+            try:
+                return decrypt_data(encrypted)
+            except ValueError:
+                # decrypt_request rejects it; fingerprint the ciphertext
+                pass
+    return payload
+
+
+def request_fingerprint(request) -> str:
+    payload = _logical_payload(request)
+    try:
+        body = _canonical(payload if payload is not None else {})
+    except TypeError:
+        body = str(payload)
+    raw = f"{request.method}\n{request.path}\n{body}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _public_subject(view_kwargs) -> str:
+    """Stable identity of an anonymous caller's resource, from the URL kwargs."""
+    from apps.clinical_ops.models_public_token import PublicAccessToken
+
+    kwargs = dict(view_kwargs)
+    token = kwargs.pop("token", None)
+    if token:
+        token_hash = PublicAccessToken.hash_token(token)
+        order_id = (
+            PublicAccessToken.objects.filter(token_hash=token_hash)
+            .values_list("order_id", flat=True)
+            .first()
+        )
+        return f"order:{order_id}" if order_id else f"token:{token_hash}"
+    return ",".join(f"{k}={v}" for k, v in sorted(kwargs.items()))
+
+
+def _scope_for(name, request, view_kwargs=None) -> str:
+    user = getattr(request, "user", None)
+    if user is not None and getattr(user, "is_authenticated", False):
+        return f"{name}:user:{user.pk}"
+    return f"{name}:public:{_public_subject(view_kwargs or {})}"
+
+
+def _replay(record):
+    response = Response(record.response_body, status=record.response_status)
+    for header, value in (record.response_headers or {}).items():
+        response[header] = value
+    response[REPLAY_HEADER] = "true"
+    return response
+
+
+def _conflict(message):
+    return Response(
+        {"success": False, "message": message, "data": None},
+        status=status.HTTP_409_CONFLICT,
+    )
+
+
+def _resolve_existing(record, fingerprint):
+    if record.request_fingerprint != fingerprint:
+        return Response(
+            {
+                "success": False,
+                "message": "Idempotency key reused with a different request",
+                "data": None,
+            },
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    if record.status == record.STATUS_PENDING:
+        return _conflict("Request with this idempotency key is still in progress")
+    return _replay(record)
+
+
+def _claim(scope, key, fingerprint):
+    """
+    Insert a PENDING record for (scope, key).
+
+    Returns (record, None) when this request owns the key, or
+    (None, response) when an earlier request already holds it.
+    """
+    from apps.clinical_ops.models_idempotency import IdempotencyRecord
+
+    existing = IdempotencyRecord.objects.filter(scope=scope, key=key).first()
+    if existing and existing.is_expired():
+        existing.delete()
+        existing = None
+
+    if existing:
+        return None, _resolve_existing(existing, fingerprint)
+
+    try:
+        with transaction.atomic():
+            record = IdempotencyRecord.objects.create(
+                scope=scope,
+                key=key,
+                request_fingerprint=fingerprint,
+                expires_at=timezone.now() + _ttl(),
+            )
+    except IntegrityError:
+        # Lost the race against a concurrent request with the same key
+        existing = IdempotencyRecord.objects.filter(scope=scope, key=key).first()
+        if existing is None:
+            return None, _conflict("Request with this idempotency key is still in progress")
+        return None, _resolve_existing(existing, fingerprint)
+
+    return record, None
+
+
+def _store(record, response):
+    body = response.data
+    serialized = _canonical(body)
+
+    record.status = record.STATUS_COMPLETED
+    record.response_status = response.status_code
+    record.response_body = body
+    record.response_headers = {
+        h: response[h] for h in REPLAYED_HEADERS if response.has_header(h)
+    }
+    record.response_sha256 = hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+    record.save(
+        update_fields=[
+            "status",
+            "response_status",
+            "response_body",
+            "response_headers",
+            "response_sha256",
+        ]
+    )
+
+
+def idempotent(scope_name):
+    """
+    Decorator making a view method replay-safe under X-Idempotency-Key.
+
+    Requests without the header run unchanged. Only 2xx responses are
+    stored; errors release the key so the client can retry for real.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(self, request, *args, **kwargs):
+            key = request.headers.get(IDEMPOTENCY_HEADER)
+            if not key:
+                return view_func(self, request, *args, **kwargs)
+
+            if len(key) > MAX_KEY_LENGTH:
+                return Response(
+                    {
+                        "success": False,
+                        "message": f"{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters",
+                        "data": None,
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            fingerprint = request_fingerprint(request)
+            record, early = _claim(_scope_for(scope_name, request, kwargs), key, fingerprint)
+            if early is not None:
+                return early
+
+            try:
+                response = view_func(self, request, *args, **kwargs)
+            except Exception:
+                record.delete()
+                raise
+
+            if isinstance(response, Response) and 200 <= response.status_code < 300:
+                try:
+                    _store(record, response)
+                    return response
+                except Exception as e:
+                    logger.error(f"Failed to store idempotent response for {scope_name}: {e}")
+
+            record.delete()
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,129 @@
+"""
+Process metrics exposed at /metrics in Prometheus text format.
+
+    from common.metrics import timed, AUDIT_EVENTS_WRITTEN
+
+    @timed("score_battery")
+    def score_battery(...): ...
+
+    with timed("pdf_render"):
+        ...
+
+Preforked servers (gunicorn, uwsgi): set PROMETHEUS_MULTIPROC_DIR to an
+empty, writable directory shared by the workers. Every worker then
+writes its samples to mmap files there and /metrics aggregates all of
+them. Clear the directory when the server starts. The gunicorn
+child_exit hook should call
+prometheus_client.multiprocess.mark_process_dead(worker.pid).
+
+Labels stay low-cardinality: routes are URL patterns, not paths.
+"""
+
+import os
+import time
+from contextlib import ContextDecorator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+
+from common.tracing import span
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+HTTP_REQUESTS = Counter(
+    "neurova_http_requests_total",
+    "HTTP requests by route, method and status",
+    ["route", "method", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "neurova_http_request_duration_seconds",
+    "HTTP request latency by route and status",
+    ["route", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    "neurova_db_queries_per_request",
+    "Database queries executed per request",
+    ["route"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+DB_TIME = Histogram(
+    "neurova_db_time_per_request_seconds",
+    "Time spent in database queries per request",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+STAGE_LATENCY = Histogram(
+    "neurova_stage_duration_seconds",
+    "Time spent in pipeline stages (encrypt, decrypt, score_battery, report_context, pdf_render, audit_write)",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+AUDIT_EVENTS_WRITTEN = Counter(
+    "neurova_audit_events_written_total",
+    "Audit events written",
+)
+TOKEN_ROTATIONS = Counter(
+    "neurova_public_token_rotations_total",
+    "Public URL token validations by outcome",
+    ["outcome"],
+)
+THROTTLE_REJECTIONS = Counter(
+    "neurova_throttle_rejections_total",
+    "Requests rejected by rate limiting",
+    ["route"],
+)
+EVENT_STREAM_MESSAGES = Counter(
+    "neurova_event_stream_messages_total",
+    "Events sent to Server-Sent Events clients",
+    ["event"],
+)
+
+
+class timed(ContextDecorator):
+    """
+    Observe the duration of a block or function in STAGE_LATENCY and
+    trace it as a span of the same name (common/tracing.py).
+    """
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def _recreate_cm(self):
+        # A decorated function can run in several threads at once
+        return type(self)(self.stage)
+
+    def __enter__(self):
+        self._span = span(self.stage)
+        self._span.__enter__()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        STAGE_LATENCY.labels(stage=self.stage).observe(time.perf_counter() - self._started)
+        return self._span.__exit__(*exc)
+
+
+def route_of(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.route or match.view_name or "unknown"
+
+
+def render_latest():
+    """(body, content_type) for the /metrics response."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
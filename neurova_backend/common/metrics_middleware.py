@@ -0,0 +1,55 @@
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+
+from common.metrics import DB_QUERIES, DB_TIME, HTTP_LATENCY, HTTP_REQUESTS, route_of
+from common.middleware_base import HybridMiddleware
+
+
+class MetricsMiddleware(HybridMiddleware):
+    """
+    Records request latency by route/status and the number and total
+    time of DB queries each request made (common/metrics.py).
+
+    Under ASGI queries run on sync_to_async threads, whose connections
+    this middleware cannot wrap; async requests only record latency.
+    """
+
+    def _observe_request(self, request, response, elapsed):
+        route = route_of(request)
+        labels = {"route": route, "method": request.method, "status": str(response.status_code)}
+        HTTP_REQUESTS.labels(**labels).inc()
+        HTTP_LATENCY.labels(**labels).observe(elapsed)
+        return route
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        queries = {"count": 0, "seconds": 0.0}
+
+        def count_query(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                queries["count"] += 1
+                queries["seconds"] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(count_query))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        route = self._observe_request(request, response, elapsed)
+        DB_QUERIES.labels(route=route).observe(queries["count"])
+        DB_TIME.labels(route=route).observe(queries["seconds"])
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self._observe_request(request, response, time.perf_counter() - started)
+        return response
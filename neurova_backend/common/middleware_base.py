@@ -0,0 +1,22 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+
+class HybridMiddleware:
+    """
+    Base for middleware that runs natively under WSGI and ASGI, so an
+    ASGI deployment does not hop threads around every custom middleware.
+    Subclasses implement __call__ (sync) and __acall__ (async) and start
+    __call__ with:
+
+        if self.async_mode:
+            return self.__acall__(request)
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
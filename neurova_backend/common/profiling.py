@@ -0,0 +1,92 @@
+"""
+On-demand request profiles (cProfile), kept in a bounded directory.
+
+ProfilingMiddleware profiles a request when one of these holds:
+  - X-Profile-Signature is hex HMAC-SHA256(PROFILER_SECRET, X-Request-ID)
+    (see sign_request_id; disabled while PROFILER_SECRET is empty)
+  - ?__profile=1 and the caller is a staff user (session or JWT)
+  - a random draw falls under PROFILER_SAMPLE_RATE
+
+Routes open to unauthenticated callers (no DRF authentication or
+permission, AllowAny, plain Django views) are never profiled.
+
+Each profile is stored as <PROFILER_DIR>/<ms>_<request_id>.prof
+(pstats format) plus a .json sidecar. Only the newest
+PROFILER_MAX_PROFILES are kept. Staff can list and download them at
+/admin/profiles/. To read one:
+
+    python -m pstats <file>.prof
+"""
+
+import glob
+import hashlib
+import hmac
+import json
+import os
+import re
+import threading
+import time
+
+from django.conf import settings
+
+_write_lock = threading.Lock()
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def sign_request_id(request_id, secret=None):
+    secret = secret if secret is not None else settings.PROFILER_SECRET
+    return hmac.new(secret.encode(), request_id.encode(), hashlib.sha256).hexdigest()
+
+
+def valid_signature(request_id, signature):
+    secret = getattr(settings, "PROFILER_SECRET", "")
+    if not (secret and request_id and signature):
+        return False
+    return hmac.compare_digest(sign_request_id(request_id, secret), signature)
+
+
+def _profile_dir():
+    return settings.PROFILER_DIR
+
+
+def save_profile(profiler, request_id, meta):
+    """Dump profiler stats and metadata; trims the directory to PROFILER_MAX_PROFILES."""
+    directory = _profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, f"{int(time.time() * 1000)}_{_UNSAFE.sub('_', request_id)[:64]}")
+
+    profiler.dump_stats(f"{base}.prof")
+    with open(f"{base}.json", "w", encoding="utf-8") as f:
+        json.dump({"request_id": request_id, **meta}, f, default=str)
+
+    with _write_lock:
+        stale = sorted(glob.glob(os.path.join(directory, "*.prof")))[:-settings.PROFILER_MAX_PROFILES]
+        for path in stale:
+            for name in (path, path[:-len(".prof")] + ".json"):
+                try:
+                    os.remove(name)
+                except FileNotFoundError:
+                    pass
+    return f"{base}.prof"
+
+
+def list_profiles():
+    """Metadata of stored profiles, newest first."""
+    profiles = []
+    for path in sorted(glob.glob(os.path.join(_profile_dir(), "*.json")), reverse=True):
+        try:
+            with open(path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            continue
+        meta["file"] = os.path.basename(path)[:-len(".json")] + ".prof"
+        profiles.append(meta)
+    return profiles
+
+
+def profile_path(filename):
+    """Absolute path of a stored profile, or None for unknown/unsafe names."""
+    if _UNSAFE.search(filename) or not filename.endswith(".prof"):
+        return None
+    path = os.path.join(_profile_dir(), filename)
+    return path if os.path.isfile(path) else None
@@ -0,0 +1,101 @@
+import cProfile
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.urls import Resolver404, resolve
+from rest_framework.permissions import AllowAny
+
+from common.middleware_base import HybridMiddleware
+from common.profiling import save_profile, valid_signature
+
+logger = logging.getLogger(__name__)
+
+
+def _is_public(request):
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return True
+    view_class = getattr(match.func, "cls", None)
+    if view_class is None:
+        # Plain Django views (health, metrics, static) carry no DRF auth
+        return True
+    permissions = getattr(view_class, "permission_classes", [])
+    if not view_class.authentication_classes or not permissions:
+        return True
+    return any(isinstance(p, type) and issubclass(p, AllowAny) for p in permissions)
+
+
+def _is_staff(request):
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return user.is_staff
+    try:
+        from rest_framework_simplejwt.authentication import JWTAuthentication
+
+        authenticated = JWTAuthentication().authenticate(request)
+    except Exception:
+        return False
+    return bool(authenticated and authenticated[0].is_staff)
+
+
+class ProfilingMiddleware(HybridMiddleware):
+    """
+    Runs selected requests under cProfile (common/profiling.py).
+    Place after AuthenticationMiddleware and RequestIDMiddleware.
+
+    Under ASGI requests pass straight through: cProfile only sees the
+    event-loop thread, not the awaited work. Profile on a WSGI worker.
+    """
+
+    QUERY_FLAG = "__profile"
+    SIGNATURE_HEADER = "HTTP_X_PROFILE_SIGNATURE"
+    RESPONSE_HEADER = "X-Profile-Id"
+
+    def _trigger(self, request):
+        request_id = getattr(request, "request_id", "")
+        if valid_signature(request_id, request.META.get(self.SIGNATURE_HEADER, "")):
+            return "signature"
+        if request.GET.get(self.QUERY_FLAG) == "1" and _is_staff(request):
+            return "admin"
+        rate = getattr(settings, "PROFILER_SAMPLE_RATE", 0.0)
+        if rate and random.random() < rate:
+            return "sample"
+        return None
+
+    async def __acall__(self, request):
+        return await self.get_response(request)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        trigger = self._trigger(request)
+        if trigger is None or _is_public(request):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+            if hasattr(response, "render") and not getattr(response, "is_rendered", True):
+                response.render()
+        finally:
+            profiler.disable()
+
+        request_id = getattr(request, "request_id", "") or "unknown"
+        try:
+            save_profile(profiler, request_id, {
+                "method": request.method,
+                "path": request.path,  # never the query string
+                "status": response.status_code,
+                "duration_ms": int((time.perf_counter() - started) * 1000),
+                "trigger": trigger,
+                "created_at": time.time(),
+            })
+            response[self.RESPONSE_HEADER] = request_id
+        except Exception as e:
+            logger.error(f"Error saving request profile: {str(e)}", exc_info=True)
+        return response
@@ -0,0 +1,303 @@
+"""
+Token-bucket rate limiting on a store shared by every worker process.
+
+DRF's stock throttles keep their history in the local-memory cache, so
+limits were per process and reset on restart. The throttles here keep one
+bucket per key in a shared store and refill / consume it in a single
+atomic round trip:
+
+    RATE_LIMIT_BACKEND=db      RateLimitBucket rows, one INSERT .. ON CONFLICT
+                               .. RETURNING per check (default)
+    RATE_LIMIT_BACKEND=redis   one Lua script per check against
+                               RATE_LIMIT_REDIS_URL (Redis or any server
+                               speaking its protocol; needs the `redis` package)
+
+Buckets are keyed by scope, endpoint class and identity:
+
+    public_token   order behind the URL token on public routes (tokens
+                   rotate on every use, so one bucket spans the chain;
+                   unknown tokens fall back to the token hash)
+    ip             client IP for anonymous callers (kept loose: many
+                   patients share one clinic NAT address)
+    user           authenticated user
+    org            the caller's organization (from the JWT claims)
+
+The endpoint class is the view's `throttle_scope`, or its class name.
+Rates come from RATE_LIMITS ("scope" or "scope.endpoint_class" ->
+"N/second|minute|hour|day"); a missing or None rate disables the check.
+
+Usage:
+    from common.rate_limit import PublicTokenThrottle, ClientIPThrottle
+
+    class PublicOrderSubmit(APIView):
+        throttle_scope = "public_submit"
+        throttle_classes = [PublicTokenThrottle, ClientIPThrottle]
+
+Buckets idle for longer than a full refill are removed by
+`manage.py sweep_rate_limit_buckets`. The stores also keep plain counters
+(increment()) for limits that must not refill, such as failed report
+access codes.
+"""
+
+import hashlib
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """'30/minute' -> (30, 60). None -> (None, None)."""
+    if rate is None:
+        return None, None
+    num, period = rate.split("/")
+    return int(num), PERIODS[period[0]]
+
+
+# --------------------------------------------------
+# STORES
+# --------------------------------------------------
+
+class DatabaseBucketStore:
+    """RateLimitBucket table on the primary database (never the replica)."""
+
+    def __init__(self, using="default"):
+        self.using = using
+
+    @property
+    def table(self):
+        from apps.clinical_ops.models_rate_limit import RateLimitBucket
+
+        return RateLimitBucket._meta.db_table
+
+    def consume(self, key, capacity, rate, cost=1):
+        """
+        Refill the bucket for the time elapsed, then take `cost` tokens if
+        available. Returns (allowed, tokens left). cost=0 only peeks.
+        """
+        now = time.time()
+        refill = f"LEAST(%(capacity)s, b.tokens + GREATEST(%(now)s - b.updated_at, 0) * %(rate)s)"
+        sql = f"""
+            INSERT INTO {self.table} AS b (key, tokens, updated_at, expires_at, allowed)
+            VALUES (%(key)s, %(capacity)s - %(cost)s, %(now)s, %(expires)s, %(capacity)s >= %(cost)s)
+            ON CONFLICT (key) DO UPDATE SET
+                tokens = CASE WHEN {refill} >= %(cost)s THEN {refill} - %(cost)s ELSE {refill} END,
+                allowed = {refill} >= %(cost)s,
+                updated_at = %(now)s,
+                expires_at = %(expires)s
+            RETURNING allowed, tokens
+        """
+        params = {
+            "key": key,
+            "capacity": float(capacity),
+            "rate": float(rate),
+            "cost": float(cost),
+            "now": now,
+            "expires": now + capacity / rate,
+        }
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(sql, params)
+            allowed, tokens = cursor.fetchone()
+        return allowed, tokens
+
+    def increment(self, key, ttl, amount=1):
+        """
+        Plain counter (no refill) in the same table: add `amount` and return
+        the new total. amount=0 only peeks. The row expires `ttl` seconds
+        after the last increment.
+        """
+        now = time.time()
+        sql = f"""
+            INSERT INTO {self.table} AS b (key, tokens, updated_at, expires_at, allowed)
+            VALUES (%(key)s, %(amount)s, %(now)s, %(expires)s, TRUE)
+            ON CONFLICT (key) DO UPDATE SET
+                tokens = b.tokens + %(amount)s,
+                updated_at = CASE WHEN %(amount)s > 0 THEN %(now)s ELSE b.updated_at END,
+                expires_at = CASE WHEN %(amount)s > 0 THEN %(expires)s ELSE b.expires_at END
+            RETURNING tokens
+        """
+        params = {"key": key, "amount": float(amount), "now": now, "expires": now + ttl}
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(sql, params)
+            (total,) = cursor.fetchone()
+        return int(total)
+
+    def reset(self, key):
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE key = %s", [key])
+
+    def sweep(self, now=None):
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE expires_at < %s", [now or time.time()])
+            return cursor.rowcount
+
+
+_REDIS_CONSUME = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local now = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - ts, 0) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBucketStore:
+    """Same buckets in Redis; keys expire on their own."""
+
+    def __init__(self, url, prefix="ratelimit:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImproperlyConfigured("RATE_LIMIT_BACKEND=redis needs the `redis` package") from e
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.script = self.client.register_script(_REDIS_CONSUME)
+
+    def consume(self, key, capacity, rate, cost=1):
+        allowed, tokens = self.script(
+            keys=[self.prefix + key],
+            args=[capacity, rate, cost, time.time()],
+        )
+        return bool(allowed), float(tokens)
+
+    def increment(self, key, ttl, amount=1):
+        name = self.prefix + key
+        if not amount:
+            return int(self.client.get(name) or 0)
+        pipe = self.client.pipeline()
+        pipe.incrby(name, amount)
+        pipe.expire(name, int(ttl))
+        total, _ = pipe.execute()
+        return int(total)
+
+    def reset(self, key):
+        self.client.delete(self.prefix + key)
+
+    def sweep(self, now=None):
+        return 0
+
+
+@lru_cache(maxsize=None)
+def _store_for(backend, redis_url):
+    if backend == "db":
+        return DatabaseBucketStore()
+    if backend == "redis":
+        return RedisBucketStore(redis_url)
+    raise ImproperlyConfigured(f"Unknown RATE_LIMIT_BACKEND: {backend}")
+
+
+def get_store():
+    return _store_for(
+        getattr(settings, "RATE_LIMIT_BACKEND", "db"),
+        getattr(settings, "RATE_LIMIT_REDIS_URL", ""),
+    )
+
+
+# --------------------------------------------------
+# THROTTLES
+# --------------------------------------------------
+
+def endpoint_class(view):
+    return getattr(view, "throttle_scope", None) or type(view).__name__
+
+
+def _authenticated_user(request):
+    # Plain (async) Django views have no DRF authentication step
+    user = getattr(request, "user", None)
+    return user if user is not None and user.is_authenticated else None
+
+
+def rate_for(scope, endpoint):
+    rates = getattr(settings, "RATE_LIMITS", {})
+    rate = rates.get(f"{scope}.{endpoint}", rates.get(scope))
+    return parse_rate(rate)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Base class: subclasses set `scope` and return an identity (or None to skip)."""
+
+    scope = None
+
+    def get_identity(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        self._wait = None
+        identity = self.get_identity(request, view)
+        if identity is None:
+            return True
+
+        endpoint = endpoint_class(view)
+        capacity, period = rate_for(self.scope, endpoint)
+        if capacity is None:
+            return True
+
+        rate = capacity / period
+        allowed, tokens = get_store().consume(f"{self.scope}:{endpoint}:{identity}", capacity, rate)
+        if not allowed:
+            self._wait = (1 - tokens) / rate
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+class PublicTokenThrottle(TokenBucketThrottle):
+    scope = "public_token"
+
+    def get_identity(self, request, view):
+        from apps.clinical_ops.models_public_token import PublicAccessToken
+
+        token = getattr(view, "kwargs", {}).get("token")
+        if not token:
+            return None
+        # Same digest as PublicAccessToken.token_hash
+        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        order_id = (
+            PublicAccessToken.objects.filter(token_hash=token_hash)
+            .values_list("order_id", flat=True)
+            .first()
+        )
+        return f"order:{order_id}" if order_id else f"token:{token_hash}"
+
+
+class ClientIPThrottle(TokenBucketThrottle):
+    scope = "ip"
+
+    def get_identity(self, request, view):
+        if _authenticated_user(request):
+            return None
+        return self.get_ident(request)
+
+
+class UserThrottle(TokenBucketThrottle):
+    scope = "user"
+
+    def get_identity(self, request, view):
+        user = _authenticated_user(request)
+        return user.pk if user else None
+
+
+class OrgThrottle(TokenBucketThrottle):
+    scope = "org"
+
+    def get_identity(self, request, view):
+        user = _authenticated_user(request)
+        profile = getattr(user, "profile", None)
+        return getattr(profile, "organization_id", None)
@@ -0,0 +1,20 @@
+from common.db_router import routing_scope
+from common.middleware_base import HybridMiddleware
+
+
+class ReplicaPinningMiddleware(HybridMiddleware):
+    """
+    Gives every request its own primary/replica routing state, so a
+    write pins only the request that made it (see common/db_router.py).
+    """
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with routing_scope():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        # ContextVars: sync_to_async DB calls inherit (and report back) the state
+        with routing_scope():
+            return await self.get_response(request)
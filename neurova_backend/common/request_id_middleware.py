@@ -1,6 +1,9 @@
 import uuid
 
-class RequestIDMiddleware:
+from common.middleware_base import HybridMiddleware
+
+
+class RequestIDMiddleware(HybridMiddleware):
     """
     Adds X-Request-ID to every request/response.
     Also attaches request_id on request for logging and error capture.
@@ -8,13 +11,22 @@ class RequestIDMiddleware:
     HEADER = "HTTP_X_REQUEST_ID"
     RESPONSE_HEADER = "X-Request-ID"
 
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
+    def _assign(self, request):
         rid = request.META.get(self.HEADER) or str(uuid.uuid4())
         request.id = rid                 
         request.request_id = rid         
+        return rid
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        rid = self._assign(request)
         response = self.get_response(request)
         response[self.RESPONSE_HEADER] = rid
-        return response
\ No newline at end of file
+        return response
+
+    async def __acall__(self, request):
+        rid = self._assign(request)
+        response = await self.get_response(request)
+        response[self.RESPONSE_HEADER] = rid
+        return response
@@ -1,15 +1,19 @@
+from common.middleware_base import HybridMiddleware
 from common.versioning import engine_version, report_schema_version
 
 
-class VersionStampMiddleware:
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
-        response = self.get_response(request)
-
+class VersionStampMiddleware(HybridMiddleware):
+    def _stamp(self, response):
         if hasattr(response, "data") and isinstance(response.data, dict):
             response.data.setdefault("engine_version", engine_version())
             response.data.setdefault("report_schema_version", report_schema_version())
 
         return response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self._stamp(self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._stamp(await self.get_response(request))
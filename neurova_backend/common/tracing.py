@@ -0,0 +1,234 @@
+"""
+Lightweight request tracing.
+
+    from common.tracing import span
+
+    @span("compute_quality")
+    def compute_quality(...): ...
+
+    with span("db_write", order_id=order.id):
+        ...
+
+TracingMiddleware opens a root span per request whose trace id is the
+X-Request-ID set by RequestIDMiddleware; spans opened while handling the
+request (same thread, or a copied context) become its children. Code
+running outside a request (management commands) starts its own trace.
+metrics.timed stages open a span of the same name.
+
+A trace is kept or dropped as a whole, decided when its root starts
+(TRACING_SAMPLE_RATE), and handed to the exporter when the root ends:
+
+    TRACING_EXPORTER=""      off (default); span() costs a ContextVar read
+    TRACING_EXPORTER=jsonl   one JSON object per span in TRACING_JSONL_PATH
+    TRACING_EXPORTER=otlp    OTLP/HTTP JSON POSTed to TRACING_OTLP_ENDPOINT
+                             from a background thread
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import secrets
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from functools import lru_cache
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "neurova-backend"
+
+_current = ContextVar("tracing_span", default=None)
+
+
+class _Trace:
+    def __init__(self, trace_id, request_id, sampled):
+        self.trace_id = trace_id
+        self.request_id = request_id
+        self.sampled = sampled
+        self.spans = []
+        self.lock = threading.Lock()
+
+
+def _trace_id(request_id):
+    """32-hex trace id; a uuid4 X-Request-ID maps onto itself."""
+    if request_id:
+        compact = request_id.replace("-", "").lower()
+        if len(compact) == 32 and all(c in "0123456789abcdef" for c in compact):
+            return compact
+        return hashlib.sha256(request_id.encode()).hexdigest()[:32]
+    return secrets.token_hex(16)
+
+
+class span(ContextDecorator):
+    """
+    Time a block or function as a child of the current span.
+    request_id only applies to a root span (it becomes the trace id).
+    """
+
+    def __init__(self, name, request_id=None, **attributes):
+        self.name = name
+        self.request_id = request_id
+        self.attributes = attributes
+        self._token = None
+
+    def _recreate_cm(self):
+        # A decorated function can run in several threads at once
+        return type(self)(self.name, self.request_id, **self.attributes)
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def __enter__(self):
+        # Also used from scripts that never configure Django (crypto_utils)
+        if not settings.configured or not getattr(settings, "TRACING_EXPORTER", ""):
+            return self
+
+        parent = _current.get()
+        if parent is None:
+            self.trace = _Trace(
+                _trace_id(self.request_id),
+                self.request_id,
+                sampled=random.random() < getattr(settings, "TRACING_SAMPLE_RATE", 1.0),
+            )
+            self.parent_id = None
+        else:
+            self.trace = parent.trace
+            self.parent_id = parent.span_id
+        self.span_id = secrets.token_hex(8)
+        self.start_ns = time.time_ns()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._token is None:
+            return False
+        _current.reset(self._token)
+        self._token = None
+
+        trace = self.trace
+        if trace.sampled:
+            record = {
+                "trace_id": trace.trace_id,
+                "span_id": self.span_id,
+                "parent_id": self.parent_id,
+                "name": self.name,
+                "start_ns": self.start_ns,
+                "end_ns": time.time_ns(),
+                "status": "error" if exc_type else "ok",
+                "attributes": dict(self.attributes),
+            }
+            if trace.request_id:
+                record["request_id"] = trace.request_id
+            if exc_type:
+                record["attributes"]["error.type"] = exc_type.__name__
+            with trace.lock:
+                trace.spans.append(record)
+            if self.parent_id is None:
+                _export(trace.spans)
+        return False
+
+
+def current_span():
+    return _current.get()
+
+
+# --------------------------------------------------
+# EXPORTERS
+# --------------------------------------------------
+
+class JsonlExporter:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def export(self, spans):
+        lines = "".join(json.dumps(s, default=str) + "\n" for s in spans)
+        with self.lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans):
+    """OTLP/HTTP JSON body (ExportTraceServiceRequest) for one trace."""
+    otlp_spans = []
+    for s in spans:
+        attributes = dict(s["attributes"])
+        if s.get("request_id"):
+            attributes["request_id"] = s["request_id"]
+        otlp_spans.append({
+            "traceId": s["trace_id"],
+            "spanId": s["span_id"],
+            "parentSpanId": s["parent_id"] or "",
+            "name": s["name"],
+            "kind": 2 if s["parent_id"] is None else 1,  # SERVER / INTERNAL
+            "startTimeUnixNano": str(s["start_ns"]),
+            "endTimeUnixNano": str(s["end_ns"]),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items()],
+            "status": {"code": 2 if s["status"] == "error" else 1},
+        })
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "common.tracing"}, "spans": otlp_spans}],
+        }]
+    }
+
+
+class OtlpExporter:
+    def __init__(self, endpoint, timeout=2):
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trace-export")
+
+    def _post(self, body):
+        req = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(body).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            urllib.request.urlopen(req, timeout=self.timeout).close()
+        except Exception as e:
+            logger.warning(f"Trace export to {self.endpoint} failed: {e}")
+
+    def export(self, spans):
+        self.pool.submit(self._post, to_otlp(spans))
+
+
+@lru_cache(maxsize=None)
+def _exporter_for(kind, path, endpoint):
+    if kind == "jsonl":
+        return JsonlExporter(path)
+    if kind == "otlp":
+        return OtlpExporter(endpoint)
+    raise ValueError(f"Unknown TRACING_EXPORTER: {kind}")
+
+
+def _export(spans):
+    try:
+        _exporter_for(
+            settings.TRACING_EXPORTER,
+            getattr(settings, "TRACING_JSONL_PATH", ""),
+            getattr(settings, "TRACING_OTLP_ENDPOINT", ""),
+        ).export(spans)
+    except Exception as e:
+        # Never break a request because of tracing
+        logger.warning(f"Trace export failed: {e}")
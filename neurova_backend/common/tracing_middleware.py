@@ -0,0 +1,33 @@
+from common.metrics import route_of
+from common.middleware_base import HybridMiddleware
+from common.tracing import span
+
+
+class TracingMiddleware(HybridMiddleware):
+    """
+    Opens the root span of each request (common/tracing.py), keyed by the
+    X-Request-ID from RequestIDMiddleware, which must run first.
+    """
+
+    def _root(self, request):
+        return span(
+            "http.request",
+            request_id=getattr(request, "request_id", None),
+            method=request.method,
+        )
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with self._root(request) as root:
+            response = self.get_response(request)
+            root.set_attribute("route", route_of(request))
+            root.set_attribute("status", response.status_code)
+        return response
+
+    async def __acall__(self, request):
+        with self._root(request) as root:
+            response = await self.get_response(request)
+            root.set_attribute("route", route_of(request))
+            root.set_attribute("status", response.status_code)
+        return response
@@ -1,5 +1,10 @@
-from django.http import JsonResponse
-from django.db import connection
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.db import connection, connections
+from common.db_pool import pool_stats
+from common.metrics import render_latest
 from common.versioning import engine_version, report_schema_version
 
 
@@ -14,8 +19,27 @@ def readyz(request):
         return JsonResponse({
             "status": "ready",
             "db": "ok",
+            "db_pool": {alias: pool_stats(alias) for alias in connections},
             "engine_version": engine_version(),
             "report_schema_version": report_schema_version(),
         })
     except Exception:
         return JsonResponse({"status": "not_ready"}, status=503)
+
+
+def metrics(request):
+    """
+    Prometheus scrape endpoint; requires METRICS_TOKEN as a bearer token.
+    Without a token it is only served when DEBUG is on, otherwise 503.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponse(status=503)
+    else:
+        supplied = request.META.get("HTTP_AUTHORIZATION", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(supplied, token):
+            return HttpResponse(status=401)
+
+    body, content_type = render_latest()
+    return HttpResponse(body, content_type=content_type)
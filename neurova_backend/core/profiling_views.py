@@ -0,0 +1,18 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import FileResponse, Http404, JsonResponse
+
+from common.profiling import list_profiles, profile_path
+
+
+@staff_member_required
+def profile_list(request):
+    """Stored request profiles (common/profiling.py), newest first."""
+    return JsonResponse({"success": True, "message": "Profiles", "data": list_profiles()})
+
+
+@staff_member_required
+def profile_download(request, filename):
+    path = profile_path(filename)
+    if path is None:
+        raise Http404("Profile not found")
+    return FileResponse(open(path, "rb"), as_attachment=True, filename=filename, content_type="application/octet-stream")
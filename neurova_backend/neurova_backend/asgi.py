@@ -5,6 +5,19 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+High-concurrency patient traffic (camp events) runs here with the
+native async public endpoints:
+
+    ASYNC_PUBLIC_VIEWS=true uvicorn neurova_backend.asgi:application \
+        --workers 4 --host 0.0.0.0 --port 8001
+
+Staff (DRF) views still work under ASGI; Django runs them in a thread.
+The staff event stream (staff/events/stream, Server-Sent Events) is
+only served here.
+The custom middleware is async-capable, so public requests never leave
+the event loop except for DB / file work. Compare capacity against the
+WSGI deployment with scripts/bench_public_concurrency.py.
 """
 
 import os
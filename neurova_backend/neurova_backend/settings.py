@@ -19,6 +19,8 @@ import logging
 from datetime import datetime
 import sentry_sdk 
 
+from common.db_pool import configure_connections
+
 load_dotenv()
 
 class JsonLogFormatter(logging.Formatter):
@@ -108,7 +110,7 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "common.auth.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -121,17 +123,32 @@ REST_FRAMEWORK = {
     # Global exception handler (Step 3)
     "EXCEPTION_HANDLER": "common.api_exception_handler.neurova_exception_handler",
 
-    # Global rate limiting (Step 5A)
+    # Global rate limiting (Step 5A); shared token buckets, see common/rate_limit.py
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "common.rate_limit.ClientIPThrottle",
+        "common.rate_limit.UserThrottle",
+        "common.rate_limit.OrgThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {
-        "anon": "120/hour",
-        "user": "600/hour",
-    },
 }
 
+# Token-bucket rates per scope, optionally per endpoint class ("scope.throttle_scope")
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "db")  # "db" or "redis"
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+RATE_LIMITS = {
+    "ip": os.getenv("RATE_LIMIT_IP", "1200/hour"),  # loose: clinics share NAT; public_token is per order
+    "user": os.getenv("RATE_LIMIT_USER", "600/hour"),
+    "org": os.getenv("RATE_LIMIT_ORG", "6000/hour"),
+    "public_token": os.getenv("RATE_LIMIT_PUBLIC_TOKEN", "60/minute"),
+    "public_token.public_submit": "10/minute",
+    "public_token.public_report": "10/minute",
+    "user.event_stream": "30/minute",  # stream (re)connects
+}
+
+# Staff event stream fan-out (common/event_bus.py): "postgres" (LISTEN/NOTIFY) or "local"
+EVENT_BUS_BACKEND = os.getenv("EVENT_BUS_BACKEND", "postgres")
+EVENT_STREAM_HEARTBEAT_SECONDS = int(os.getenv("EVENT_STREAM_HEARTBEAT_SECONDS", "15"))
+EVENT_STREAM_MAX_QUEUE = 100  # per client; overflow sends a resync event
+
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60), # Set based on your security needs
@@ -152,6 +169,9 @@ SPECTACULAR_SETTINGS = {
 
 MIDDLEWARE = [
     "common.request_id_middleware.RequestIDMiddleware",
+    "common.tracing_middleware.TracingMiddleware",
+    "common.metrics_middleware.MetricsMiddleware",
+    "common.replica_middleware.ReplicaPinningMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -160,11 +180,15 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'common.response_middleware.VersionStampMiddleware',
+    "common.profiling_middleware.ProfilingMiddleware",
 
 ]
 
 ROOT_URLCONF = 'neurova_backend.urls'
 
+# Serve the public patient endpoints from async views (run under ASGI, see asgi.py)
+ASYNC_PUBLIC_VIEWS = os.getenv("ASYNC_PUBLIC_VIEWS", "false").lower() == "true"
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -198,19 +222,122 @@ DATABASES = {
     }
 }
 
+# Optional streaming replica for read-only views and reporting (common/db_router.py)
+if os.getenv("POSTGRES_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": os.getenv("POSTGRES_REPLICA_DB", DATABASES["default"]["NAME"]),
+        "HOST": os.getenv("POSTGRES_REPLICA_HOST"),
+        "PORT": os.getenv("POSTGRES_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["common.db_router.PrimaryReplicaRouter"]
+
+# Connection pooling per process (common/db_pool.py); falls back to persistent connections
+configure_connections(
+    DATABASES,
+    pool_enabled=os.getenv("DB_POOL_ENABLED", "true").lower() == "true",
+    min_size=int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+    max_size=int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+    timeout=float(os.getenv("DB_POOL_TIMEOUT", "10")),
+    max_idle=float(os.getenv("DB_POOL_MAX_IDLE", "600")),
+    max_lifetime=float(os.getenv("DB_POOL_MAX_LIFETIME", "3600")),
+    conn_max_age=int(os.getenv("DB_CONN_MAX_AGE", "60")),
+)
+
 STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
 
 if STORAGE_BACKEND == "s3":
-    DEFAULT_FILE_STORAGE = "storages.backends.s3boto3.S3Boto3Storage"
+    # Django 5.1+ ignores DEFAULT_FILE_STORAGE; STORAGES is authoritative
+    STORAGES = {
+        "default": {"BACKEND": "storages.backends.s3boto3.S3Boto3Storage"},
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    }
     AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
     AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
     AWS_STORAGE_BUCKET_NAME = os.getenv("AWS_STORAGE_BUCKET_NAME")
     AWS_S3_REGION_NAME = os.getenv("AWS_S3_REGION_NAME", "ap-south-1")
-    AWS_QUERYSTRING_AUTH = False
+    AWS_S3_ENDPOINT_URL = os.getenv("AWS_S3_ENDPOINT_URL")  # S3-compatible stand-in (e.g. MinIO)
+    AWS_S3_SIGNATURE_VERSION = "s3v4"
+    # Clinical files are private: every URL handed out must be signed
+    AWS_QUERYSTRING_AUTH = True
+    AWS_QUERYSTRING_EXPIRE = int(os.getenv("AWS_QUERYSTRING_EXPIRE", "300"))
+
+# How report PDFs leave the app (see apps/clinical_ops/services/report_delivery.py):
+#   stream    - Python worker streams the file (default for local storage)
+#   accel     - nginx X-Accel-Redirect to an internal location mapped to MEDIA_ROOT
+#   sendfile  - Apache/lighttpd X-Sendfile with the absolute file path
+#   presigned - redirect to a short-lived signed object URL (default for s3)
+REPORT_DELIVERY_BACKEND = os.getenv(
+    "REPORT_DELIVERY_BACKEND", "presigned" if STORAGE_BACKEND == "s3" else "stream"
+)
+REPORT_ACCEL_REDIRECT_PREFIX = os.getenv("REPORT_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+REPORT_PRESIGNED_URL_TTL_SECONDS = int(os.getenv("REPORT_PRESIGNED_URL_TTL_SECONDS", "60"))
+
+# Downloads trust a sweep_report_integrity verification this recent instead of re-hashing
+REPORT_INTEGRITY_TRUST_HOURS = int(os.getenv("REPORT_INTEGRITY_TRUST_HOURS", "24"))
 
 ENGINE_VERSION = os.getenv("ENGINE_VERSION", "v1.0.0")
 REPORT_SCHEMA_VERSION = os.getenv("REPORT_SCHEMA_VERSION", "v1")
 APP_VERSION = "1.0"  # Regulatory: Neurova Clinical Engine V1 version
+
+# Idempotent replay window for X-Idempotency-Key (see common/idempotency.py)
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+
+# Per-process OrgClinicalPolicy cache (backend/clinical/policies/services.py)
+POLICY_CACHE_TTL_SECONDS = int(os.getenv("POLICY_CACHE_TTL_SECONDS", "300"))
+
+# HMAC secret shared with kiosk tablets for offline sync batches. Must be its
+# own value: SECRET_KEY also signs staff JWTs. Unset = kiosk sync disabled (503).
+KIOSK_SYNC_SECRET = os.getenv("KIOSK_SYNC_SECRET", "")
+
+# Scheduled deletion runs only execute admin-APPROVED requests. Opt in to also
+# auto-approve SYSTEM retention requests (hard-deletes without an admin review).
+RETENTION_AUTO_APPROVE = os.getenv("RETENTION_AUTO_APPROVE", "false").lower() == "true"
+
+# Periodic maintenance jobs for `manage.py run_scheduler` (interval in seconds).
+# Each job runs on one node at a time; see apps/clinical_ops/services/scheduler.py
+MAINTENANCE_SCHEDULE = {
+    "retention_sweep": {"interval": 3600},
+    "execute_deletion_requests": {
+        "interval": 3600,
+        "args": ["--approve-system"] if RETENTION_AUTO_APPROVE else [],
+    },
+    "cleanup_expired_orders": {"interval": 900},
+    "sweep_idempotency_keys": {"interval": 3600},
+    "sweep_rate_limit_buckets": {"interval": 3600},
+    "seal_audit_log": {"interval": 300},
+    "process_print_batches": {"interval": 60},
+    "sweep_report_integrity": {"interval": 86400, "args": ["--max-age-hours", "24"]},
+    "refresh_pms_rollups": {"interval": 900},
+    "generate_pms_report": {"interval": 86400, "args": ["--no-refresh"]},
+}
+SCHEDULER_JITTER = float(os.getenv("SCHEDULER_JITTER", "0.1"))  # random extra delay, up to this fraction of the interval
+SCHEDULER_BACKOFF_BASE_SECONDS = int(os.getenv("SCHEDULER_BACKOFF_BASE_SECONDS", "60"))
+SCHEDULER_BACKOFF_MAX_SECONDS = int(os.getenv("SCHEDULER_BACKOFF_MAX_SECONDS", "3600"))
+
+# Bearer token required by /metrics/ (Prometheus scrape config); unset,
+# the endpoint is only served with DEBUG on
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Request tracing (common/tracing.py): "" (off), "jsonl" or "otlp"
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "")
+TRACING_SAMPLE_RATE = float(os.getenv("TRACING_SAMPLE_RATE", "1.0"))
+TRACING_JSONL_PATH = os.getenv("TRACING_JSONL_PATH", os.path.join(BASE_DIR, "logs", "traces.jsonl"))
+TRACING_OTLP_ENDPOINT = os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+
+# On-demand request profiling (common/profiling.py); never on public routes
+PROFILER_SECRET = os.getenv("PROFILER_SECRET", "")  # empty disables X-Profile-Signature
+PROFILER_SAMPLE_RATE = float(os.getenv("PROFILER_SAMPLE_RATE", "0.0"))
+PROFILER_DIR = os.getenv("PROFILER_DIR", os.path.join(BASE_DIR, "artifacts", "profiles"))
+PROFILER_MAX_PROFILES = int(os.getenv("PROFILER_MAX_PROFILES", "50"))
+
+# Output directory for generate_pms_report JSON/CSV artifacts
+PMS_REPORT_DIR = os.getenv("PMS_REPORT_DIR", os.path.join(BASE_DIR, "artifacts", "pms"))
+# Days after a quarter ends before it is frozen in PmsMetricSnapshot;
+# late results, sign-offs and rollup refreshes still land in this window
+PMS_SNAPSHOT_GRACE_DAYS = int(os.getenv("PMS_SNAPSHOT_GRACE_DAYS", "30"))
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # Password validation
@@ -286,8 +413,6 @@ LOGGING = {
 }
 
 
-import os
-import sentry_sdk
 from sentry_sdk.integrations.django import DjangoIntegration
 
 SENTRY_DSN = os.getenv("SENTRY_DSN", "")
@@ -297,15 +422,5 @@ if SENTRY_DSN:
         dsn=SENTRY_DSN,
         integrations=[DjangoIntegration()],
         send_default_pii=False,  # 🚫 no PHI
-        traces_sample_rate=0.0,
+        traces_sample_rate=float(os.getenv("SENTRY_TRACES_SAMPLE_RATE", "0.0")),
     )
-
-import sentry_sdk
-from sentry_sdk.integrations.django import DjangoIntegration
-
-sentry_sdk.init(
-    dsn=os.environ.get("SENTRY_DSN"),
-    integrations=[DjangoIntegration()],
-    traces_sample_rate=0.2,
-    send_default_pii=False,
-)
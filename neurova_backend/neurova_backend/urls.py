@@ -25,12 +25,15 @@ from common.auth.views import (
     AppTokenRefreshView,
     AppLogoutView,
 )
-from core.health import healthz, readyz
+from core.health import healthz, metrics, readyz
+from core.profiling_views import profile_download, profile_list
 from django.conf import settings
 from django.conf.urls.static import static
 
 
 urlpatterns = [
+    path("admin/profiles/", profile_list),
+    path("admin/profiles/<str:filename>", profile_download),
     path("admin/", admin.site.urls),
 
     path("api/v1/auth/login/", AppTokenObtainPairView.as_view()),
@@ -46,6 +49,7 @@ urlpatterns = [
     path("api/v1/clinical/", include("backend.clinical.urls")),
     path("healthz/", healthz),
     path("readyz/", readyz),
+    path("metrics/", metrics),
     path("api/v1/clinical-ops/", include("apps.clinical_ops.api.v1.urls"))
 ]
 
@@ -2,8 +2,10 @@ from django.utils.timezone import now
 from scoring.models import Score
 from safety.models import RedFlagEvent
 from reports.models import Report
+from common.tracing import span
 
 
+@span("build_report_json")
 def build_report_json(*, report: Report) -> dict:
     """
     Build CANONICAL report JSON.
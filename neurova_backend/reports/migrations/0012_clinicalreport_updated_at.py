@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0011_clinicalreport_pdf_sha256'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clinicalreport',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -125,6 +125,8 @@ class ClinicalReport(models.Model):
 
     report_json = models.JSONField()
     created_at = models.DateTimeField(auto_now_add=True)
+    # Last-Modified of the rendered PDF; writers using update_fields must include it
+    updated_at = models.DateTimeField(auto_now=True)
 
     is_frozen = models.BooleanField(default=True)
 
@@ -1,6 +1,7 @@
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.colors import black, grey, red
 from reportlab.pdfgen import canvas
+from common.metrics import timed
 
 PAGE_WIDTH, PAGE_HEIGHT = A4
 LEFT_MARGIN = 50
@@ -9,6 +10,7 @@ TOP_MARGIN = PAGE_HEIGHT - 50
 LINE_HEIGHT = 14
 
 
+@timed("pdf_render")
 def render_report_pdf(buffer, report_json):
     c = canvas.Canvas(buffer, pagesize=A4)
     y = TOP_MARGIN
@@ -264,6 +264,7 @@ class MarkReportReviewedView(APIView):
             "reviewed_by_role",
             "reviewed_at",
             "validation_status",
+            "updated_at",
         ])
 
         return Response(
@@ -0,0 +1,135 @@
+"""
+Concurrency benchmark for the public patient endpoints, WSGI vs ASGI.
+
+Usage:
+    python scripts/bench_public_concurrency.py --username staff1 --password secret \
+        --target wsgi=http://127.0.0.1:8000 --target asgi=http://127.0.0.1:8001 \
+        [--concurrency 50,100,200] [--battery-code MENTAL_HEALTH_CORE_V1] [--json-out bench.json]
+
+For every target and concurrency level N, staff first create N orders
+(untimed). Then N patients start together and each runs
+bootstrap -> consent -> questions; only those calls are timed. The
+summary lists p50/p95/p99, error rate and throughput per target and
+level, so the two deployments can be compared at the same load.
+
+Run both servers against the same database, e.g.
+
+    gunicorn neurova_backend.wsgi:application --workers 4 --bind :8000
+    ASYNC_PUBLIC_VIEWS=true uvicorn neurova_backend.asgi:application --workers 4 --port 8001
+
+All patients come from one address: start the servers with RATE_LIMIT_IP
+raised (e.g. RATE_LIMIT_IP=100000/hour) or the ip bucket turns the
+benchmark into a throttle test.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load_test import API, Client, Recorder, StepFailed, login, percentile, staff_create_order  # noqa: E402
+
+STEPS = (
+    ("patient.bootstrap", ""),
+    ("patient.consent", "/consent"),
+    ("patient.questions", "/questions"),
+)
+
+
+def patient_chain(client, token, barrier):
+    barrier.wait()
+    for step, suffix in STEPS:
+        resp, _ = client.call(step, "GET", f"{API}/public/order/{token}{suffix}")
+        token = resp.headers.get("X-Public-Token", token)
+
+
+def run_level(args, name, base_url, concurrency):
+    setup = Client(base_url, Recorder(), args.timeout, "neurova-bench/staff")
+    org_id = login(setup, args.username, args.password)
+    tokens = [staff_create_order(setup, org_id, args.battery_code, n)[1] for n in range(concurrency)]
+
+    recorder = Recorder()
+    barrier = threading.Barrier(concurrency + 1)
+
+    def journey(n, token):
+        client = Client(base_url, recorder, args.timeout, f"neurova-bench/{name}-{concurrency}-{n}")
+        try:
+            patient_chain(client, token, barrier)
+            recorder.journey(ok=True)
+        except StepFailed as e:
+            recorder.journey(ok=False)
+            if args.verbose:
+                print(f"{name} patient {n}: {e}", file=sys.stderr)
+
+    threads = [threading.Thread(target=journey, args=(n, t), daemon=True) for n, t in enumerate(tokens)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for t in threads:
+        t.join()
+    summary = recorder.summary(time.perf_counter() - started)
+    samples = sorted(v for values in recorder.latencies.values() for v in values)
+    errors = sum(recorder.errors.values())
+    summary.update({
+        "target": name,
+        "concurrency": concurrency,
+        "error_rate_pct": round(errors / len(samples) * 100, 2) if samples else 0.0,
+        "p50_ms": percentile(samples, 50),
+        "p95_ms": percentile(samples, 95),
+        "p99_ms": percentile(samples, 99),
+    })
+    return summary
+
+
+def render(results):
+    lines = [
+        f"{'target':<10}{'conc':>6}{'req':>7}{'err%':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}",
+        "-" * 70,
+    ]
+    for r in results:
+        lines.append(
+            f"{r['target']:<10}{r['concurrency']:>6}{r['requests']:>7}{r['error_rate_pct']:>7}"
+            f"{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{r['requests_per_second']:>10}"
+        )
+    return "\n".join(lines)
+
+
+def parse_target(value):
+    name, sep, url = value.partition("=")
+    if not sep or not name or not url:
+        raise argparse.ArgumentTypeError("expected name=url")
+    return name, url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare public endpoint latency under concurrency.")
+    parser.add_argument("--target", type=parse_target, action="append", required=True,
+                        help="name=base_url; repeat for each deployment")
+    parser.add_argument("--username", required=True, help="Staff user with an organization profile")
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", default="50,100,200", help="Comma-separated concurrent patients")
+    parser.add_argument("--battery-code", default="MENTAL_HEALTH_CORE_V1")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--json-out", help="Also write the results as JSON here")
+    parser.add_argument("--verbose", action="store_true", help="Print failed patients")
+    args = parser.parse_args()
+
+    levels = [int(n) for n in args.concurrency.split(",") if n.strip()]
+    results = [
+        run_level(args, name, url, n)
+        for n in levels
+        for name, url in args.target
+    ]
+    print(render(results))
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
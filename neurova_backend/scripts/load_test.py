@@ -0,0 +1,361 @@
+"""
+Load test for the patient and staff flows against a running server.
+
+Usage:
+    python scripts/load_test.py --username staff1 --password secret \
+        --patients 50 --staff 4 --patient-rate 2 [--base-url http://127.0.0.1:8000] \
+        [--battery-code MENTAL_HEALTH_CORE_V1] [--json-out load.json]
+
+Staff users (--staff threads sharing one staff login) work a shared
+queue: they create a patient and an order for every arriving patient,
+and for every submitted assessment they generate the report and deliver
+it for patient download. Between jobs they poll the clinic queue and
+the inbox every --poll-interval seconds.
+
+Patients arrive as a Poisson process at --patient-rate per second. Each
+one runs bootstrap -> consent -> consent submit -> questions -> submit,
+waits for delivery, then access-code -> report download. Payloads use
+the real AES envelope and follow X-Public-Token rotation; every patient
+has its own User-Agent because tokens bind to the first device.
+
+The summary lists p50/p95/p99 latency and error rate per step, plus
+request and completed-journey throughput.
+"""
+
+import argparse
+import json
+import math
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.crypto_utils import decrypt_data, encrypt_data  # noqa: E402
+
+API = "/api/v1/clinical-ops"
+
+
+# --------------------------------------------------
+# STATS
+# --------------------------------------------------
+
+class StepFailed(Exception):
+    pass
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+        self.journeys = 0
+        self.failed_journeys = 0
+
+    def record(self, step, seconds, ok):
+        with self.lock:
+            self.latencies.setdefault(step, []).append(seconds)
+            self.errors.setdefault(step, 0)
+            if not ok:
+                self.errors[step] += 1
+
+    def journey(self, ok):
+        with self.lock:
+            if ok:
+                self.journeys += 1
+            else:
+                self.failed_journeys += 1
+
+    def summary(self, elapsed):
+        steps = []
+        for step, values in self.latencies.items():
+            values = sorted(values)
+            steps.append({
+                "step": step,
+                "count": len(values),
+                "errors": self.errors[step],
+                "error_rate_pct": round(self.errors[step] / len(values) * 100, 2),
+                "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95),
+                "p99_ms": percentile(values, 99),
+                "max_ms": round(values[-1] * 1000, 1),
+            })
+        requests_total = sum(s["count"] for s in steps)
+        return {
+            "elapsed_seconds": round(elapsed, 2),
+            "requests": requests_total,
+            "requests_per_second": round(requests_total / elapsed, 2) if elapsed else 0.0,
+            "journeys_completed": self.journeys,
+            "journeys_failed": self.failed_journeys,
+            "journeys_per_minute": round(self.journeys / elapsed * 60, 2) if elapsed else 0.0,
+            "steps": steps,
+        }
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile in milliseconds."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return round(sorted_values[rank - 1] * 1000, 1)
+
+
+def render_summary(summary):
+    lines = [
+        f"{'step':<24}{'count':>7}{'err%':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}",
+        "-" * 78,
+    ]
+    for s in summary["steps"]:
+        lines.append(
+            f"{s['step']:<24}{s['count']:>7}{s['error_rate_pct']:>7}"
+            f"{s['p50_ms']:>10}{s['p95_ms']:>10}{s['p99_ms']:>10}{s['max_ms']:>10}"
+        )
+    lines += [
+        "-" * 78,
+        f"Elapsed: {summary['elapsed_seconds']} s | Requests: {summary['requests']} "
+        f"({summary['requests_per_second']} req/s)",
+        f"Journeys: {summary['journeys_completed']} completed, {summary['journeys_failed']} failed "
+        f"({summary['journeys_per_minute']} per minute)",
+    ]
+    return "\n".join(lines)
+
+
+# --------------------------------------------------
+# HTTP
+# --------------------------------------------------
+
+class Client:
+    def __init__(self, base_url, recorder, timeout, user_agent):
+        self.base_url = base_url.rstrip("/")
+        self.recorder = recorder
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+
+    def call(self, step, method, path, payload=None, expect=(200,), **kwargs):
+        """Send one request; returns (response, data) or raises StepFailed."""
+        if payload is not None:
+            kwargs["json"] = {"encrypted_data": encrypt_data(payload)}
+        started = time.perf_counter()
+        try:
+            resp = self.session.request(method, self.base_url + path, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            self.recorder.record(step, time.perf_counter() - started, ok=False)
+            raise StepFailed(f"{step}: {e}")
+        ok = resp.status_code in expect
+        self.recorder.record(step, time.perf_counter() - started, ok=ok)
+        if not ok:
+            try:
+                message = resp.json().get("message", "")
+            except ValueError:
+                message = ""
+            raise StepFailed(f"{step}: HTTP {resp.status_code} {message}".rstrip())
+        return resp, self._data(resp)
+
+    @staticmethod
+    def _data(resp):
+        if "application/json" not in resp.headers.get("Content-Type", ""):
+            return None
+        body = resp.json()
+        if isinstance(body, dict) and "encrypted_data" in body:
+            return decrypt_data(body["encrypted_data"])
+        return body.get("data") if isinstance(body, dict) else body
+
+
+# --------------------------------------------------
+# STAFF
+# --------------------------------------------------
+
+def login(client, username, password):
+    _, data = client.call("staff.login", "POST", "/api/v1/auth/login/", {"username": username, "password": password})
+    client.session.headers["Authorization"] = f"Bearer {data['access_token']}"
+    return data["org_id"]
+
+
+def staff_create_order(client, org_id, battery_code, n):
+    _, patient = client.call("staff.create_patient", "POST", f"{API}/staff/patients/create", {
+        "org_id": org_id,
+        "full_name": f"Load Test Patient {n}",
+        "age": random.randint(18, 80),
+        "sex": random.choice(["MALE", "FEMALE"]),
+        "phone": f"9{random.randint(100000000, 999999999)}",
+        "email": f"loadtest{n}@example.com",
+    }, expect=(201,))
+    _, order = client.call("staff.create_order", "POST", f"{API}/staff/orders/create", {
+        "org_id": org_id,
+        "patient_id": patient["patient_id"],
+        "battery_code": battery_code,
+        "administration_mode": "QR_PHONE",
+    }, expect=(201,))
+    return order["order_id"], order["public_token"]
+
+
+def staff_review(client, org_id, order_id):
+    client.call("staff.generate_report", "POST", f"{API}/staff/reports/generate",
+                {"org_id": org_id, "order_id": order_id},
+                headers={"X-Idempotency-Key": str(uuid.uuid4())})
+    client.call("staff.deliver", "POST", f"{API}/staff/orders/deliver",
+                {"order_id": order_id, "delivery_mode": "ALLOW_PATIENT_DOWNLOAD"},
+                headers={"X-Idempotency-Key": str(uuid.uuid4())})
+
+
+def staff_worker(args, auth_headers, org_id, jobs, recorder, stop):
+    client = Client(args.base_url, recorder, args.timeout, "neurova-loadtest/staff")
+    client.session.headers.update(auth_headers)
+    last_poll = 0.0
+    while not stop.is_set():
+        if time.monotonic() - last_poll >= args.poll_interval:
+            last_poll = time.monotonic()
+            for step, path in (("staff.queue", "/staff/queue"), ("staff.inbox", "/staff/inbox")):
+                try:
+                    client.call(step, "GET", API + path)
+                except StepFailed:
+                    pass
+        try:
+            kind, payload, reply = jobs.get(timeout=0.2)
+        except queue.Empty:
+            continue
+        try:
+            if kind == "create":
+                reply.put(staff_create_order(client, org_id, args.battery_code, payload))
+            else:
+                staff_review(client, org_id, payload)
+                reply.put(True)
+        except StepFailed as e:
+            reply.put(e)
+
+
+# --------------------------------------------------
+# PATIENT
+# --------------------------------------------------
+
+def _answers(questions_payload):
+    answers = []
+    for test in questions_payload.get("tests", []):
+        for question in test.get("questions", []):
+            answers.append({"question_id": question.get("id"), "value": random.randint(0, 3)})
+    return answers
+
+
+def _await(reply, timeout, what):
+    try:
+        result = reply.get(timeout=timeout)
+    except queue.Empty:
+        raise StepFailed(f"timed out waiting for {what}")
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def patient_journey(args, n, jobs, recorder):
+    client = Client(args.base_url, recorder, args.timeout, f"neurova-loadtest/patient-{n}")
+    reply = queue.Queue()
+
+    jobs.put(("create", n, reply))
+    order_id, token = _await(reply, args.wait_timeout, "order creation")
+
+    def public(step, method, suffix="", payload=None, **kwargs):
+        nonlocal token
+        resp, data = client.call(step, method, f"{API}/public/order/{token}{suffix}", payload, **kwargs)
+        token = resp.headers.get("X-Public-Token", token)
+        return data
+
+    public("patient.bootstrap", "GET")
+    public("patient.consent", "GET", "/consent")
+    public("patient.consent_submit", "POST", "/consent/submit", {
+        "consent_version": "V1",
+        "consent_given_by": "SELF",
+        "allow_patient_copy": True,
+        "consent_language": "en",
+    })
+    questions = public("patient.questions", "GET", "/questions")
+    public("patient.submit", "POST", "/submit", {
+        "answers": _answers(questions) or [{"question_id": "phq9_1", "value": 1}],
+        "duration_seconds": random.randint(120, 600),
+    })
+
+    jobs.put(("review", order_id, reply))
+    _await(reply, args.wait_timeout, "report delivery")
+
+    code = public("patient.access_code", "POST", "/report/access-code")["access_code"]
+    public("patient.download", "GET", "/report.pdf", params={"code": code})
+
+
+# --------------------------------------------------
+# MAIN
+# --------------------------------------------------
+
+def run(args):
+    recorder = Recorder()
+    jobs = queue.Queue()
+    stop = threading.Event()
+
+    admin = Client(args.base_url, recorder, args.timeout, "neurova-loadtest/staff")
+    org_id = login(admin, args.username, args.password)
+    auth_headers = {"Authorization": admin.session.headers["Authorization"]}
+
+    staff = [
+        threading.Thread(target=staff_worker, args=(args, auth_headers, org_id, jobs, recorder, stop), daemon=True)
+        for _ in range(args.staff)
+    ]
+    for t in staff:
+        t.start()
+
+    def journey(n):
+        try:
+            patient_journey(args, n, jobs, recorder)
+            recorder.journey(ok=True)
+        except StepFailed as e:
+            recorder.journey(ok=False)
+            if args.verbose:
+                print(f"patient {n}: {e}", file=sys.stderr)
+
+    started = time.perf_counter()
+    patients = []
+    for n in range(args.patients):
+        t = threading.Thread(target=journey, args=(n,), daemon=True)
+        t.start()
+        patients.append(t)
+        if args.patient_rate > 0:
+            time.sleep(random.expovariate(args.patient_rate))
+    for t in patients:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    for t in staff:
+        t.join(timeout=args.timeout)
+    return recorder.summary(elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the patient and staff flows.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--username", required=True, help="Staff user with an organization profile")
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--patients", type=int, default=20, help="Total patient journeys")
+    parser.add_argument("--staff", type=int, default=2, help="Concurrent staff users")
+    parser.add_argument("--patient-rate", type=float, default=1.0, help="Patient arrivals per second (0 = all at once)")
+    parser.add_argument("--poll-interval", type=float, default=5.0, help="Seconds between staff queue/inbox polls")
+    parser.add_argument("--battery-code", default="MENTAL_HEALTH_CORE_V1")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--wait-timeout", type=float, default=120.0, help="Max wait for staff actions")
+    parser.add_argument("--json-out", help="Also write the summary as JSON here")
+    parser.add_argument("--verbose", action="store_true", help="Print failed journeys")
+    args = parser.parse_args()
+
+    summary = run(args)
+    print(render_summary(summary))
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
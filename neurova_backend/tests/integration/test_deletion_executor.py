@@ -0,0 +1,107 @@
+import os
+import time
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+
+from core.models import Organization
+from apps.clinical_ops.models import AssessmentOrder, Patient
+from apps.clinical_ops.audit.models import AuditEvent
+from apps.clinical_ops.models_deletion import DeletionRequest
+from apps.clinical_ops.models_print_batch import PrintBatch
+from apps.clinical_ops.models_report import AssessmentReport
+from apps.clinical_ops.services.deletion_executor import execute_deletion
+
+
+@pytest.fixture
+def org_patient(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    org = Organization.objects.create(name="Del Org", code="DEL_ORG", org_type="HOSPITAL")
+    patient = Patient.objects.create(org=org, full_name="Del Patient", age=50, sex="MALE")
+    return org, patient
+
+
+def _order_with_report(org, patient):
+    order = AssessmentOrder.objects.create(org=org, patient=patient, battery_code="ANX_SCREEN_V1")
+    report = AssessmentReport.objects.create(org=org, order=order)
+    report.pdf_file.save("r.pdf", ContentFile(b"%PDF-1.4 test"))
+    return order, report.pdf_file.name
+
+
+@pytest.mark.django_db
+def test_batched_deletion_purges_files_and_audits_per_order(org_patient, django_capture_on_commit_callbacks):
+    org, patient = org_patient
+    created = [_order_with_report(org, patient) for _ in range(5)]
+    for order, _ in created:
+        DeletionRequest.objects.create(org=org, order=order, requested_by="SYSTEM", reason="Retention")
+    pending = DeletionRequest.objects.create(
+        org=org, order=_order_with_report(org, patient)[0], requested_by="PATIENT", reason="Asked"
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("execute_deletion_requests", "--batch-size", "2", "--approve-system")
+
+    for order, name in created:
+        order.refresh_from_db()
+        assert order.deletion_status == "DELETED"
+        assert not default_storage.exists(name)
+
+    assert AssessmentReport.objects.filter(order_id__in=[o.id for o, _ in created]).count() == 0
+    assert DeletionRequest.objects.filter(status="EXECUTED").count() == 5
+    pending.refresh_from_db()
+    assert pending.status == "REQUESTED"
+
+    events = AuditEvent.objects.filter(event_type="DATA_DELETION_EXECUTED", entity_type="AssessmentOrder")
+    assert sorted(events.values_list("entity_id", flat=True)) == sorted(str(o.id) for o, _ in created)
+
+
+@pytest.mark.django_db
+def test_deletion_purges_print_batches_containing_the_order(org_patient, django_capture_on_commit_callbacks):
+    org, patient = org_patient
+    (deleted, _), (kept, _) = _order_with_report(org, patient), _order_with_report(org, patient)
+    hit = PrintBatch.objects.create(org=org, status=PrintBatch.STATUS_COMPLETED, printed_order_ids=[deleted.id, kept.id])
+    hit.merged_file.save("hit.pdf", ContentFile(b"%PDF-1.4 merged"))
+    other = PrintBatch.objects.create(org=org, status=PrintBatch.STATUS_COMPLETED, printed_order_ids=[kept.id])
+    other.merged_file.save("other.pdf", ContentFile(b"%PDF-1.4 merged"))
+    # Batches from before printed_order_ids: matched on their selection
+    legacy_hit = PrintBatch.objects.create(org=org, status=PrintBatch.STATUS_COMPLETED, order_ids=[deleted.id])
+    legacy_hit.merged_file.save("legacy_hit.pdf", ContentFile(b"%PDF-1.4 merged"))
+    legacy_other = PrintBatch.objects.create(org=org, status=PrintBatch.STATUS_COMPLETED, order_ids=[kept.id])
+    legacy_other.merged_file.save("legacy_other.pdf", ContentFile(b"%PDF-1.4 merged"))
+    hit_file = hit.merged_file.name
+    dr = DeletionRequest.objects.create(org=org, order=deleted, requested_by="PATIENT", reason="Asked", status="APPROVED")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        execute_deletion(dr)
+
+    hit.refresh_from_db()
+    other.refresh_from_db()
+    assert hit.status == PrintBatch.STATUS_PURGED and not hit.merged_file
+    assert not default_storage.exists(hit_file)
+    assert other.status == PrintBatch.STATUS_COMPLETED and default_storage.exists(other.merged_file.name)
+    assert set(PrintBatch.objects.filter(status=PrintBatch.STATUS_PURGED).values_list("id", flat=True)) == {
+        hit.id, legacy_hit.id
+    }
+    assert PrintBatch.objects.get(pk=legacy_other.pk).status == PrintBatch.STATUS_COMPLETED
+    assert AuditEvent.objects.filter(
+        event_type="DATA_DELETION_EXECUTED", entity_type="AssessmentOrder", entity_id=str(deleted.id)
+    ).exists()
+
+
+@pytest.mark.django_db
+def test_reconcile_deletes_only_old_orphans(org_patient):
+    org, patient = org_patient
+    _, kept = _order_with_report(org, patient)
+    orphan = default_storage.save("clinical_reports/2020/01/01/orphan.pdf", ContentFile(b"x"))
+    fresh = default_storage.save("clinical_reports/2020/01/01/fresh.pdf", ContentFile(b"x"))
+
+    old = time.time() - 3 * 86400
+    os.utime(default_storage.path(orphan), (old, old))
+
+    call_command("reconcile_report_files", "--delete")
+
+    assert not default_storage.exists(orphan)
+    assert default_storage.exists(fresh)
+    assert default_storage.exists(kept)
@@ -0,0 +1,130 @@
+import asyncio
+import json
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth.models import User
+from django.test import AsyncRequestFactory, RequestFactory
+
+from apps.clinical_ops.api.v1.event_stream_views import ClinicalEventStream
+from apps.clinical_ops.models import AssessmentOrder, Patient
+from apps.clinical_ops.models_assessment import AssessmentResult
+from common import event_bus
+from common.auth.serializers import AppTokenObtainPairSerializer
+from common.crypto_utils import decrypt_data
+from core.models import Organization, UserProfile
+
+URL = "/api/v1/clinical-ops/staff/events/stream"
+
+
+def _org(code):
+    return Organization.objects.create(name=f"Org {code}", code=code, org_type="HOSPITAL")
+
+
+def _order(org):
+    patient = Patient.objects.create(org=org, full_name="Stream Patient", age=41, sex="FEMALE")
+    return AssessmentOrder.objects.create(org=org, patient=patient, battery_code="ANX_SCREEN_V1")
+
+
+def _red_flag_result(order):
+    return AssessmentResult.objects.create(
+        org=order.org,
+        order=order,
+        result_json={"summary": {"red_flags": ["SUICIDE_RISK"]}},
+        primary_severity="CRITICAL",
+        has_red_flags=True,
+    )
+
+
+@pytest.mark.django_db
+def test_red_flag_result_reaches_only_its_org(settings, django_capture_on_commit_callbacks):
+    settings.EVENT_BUS_BACKEND = "local"
+    org, other = _org("SSE_A"), _org("SSE_B")
+    order = _order(org)
+
+    def create():
+        with django_capture_on_commit_callbacks(execute=True):
+            _red_flag_result(order)
+
+    async def scenario():
+        mine = await event_bus.subscribe(org.id)
+        theirs = await event_bus.subscribe(other.id)
+        try:
+            await sync_to_async(create)()
+            message = await asyncio.wait_for(mine.get(), timeout=2)
+            return message, theirs.queue.empty()
+        finally:
+            event_bus.unsubscribe(mine)
+            event_bus.unsubscribe(theirs)
+
+    message, other_empty = async_to_sync(scenario)()
+
+    assert message["event"] == "red_flag"
+    assert message["data"]["order_id"] == order.id
+    assert message["data"]["red_flags"] == ["SUICIDE_RISK"]
+    assert other_empty
+
+
+@pytest.mark.django_db(transaction=True)
+def test_postgres_broker_fans_out_notify(settings):
+    settings.EVENT_BUS_BACKEND = "postgres"
+    org = _org("SSE_PG")
+    order = _order(org)
+
+    async def scenario():
+        subscription = await event_bus.subscribe(org.id)
+        try:
+            # Give the LISTEN connection time to subscribe before notifying
+            await asyncio.sleep(0.5)
+            order.status = AssessmentOrder.STATUS_DELIVERED
+            await sync_to_async(order.save)(update_fields=["status"])
+            return await asyncio.wait_for(subscription.get(), timeout=5)
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    message = async_to_sync(scenario)()
+
+    assert message["event"] == "order"
+    assert message["data"] == {
+        "order_id": order.id,
+        "status": AssessmentOrder.STATUS_DELIVERED,
+        "delivery_mode": order.delivery_mode,
+    }
+
+
+@pytest.mark.django_db
+def test_stream_sends_encrypted_events(settings):
+    settings.EVENT_BUS_BACKEND = "local"
+    org = _org("SSE_VIEW")
+    user = User.objects.create_user("clinician@sse.test", password="pass")
+    UserProfile.objects.create(user=user, organization=org, role="STAFF")
+    access = str(AppTokenObtainPairSerializer.get_token(user).access_token)
+
+    async def scenario():
+        factory = AsyncRequestFactory()
+        unauthenticated = await ClinicalEventStream.as_view()(factory.get(URL))
+
+        request = factory.get(URL, headers={"authorization": f"Bearer {access}"})
+        response = await ClinicalEventStream.as_view()(request)
+        chunks = aiter(response.streaming_content)
+        first = await anext(chunks)
+        event_bus.get_broker().publish({"org": str(org.id), "event": "report", "data": {"order_id": 7}})
+        second = await anext(chunks)
+        await chunks.aclose()
+        return unauthenticated, response, first, second
+
+    unauthenticated, response, first, second = async_to_sync(scenario)()
+
+    assert unauthenticated.status_code == 401
+    assert response["Content-Type"] == "text/event-stream"
+    assert first.startswith(b"retry:")
+    lines = second.decode().strip().split("\n")
+    assert lines[:2] == ["id: 1", "event: report"]
+    body = json.loads(lines[2].removeprefix("data: "))
+    assert decrypt_data(body["encrypted_data"]) == {"order_id": 7}
+    assert not event_bus.hub._subscribers
+
+    # Under WSGI a stream would pin a worker: refused
+    wsgi_request = RequestFactory().get(URL, HTTP_AUTHORIZATION=f"Bearer {access}")
+    wsgi = async_to_sync(ClinicalEventStream.as_view())(wsgi_request)
+    assert wsgi.status_code == 501
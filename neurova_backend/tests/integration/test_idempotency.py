@@ -0,0 +1,148 @@
+import pytest
+from datetime import timedelta
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory
+
+from core.models import Organization, UserProfile
+from apps.clinical_ops.models import AssessmentOrder, Patient
+from apps.clinical_ops.models_idempotency import IdempotencyRecord
+from apps.clinical_ops.models_public_token import PublicAccessToken
+from common.crypto_utils import encrypt_data
+from common.idempotency import _scope_for
+
+
+def _staff_client():
+    org = Organization.objects.create(name="Idem Org", code="IDEM_ORG", org_type="HOSPITAL")
+    user = User.objects.create_user("staff@idem.test", password="pass")
+    UserProfile.objects.create(user=user, organization=org, role="STAFF")
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client, org
+
+
+def _patient_payload(org, full_name="Retry Patient"):
+    return {
+        "encrypted_data": encrypt_data({
+            "org_id": str(org.external_id),
+            "full_name": full_name,
+            "age": 40,
+            "sex": "FEMALE",
+            "phone": "9876543210",
+            "email": "retry@idem.test",
+        })
+    }
+
+
+@pytest.mark.django_db
+def test_retry_with_same_key_replays_original_response():
+    client, org = _staff_client()
+    payload = _patient_payload(org)
+
+    first = client.post(
+        "/api/v1/clinical-ops/staff/patients/create",
+        payload,
+        format="json",
+        HTTP_X_IDEMPOTENCY_KEY="create-patient-1",
+    )
+    second = client.post(
+        "/api/v1/clinical-ops/staff/patients/create",
+        payload,
+        format="json",
+        HTTP_X_IDEMPOTENCY_KEY="create-patient-1",
+    )
+
+    assert first.status_code == 201
+    assert second.status_code == 201
+    assert second.json()["encrypted_data"] == first.json()["encrypted_data"]
+    assert second["Idempotent-Replayed"] == "true"
+    assert Patient.objects.filter(org=org).count() == 1
+
+
+@pytest.mark.django_db
+def test_retry_with_reencrypted_payload_replays():
+    client, org = _staff_client()
+
+    first = client.post(
+        "/api/v1/clinical-ops/staff/patients/create",
+        _patient_payload(org),
+        format="json",
+        HTTP_X_IDEMPOTENCY_KEY="create-patient-2",
+    )
+    second = client.post(
+        "/api/v1/clinical-ops/staff/patients/create",
+        _patient_payload(org),  # fresh IV, same logical payload
+        format="json",
+        HTTP_X_IDEMPOTENCY_KEY="create-patient-2",
+    )
+
+    assert first.status_code == 201
+    assert second.status_code == 201
+    assert second["Idempotent-Replayed"] == "true"
+    assert Patient.objects.filter(org=org).count() == 1
+
+
+@pytest.mark.django_db
+def test_key_reuse_with_different_payload_is_rejected():
+    client, org = _staff_client()
+
+    client.post(
+        "/api/v1/clinical-ops/staff/patients/create",
+        _patient_payload(org),
+        format="json",
+        HTTP_X_IDEMPOTENCY_KEY="create-patient-3",
+    )
+    resp = client.post(
+        "/api/v1/clinical-ops/staff/patients/create",
+        _patient_payload(org, full_name="Other Patient"),
+        format="json",
+        HTTP_X_IDEMPOTENCY_KEY="create-patient-3",
+    )
+
+    assert resp.status_code == 422
+    assert Patient.objects.filter(org=org).count() == 1
+
+
+@pytest.mark.django_db
+def test_public_keys_are_scoped_per_order():
+    org = Organization.objects.create(name="Idem Pub Org", code="IDEM_PUB", org_type="HOSPITAL")
+
+    def token_for(order):
+        raw = PublicAccessToken.generate_raw_token()
+        PublicAccessToken.objects.create(
+            order=order, token_hash=PublicAccessToken.hash_token(raw),
+            expires_at=timezone.now() + timedelta(minutes=30),
+        )
+        return raw
+
+    orders = []
+    for name in ("Patient A", "Patient B"):
+        patient = Patient.objects.create(org=org, full_name=name, age=30, sex="MALE")
+        orders.append(AssessmentOrder.objects.create(org=org, patient=patient, battery_code="ANX_SCREEN_V1"))
+    request = APIRequestFactory().post("/submit")
+    request.user = AnonymousUser()
+
+    first, rotated, other = token_for(orders[0]), token_for(orders[0]), token_for(orders[1])
+    scope = _scope_for("public.order.submit", request, {"token": first})
+
+    # Same order across token rotations; another patient never shares the scope
+    assert scope == _scope_for("public.order.submit", request, {"token": rotated})
+    assert scope != _scope_for("public.order.submit", request, {"token": other})
+    assert _scope_for("clinical.sessions.submit_all", request, {"session_id": "s-1"}).endswith(":public:session_id=s-1")
+
+
+@pytest.mark.django_db
+def test_sweeper_removes_expired_records():
+    now = timezone.now()
+    IdempotencyRecord.objects.create(
+        scope="s", key="old", request_fingerprint="x", expires_at=now - timedelta(minutes=1)
+    )
+    IdempotencyRecord.objects.create(
+        scope="s", key="new", request_fingerprint="x", expires_at=now + timedelta(hours=1)
+    )
+
+    call_command("sweep_idempotency_keys")
+
+    assert list(IdempotencyRecord.objects.values_list("key", flat=True)) == ["new"]
@@ -0,0 +1,106 @@
+import uuid
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import Organization, UserProfile
+from apps.clinical_ops.models import AssessmentOrder, Patient
+from apps.clinical_ops.models_assessment import AssessmentResponse, AssessmentResult
+from apps.clinical_ops.services.kiosk_sync import sign_batch
+from common.crypto_utils import encrypt_data, decrypt_data
+
+
+@pytest.fixture(autouse=True)
+def kiosk_secret(settings):
+    settings.KIOSK_SYNC_SECRET = "kiosk-test-secret"
+
+
+def _setup():
+    org = Organization.objects.create(name="Kiosk Org", code="KIOSK_ORG", org_type="HOSPITAL")
+    user = User.objects.create_user("staff@kiosk.test", password="pass")
+    UserProfile.objects.create(user=user, organization=org, role="STAFF")
+    patient = Patient.objects.create(org=org, full_name="Kiosk Patient", age=33, sex="FEMALE")
+    order = AssessmentOrder.objects.create(
+        org=org,
+        patient=patient,
+        battery_code="ANX_SCREEN_V1",
+        administration_mode=AssessmentOrder.MODE_KIOSK,
+        status=AssessmentOrder.STATUS_IN_PROGRESS,
+    )
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client, org, order
+
+
+def _sessions(order):
+    return [{
+        "client_session_id": str(uuid.uuid4()),
+        "order_id": order.id,
+        "answers": [{"question_id": f"gad7_q{i}", "value": 1} for i in range(1, 8)],
+        "duration_seconds": 240,
+        "submitted_at": timezone.now().isoformat(),
+    }]
+
+
+def _post(client, org, sessions, signature):
+    return client.post(
+        "/api/v1/clinical-ops/staff/kiosk/sync",
+        {"encrypted_data": encrypt_data({
+            "org_id": str(org.external_id),
+            "device_id": "kiosk-1",
+            "sessions": sessions,
+        })},
+        format="json",
+        HTTP_X_KIOSK_SIGNATURE=signature,
+    )
+
+
+@pytest.mark.django_db
+def test_sync_ingests_and_resync_reports_duplicate():
+    client, org, order = _setup()
+    sessions = _sessions(order)
+    signature = sign_batch("kiosk-1", sessions)
+
+    first = _post(client, org, sessions, signature)
+    assert first.status_code == 200
+    data = decrypt_data(first.json()["encrypted_data"])
+    assert data["accepted"] == 1
+    assert data["items"][0]["status"] == "ACCEPTED"
+
+    order.refresh_from_db()
+    assert order.status == AssessmentOrder.STATUS_COMPLETED
+    assert AssessmentResult.objects.filter(order=order).exists()
+
+    second = _post(client, org, sessions, signature)
+    data = decrypt_data(second.json()["encrypted_data"])
+    assert data["duplicates"] == 1
+    assert AssessmentResponse.objects.filter(order=order).count() == 1
+
+
+@pytest.mark.django_db
+def test_sync_rejects_bad_signature():
+    client, org, order = _setup()
+
+    resp = _post(client, org, _sessions(order), "0" * 64)
+
+    assert resp.status_code == 403
+    assert not AssessmentResponse.objects.filter(order=order).exists()
+
+
+@pytest.mark.django_db
+def test_sync_refused_without_dedicated_secret(settings):
+    client, org, order = _setup()
+    sessions = _sessions(order)
+    signature = sign_batch("kiosk-1", sessions)
+
+    settings.KIOSK_SYNC_SECRET = ""
+    resp = _post(client, org, sessions, signature)
+
+    assert resp.status_code == 503
+    assert not AssessmentResponse.objects.filter(order=order).exists()
+    with pytest.raises(ImproperlyConfigured):
+        sign_batch("kiosk-1", sessions)
@@ -0,0 +1,72 @@
+import csv
+import json
+from datetime import date, datetime, timedelta
+
+import pytest
+from django.utils import timezone
+
+from core.models import Organization
+from apps.clinical_ops.models import AssessmentOrder, Patient
+from apps.clinical_ops.models_pms import PmsMetricSnapshot
+from apps.clinical_ops.services.pms_report import METRICS, build_report, quarters, write_artifacts
+
+
+def test_quarters_cover_range():
+    periods = quarters(date(2025, 11, 15), date(2026, 2, 1))
+    assert [p.label for p in periods] == ["2025-Q4", "2026-Q1"]
+    assert periods[0].start == date(2025, 10, 1)
+    assert periods[0].end == date(2026, 1, 1)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_report_runs_concurrently_caches_closed_quarters_and_writes_artifacts(tmp_path):
+    org = Organization.objects.create(name="PMS Rep Org", code="PMS_REP", org_type="HOSPITAL")
+    patient = Patient.objects.create(org=org, full_name="Rep Patient", age=41, sex="FEMALE")
+    for _ in range(2):
+        order = AssessmentOrder.objects.create(org=org, patient=patient, battery_code="ANX_SCREEN_V1")
+        AssessmentOrder.objects.filter(pk=order.pk).update(
+            created_at=timezone.make_aware(datetime(2025, 5, 10, 12)),
+            status=AssessmentOrder.STATUS_COMPLETED,
+        )
+
+    report = build_report(date(2025, 4, 1), date(2025, 9, 30), workers=4)
+    by_key = {(e["metric"], e["period"]): e for e in report["metrics"]}
+
+    assert len(report["metrics"]) == len(METRICS) * 2
+    assert all(e["error"] is None and not e["cached"] for e in report["metrics"])
+    assert by_key[("assessments", "2025-Q2")]["rows"][0]["completed"] == 2
+    assert by_key[("instruments", "2025-Q2")]["rows"] == [
+        {"battery_code": "ANX_SCREEN_V1", "battery_version": "1.0", "count": 2}
+    ]
+    assert PmsMetricSnapshot.objects.count() == len(METRICS) * 2
+
+    again = build_report(date(2025, 4, 1), date(2025, 9, 30), workers=4)
+    assert all(e["cached"] for e in again["metrics"])
+    assert again["metrics"][0]["rows"] == report["metrics"][0]["rows"]
+
+    json_path, csv_path = write_artifacts(again, str(tmp_path))
+    with open(json_path) as f:
+        assert json.load(f)["schema_version"] == "1"
+    with open(csv_path) as f:
+        rows = list(csv.DictReader(f))
+    assert {"schema_version": "1", "metric": "assessments", "period": "2025-Q2",
+            "row": "0", "field": "started", "value": "2"} in rows
+
+
+@pytest.mark.django_db(transaction=True)
+def test_recently_ended_quarter_is_not_snapshotted(settings):
+    today = timezone.localdate()
+    current = quarters(today, today)[0]
+    previous = quarters(current.start - timedelta(days=1), current.start - timedelta(days=1))[0]
+
+    settings.PMS_SNAPSHOT_GRACE_DAYS = (today - previous.end).days + 1
+    assert not previous.closed
+
+    report = build_report(previous.start, previous.end - timedelta(days=1), workers=2)
+
+    assert all(not e["closed"] and not e["cached"] for e in report["metrics"])
+    assert not PmsMetricSnapshot.objects.exists()
+
+    settings.PMS_SNAPSHOT_GRACE_DAYS = 0
+    build_report(previous.start, previous.end - timedelta(days=1), workers=2)
+    assert PmsMetricSnapshot.objects.count() == len(METRICS)
@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from core.models import Organization
+from apps.clinical_ops.models import AssessmentOrder, Patient, ResponseQuality
+from apps.clinical_ops.models_assessment import AssessmentResult
+from apps.clinical_ops.models_deletion import DeletionRequest
+from apps.clinical_ops.models_pms import PmsDailyRollup
+from apps.clinical_ops.services.deletion_executor import execute_deletion
+from apps.clinical_ops.services.pms_rollup import quarterly_rollup, refresh_rollups
+
+
+@pytest.fixture
+def org_patient():
+    org = Organization.objects.create(name="PMS Org", code="PMS_ORG", org_type="HOSPITAL")
+    patient = Patient.objects.create(org=org, full_name="PMS Patient", age=33, sex="MALE")
+    return org, patient
+
+
+def _completed_order(org, patient, *, red_flag=False, too_fast=False, duration=300):
+    order = AssessmentOrder.objects.create(org=org, patient=patient, battery_code="ANX_SCREEN_V1")
+    order.status = AssessmentOrder.STATUS_COMPLETED
+    order.completed_at = timezone.now()
+    order.save(update_fields=["status", "completed_at"])
+    AssessmentResult.objects.create(org=org, order=order, has_red_flags=red_flag)
+    ResponseQuality.objects.create(org=org, order=order, duration_seconds=duration, too_fast_flag=too_fast)
+    return order
+
+
+@pytest.mark.django_db
+def test_rollups_refresh_incrementally(org_patient):
+    org, patient = org_patient
+    _completed_order(org, patient, red_flag=True, too_fast=True, duration=60)
+    _completed_order(org, patient, duration=240)
+    open_order = AssessmentOrder.objects.create(org=org, patient=patient, battery_code="ANX_SCREEN_V1")
+
+    refresh_rollups()
+    [quarter] = quarterly_rollup()
+    assert (quarter["started"], quarter["completed"], quarter["abandoned"]) == (3, 2, 1)
+    assert (quarter["red_flags"], quarter["too_fast"], quarter["duration_seconds_sum"]) == (1, 1, 300)
+
+    # A partial save bumps updated_at, so the next incremental run picks it up
+    open_order.status = AssessmentOrder.STATUS_COMPLETED
+    open_order.save(update_fields=["status"])
+    stats = refresh_rollups()
+    assert stats["days"] == 1
+
+    [quarter] = quarterly_rollup()
+    assert (quarter["completed"], quarter["abandoned"]) == (3, 0)
+
+
+@pytest.mark.django_db
+def test_deleted_orders_drop_out_of_rollups(org_patient):
+    org, patient = org_patient
+    kept = _completed_order(org, patient)
+    gone = _completed_order(org, patient)
+    AssessmentOrder.objects.filter(pk=kept.pk).update(created_at=timezone.now() - timedelta(days=1))
+
+    refresh_rollups()
+    assert PmsDailyRollup.objects.count() == 2
+
+    dr = DeletionRequest.objects.create(org=org, order=gone, requested_by="PATIENT", reason="Asked", status="APPROVED")
+    execute_deletion(dr)
+    refresh_rollups()
+
+    assert PmsDailyRollup.objects.count() == 1
+    assert sum(q["started"] for q in quarterly_rollup()) == 1
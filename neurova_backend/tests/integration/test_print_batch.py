@@ -0,0 +1,125 @@
+import hashlib
+import io
+import subprocess
+import sys
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from pypdf import PdfReader
+from rest_framework.test import APIClient
+
+from core.models import Organization, UserProfile
+from apps.clinical_ops.audit.models import AuditEvent
+from apps.clinical_ops.models import AssessmentOrder, Patient
+from apps.clinical_ops.models_assessment import AssessmentResult
+from apps.clinical_ops.models_print_batch import PrintBatch
+from apps.clinical_ops.models_report import AssessmentReport
+from apps.clinical_ops.services.pdf_report_v2 import generate_report_pdf_bytes_v2
+from apps.clinical_ops.services.print_batch import run_print_batch
+from apps.clinical_ops.services.report_context import build_report_context
+from apps.clinical_ops.services.scoring_adapter import score_battery
+from common.crypto_utils import encrypt_data, decrypt_data
+
+
+def _completed_order(org, patient):
+    order = AssessmentOrder.objects.create(
+        org=org,
+        patient=patient,
+        battery_code="ANX_SCREEN_V1",
+        status=AssessmentOrder.STATUS_COMPLETED,
+        delivery_mode=AssessmentOrder.DELIVERY_PRINT,
+    )
+    result = score_battery(
+        battery_code="ANX_SCREEN_V1",
+        battery_version="1.0",
+        answers_json={"answers": [{"question_id": f"gad7_q{i}", "value": 2} for i in range(1, 8)]},
+    )
+    AssessmentResult.objects.create(
+        org=org,
+        order=order,
+        result_json=result,
+        primary_severity=result["summary"]["primary_severity"],
+        has_red_flags=result["summary"]["has_red_flags"],
+    )
+    return order
+
+
+@pytest.fixture
+def print_setup(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    org = Organization.objects.create(name="Print Org", code="PRINT_ORG", org_type="HOSPITAL")
+    user = User.objects.create_user("staff@print.test", password="pass")
+    UserProfile.objects.create(user=user, organization=org, role="STAFF")
+    patient = Patient.objects.create(org=org, full_name="Print Patient", age=51, sex="MALE")
+
+    orders = [_completed_order(org, patient) for _ in range(3)]
+
+    # First order already has a stored report; the others are rendered on the fly
+    pdf_bytes = generate_report_pdf_bytes_v2(build_report_context(orders[0]))
+    stored = AssessmentReport.objects.create(org=org, order=orders[0], pdf_sha256=hashlib.sha256(pdf_bytes).hexdigest())
+    stored.pdf_file.save("stored.pdf", ContentFile(pdf_bytes))
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client, org, orders
+
+
+@pytest.mark.django_db
+def test_print_batch_merges_reports_behind_cover_sheet(print_setup):
+    client, org, orders = print_setup
+
+    resp = client.post(
+        "/api/v1/clinical-ops/staff/print-batches/create",
+        {"encrypted_data": encrypt_data({"order_ids": [o.id for o in orders] + [999999]})},
+        format="json",
+    )
+    assert resp.status_code == 201
+    data = decrypt_data(resp.json()["encrypted_data"])
+    assert data["status"] == PrintBatch.STATUS_COMPLETED
+    assert data["report_count"] == 3
+    assert data["skipped"] == [{"order_id": 999999, "reason": "Not printable"}]
+
+    download = client.get(f"/api/v1/clinical-ops/staff/print-batches/{data['batch_id']}/download")
+    assert download.status_code == 200
+    merged = PdfReader(io.BytesIO(b"".join(download.streaming_content)))
+    assert len(merged.pages) == data["page_count"]
+    assert len(merged.outline) == 4  # cover + one entry per report
+
+
+@pytest.mark.django_db
+def test_print_batch_renders_in_process_pool(print_setup):
+    _, org, orders = print_setup
+    batch = PrintBatch.objects.create(org=org, filters={}, rerender=True)
+
+    run_print_batch(batch, workers=2)
+
+    assert batch.status == PrintBatch.STATUS_COMPLETED
+    assert batch.report_count == len(orders)
+    assert batch.pdf_sha256
+
+
+def test_pool_worker_module_imports_no_django():
+    # Spawned render workers import pdf_report_v2 without Django settings
+    code = (
+        "import sys, apps.clinical_ops.services.pdf_report_v2; "
+        "print(sorted(m for m in sys.modules if m == 'django' or m.startswith('common.')))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+@pytest.mark.django_db
+def test_print_batch_skips_tampered_stored_pdf(print_setup):
+    _, org, orders = print_setup
+    report = AssessmentReport.objects.get(order=orders[0])
+    with open(report.pdf_file.path, "ab") as fh:
+        fh.write(b"tampered")
+    batch = PrintBatch.objects.create(org=org, order_ids=[o.id for o in orders])
+
+    run_print_batch(batch, workers=1)
+
+    assert batch.status == PrintBatch.STATUS_COMPLETED
+    assert batch.report_count == len(orders) - 1
+    assert batch.skipped == [{"order_id": orders[0].id, "reason": "PDF integrity check failed"}]
+    assert AuditEvent.objects.filter(event_type="REPORT_TAMPER_DETECTED", entity_id=str(orders[0].id)).exists()
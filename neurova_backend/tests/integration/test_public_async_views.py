@@ -0,0 +1,111 @@
+import hashlib
+import json
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.files.base import ContentFile
+from django.test import AsyncRequestFactory
+from django.utils import timezone
+from rest_framework.exceptions import PermissionDenied
+
+from core.models import Organization
+from apps.clinical_ops.api.v1.public_async_views import (
+    PublicDownloadReportAsync,
+    PublicOrderBootstrapAsync,
+)
+from apps.clinical_ops.models import AssessmentOrder, Patient
+from apps.clinical_ops.models_public_token import PublicAccessToken
+from apps.clinical_ops.models_report import AssessmentReport
+from apps.clinical_ops.services import public_token_validator
+from apps.clinical_ops.services.access_code import issue_report_access_code
+from apps.clinical_ops.services.public_token_validator import (
+    avalidate_and_rotate_url_token,
+    validate_and_rotate_url_token,
+)
+from common.crypto_utils import decrypt_data
+
+PDF_BYTES = b"%PDF-1.4\n" + bytes(range(256)) * 40 + b"\n%%EOF"
+UA = "pytest-async"
+
+
+def _order_with_token(**order_fields):
+    org = Organization.objects.create(name="Async Org", code="ASYNC_ORG", org_type="HOSPITAL")
+    patient = Patient.objects.create(org=org, full_name="Async Patient", age=33, sex="MALE")
+    order = AssessmentOrder.objects.create(org=org, patient=patient, battery_code="ANX_SCREEN_V1", **order_fields)
+    raw = PublicAccessToken.generate_raw_token()
+    PublicAccessToken.objects.create(
+        order=order,
+        token_hash=PublicAccessToken.hash_token(raw),
+        expires_at=timezone.now() + timedelta(minutes=30),
+    )
+    return order, raw
+
+
+def _call(view, path, token, **extra):
+    request = AsyncRequestFactory().get(path, headers={"user-agent": UA}, **extra)
+    return async_to_sync(view.as_view())(request, token=token)
+
+
+@pytest.mark.django_db
+def test_async_bootstrap_rotates_token_and_encrypts():
+    order, raw = _order_with_token()
+
+    resp = _call(PublicOrderBootstrapAsync, f"/public/order/{raw}", raw)
+
+    assert resp.status_code == 200
+    new_token = resp["X-Public-Token"]
+    assert new_token and new_token != raw
+    data = decrypt_data(json.loads(resp.content)["encrypted_data"])
+    assert data["order_id"] == order.id
+    assert data["patient_name"] == "Async Patient"
+
+    used = PublicAccessToken.objects.get(token_hash=PublicAccessToken.hash_token(raw))
+    assert used.is_used and used.bound_user_agent == UA
+
+    # The spent token is refused with the same 403 envelope as the DRF view
+    again = _call(PublicOrderBootstrapAsync, f"/public/order/{raw}", raw)
+    assert again.status_code == 403
+    assert json.loads(again.content)["success"] is False
+
+
+@pytest.mark.django_db
+def test_token_is_claimed_once_when_requests_race(monkeypatch):
+    # A concurrent request read the row before the first one marked it used
+    monkeypatch.setattr(public_token_validator, "_check_state", lambda token_obj: None)
+    request = AsyncRequestFactory().get("/public/order/x", headers={"user-agent": UA})
+
+    for rotate in (validate_and_rotate_url_token, async_to_sync(avalidate_and_rotate_url_token)):
+        order, raw = _order_with_token()
+        rotate(raw, request)
+
+        with pytest.raises(PermissionDenied, match="Token already used"):
+            rotate(raw, request)
+        assert PublicAccessToken.objects.filter(order=order).count() == 2
+        order.org.delete()
+
+
+@pytest.mark.django_db
+def test_async_download_streams_report(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    order, raw = _order_with_token(
+        status=AssessmentOrder.STATUS_COMPLETED,
+        delivery_mode=AssessmentOrder.DELIVERY_ALLOW_PATIENT_DOWNLOAD,
+    )
+    report = AssessmentReport.objects.create(
+        org=order.org, order=order, pdf_sha256=hashlib.sha256(PDF_BYTES).hexdigest(),
+    )
+    report.pdf_file.save("r.pdf", ContentFile(PDF_BYTES))
+    code = issue_report_access_code(order)
+
+    resp = _call(PublicDownloadReportAsync, f"/public/order/{raw}/report.pdf", raw, data={"code": code})
+
+    assert resp.status_code == 200
+    assert resp.is_async
+
+    async def read():
+        return b"".join([chunk async for chunk in resp.streaming_content])
+
+    assert async_to_sync(read)() == PDF_BYTES
+    assert resp["ETag"] == f'"{report.pdf_sha256}"'
+    assert resp["X-Public-Token"] != raw
@@ -0,0 +1,99 @@
+import hashlib
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from rest_framework.test import APIClient
+from storages.backends.s3 import S3Storage
+
+from core.models import Organization, UserProfile
+from apps.clinical_ops.models import AssessmentOrder, Patient
+from apps.clinical_ops.models_report import AssessmentReport
+from apps.clinical_ops.audit.models import AuditEvent
+from apps.clinical_ops.services.report_delivery import PresignedUrlDelivery, get_delivery_backend
+
+PDF_BYTES = b"%PDF-1.4\nreport body\n%%EOF"
+URL = "/api/v1/clinical-ops/staff/reports/download"
+
+
+@pytest.fixture
+def stored_report(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    org = Organization.objects.create(name="Deliv Org", code="DELIV_ORG", org_type="HOSPITAL")
+    user = User.objects.create_user("staff@deliv.test", password="pass")
+    UserProfile.objects.create(user=user, organization=org, role="STAFF")
+    patient = Patient.objects.create(org=org, full_name="Deliv Patient", age=40, sex="MALE")
+    order = AssessmentOrder.objects.create(
+        org=org, patient=patient, battery_code="ANX_SCREEN_V1",
+        status=AssessmentOrder.STATUS_COMPLETED,
+    )
+    report = AssessmentReport.objects.create(org=org, order=order)
+    report.pdf_file.save("r.pdf", ContentFile(PDF_BYTES))
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client, order, report
+
+
+@pytest.mark.django_db
+def test_accel_redirect_hands_file_to_proxy_after_integrity_and_audit(stored_report, settings):
+    settings.REPORT_DELIVERY_BACKEND = "accel"
+    client, order, report = stored_report
+
+    resp = client.get(URL, {"order_id": order.id})
+
+    assert resp.status_code == 200
+    assert resp.content == b""
+    assert resp["X-Accel-Redirect"] == f"/protected-media/{report.pdf_file.name}"
+    assert resp["ETag"] == f'"{hashlib.sha256(PDF_BYTES).hexdigest()}"'
+    assert AuditEvent.objects.filter(event_type="STAFF_REPORT_DOWNLOAD", entity_id=str(order.id)).exists()
+
+
+@pytest.mark.django_db
+def test_tampered_file_is_never_offloaded(stored_report, settings):
+    settings.REPORT_DELIVERY_BACKEND = "sendfile"
+    client, order, report = stored_report
+    report.pdf_sha256 = "0" * 64
+    report.save(update_fields=["pdf_sha256"])
+
+    resp = client.get(URL, {"order_id": order.id})
+
+    assert resp.status_code == 409
+    assert not resp.has_header("X-Sendfile")
+
+
+def test_presigned_url_is_short_lived_and_signed(settings):
+    settings.REPORT_PRESIGNED_URL_TTL_SECONDS = 45
+    # Local S3-compatible stand-in (MinIO-style endpoint); signing needs no network
+    storage = S3Storage(
+        access_key="minio",
+        secret_key="minio-secret",
+        bucket_name="reports",
+        endpoint_url="http://127.0.0.1:9000",
+        region_name="us-east-1",
+        signature_version="s3v4",
+        querystring_auth=True,
+    )
+    field_file = SimpleNamespace(storage=storage, name="clinical_reports/2026/01/01/r.pdf")
+
+    settings.REPORT_DELIVERY_BACKEND = "presigned"
+    backend = get_delivery_backend(field_file)
+    assert isinstance(backend, PresignedUrlDelivery)
+
+    response = backend.deliver(
+        None, field_file,
+        etag=None, last_modified=None, content_type="application/pdf",
+        filename="report.pdf", disposition="attachment",
+    )
+    assert response.status_code == 302
+    assert response["Cache-Control"] == "no-store"
+
+    url = urlparse(response["Location"])
+    query = parse_qs(url.query)
+    assert url.netloc == "127.0.0.1:9000"
+    assert url.path == "/reports/clinical_reports/2026/01/01/r.pdf"
+    assert query["X-Amz-Expires"] == ["45"]
+    assert "X-Amz-Signature" in query
+    assert query["response-content-disposition"] == ['attachment; filename="report.pdf"']
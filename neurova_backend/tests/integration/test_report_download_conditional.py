@@ -0,0 +1,117 @@
+import hashlib
+import uuid
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import Organization, UserProfile
+from apps.clinical_ops.models import AssessmentOrder, Patient
+from apps.clinical_ops.models_report import AssessmentReport
+from backend.clinical.models import BatterySession, ClinicalOrder
+from backend.clinical.models import TestRun as ClinicalTestRun
+from backend.clinical.reporting.report_builder_v1 import generate_report_for_order_v1
+from backend.clinical.signoff.services import apply_clinical_signoff
+
+PDF_BYTES = b"%PDF-1.4\n" + bytes(range(256)) * 40 + b"\n%%EOF"
+URL = "/api/v1/clinical-ops/staff/reports/download"
+
+
+@pytest.fixture
+def download_setup(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    org = Organization.objects.create(name="Dl Org", code="DL_ORG", org_type="HOSPITAL")
+    user = User.objects.create_user("staff@dl.test", password="pass")
+    UserProfile.objects.create(user=user, organization=org, role="STAFF")
+    patient = Patient.objects.create(org=org, full_name="Dl Patient", age=29, sex="FEMALE")
+    order = AssessmentOrder.objects.create(
+        org=org, patient=patient, battery_code="ANX_SCREEN_V1",
+        status=AssessmentOrder.STATUS_COMPLETED,
+    )
+    report = AssessmentReport.objects.create(
+        org=org, order=order, pdf_sha256=hashlib.sha256(PDF_BYTES).hexdigest(),
+    )
+    report.pdf_file.save("r.pdf", ContentFile(PDF_BYTES))
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client, order, report
+
+
+@pytest.mark.django_db
+def test_full_download_carries_validators(download_setup):
+    client, order, report = download_setup
+
+    resp = client.get(URL, {"order_id": order.id})
+
+    assert resp.status_code == 200
+    assert b"".join(resp.streaming_content) == PDF_BYTES
+    assert resp["ETag"] == f'"{report.pdf_sha256}"'
+    assert resp["Accept-Ranges"] == "bytes"
+    assert "Last-Modified" in resp
+
+
+@pytest.mark.django_db
+def test_matching_etag_returns_304(download_setup):
+    client, order, report = download_setup
+
+    resp = client.get(URL, {"order_id": order.id}, HTTP_IF_NONE_MATCH=f'"{report.pdf_sha256}"')
+
+    assert resp.status_code == 304
+    assert resp.content == b""
+
+
+@pytest.mark.django_db
+def test_range_request_resumes_download(download_setup):
+    client, order, report = download_setup
+
+    resp = client.get(
+        URL, {"order_id": order.id},
+        HTTP_RANGE="bytes=100-",
+        HTTP_IF_RANGE=f'"{report.pdf_sha256}"',
+    )
+
+    assert resp.status_code == 206
+    assert b"".join(resp.streaming_content) == PDF_BYTES[100:]
+    assert resp["Content-Range"] == f"bytes 100-{len(PDF_BYTES) - 1}/{len(PDF_BYTES)}"
+
+    stale = client.get(URL, {"order_id": order.id}, HTTP_RANGE="bytes=100-", HTTP_IF_RANGE='"other"')
+    assert stale.status_code == 200
+
+    beyond = client.get(URL, {"order_id": order.id}, HTTP_RANGE=f"bytes={len(PDF_BYTES)}-")
+    assert beyond.status_code == 416
+
+
+@pytest.mark.django_db
+def test_clinical_signoff_invalidates_cached_pdf_etag():
+    org_id = uuid.uuid4()
+    order = ClinicalOrder.objects.create(
+        organization_id=org_id, patient_name="P", patient_age=30, patient_gender="Male",
+        encounter_type="OPD", administration_mode="IN_CLINIC",
+        battery_code="ANX_SCREEN_V1", battery_version="1.0", status="COMPLETED",
+    )
+    session = BatterySession.objects.create(
+        organization_id=org_id, order=order, status="COMPLETED", current_test_index=0,
+        started_at=timezone.now(), completed_at=timezone.now(),
+    )
+    ClinicalTestRun.objects.create(
+        organization_id=org_id, session=session, test_code="GAD7", test_order_index=0,
+        raw_responses=[0, 0, 0, 0, 0, 0, 0], time_submitted=timezone.now(),
+    )
+    report = generate_report_for_order_v1(order)
+    url = f"/api/v1/clinical/orders/{order.id}/report/pdf/"
+    client = APIClient(HTTP_X_ORG_ID=str(org_id))
+
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first["ETag"]
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    apply_clinical_signoff(report, "Dr. Rao", "Psychiatrist", "REG-1")
+
+    signed = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert signed.status_code == 200
+    assert signed["ETag"] != etag
+    assert client.get(url, HTTP_IF_NONE_MATCH=signed["ETag"]).status_code == 304
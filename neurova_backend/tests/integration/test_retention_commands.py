@@ -0,0 +1,97 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.db.models import BooleanField, Value
+from django.utils import timezone
+
+from core.models import Organization
+from apps.clinical_ops.models import AssessmentOrder, Patient
+from apps.clinical_ops.management.commands import retention_sweep
+from apps.clinical_ops.models_deletion import DeletionRequest
+
+
+@pytest.fixture
+def org_patient():
+    org = Organization.objects.create(name="Ret Org", code="RET_ORG", org_type="HOSPITAL")
+    patient = Patient.objects.create(org=org, full_name="Ret Patient", age=70, sex="FEMALE")
+    return org, patient
+
+
+def _order(org, patient, **fields):
+    order = AssessmentOrder.objects.create(org=org, patient=patient, battery_code="ANX_SCREEN_V1")
+    AssessmentOrder.objects.filter(pk=order.pk).update(**fields)
+    return order
+
+
+@pytest.mark.django_db
+def test_retention_sweep_is_batched_and_rerun_safe(org_patient):
+    org, patient = org_patient
+    past = timezone.now() - timedelta(days=1)
+
+    expired = [_order(org, patient, data_retention_until=past) for _ in range(5)]
+    _order(org, patient, data_retention_until=timezone.now() + timedelta(days=30))
+    DeletionRequest.objects.create(org=org, order=expired[0], requested_by="PATIENT", reason="Asked")
+
+    call_command("retention_sweep", "--batch-size", "2")
+    call_command("retention_sweep", "--batch-size", "2")
+
+    assert DeletionRequest.objects.count() == 5
+    assert DeletionRequest.objects.filter(order=expired[0]).count() == 1
+    assert DeletionRequest.objects.filter(requested_by="SYSTEM").count() == 4
+
+
+@pytest.mark.django_db
+def test_retention_sweep_ignores_closed_requests(org_patient):
+    org, patient = org_patient
+    order = _order(org, patient, data_retention_until=timezone.now() - timedelta(days=1))
+    DeletionRequest.objects.create(
+        org=org, order=order, requested_by="PATIENT", reason="Asked", status="REJECTED"
+    )
+
+    call_command("retention_sweep")
+
+    open_requests = DeletionRequest.objects.filter(order=order, status="REQUESTED")
+    assert list(open_requests.values_list("requested_by", flat=True)) == ["SYSTEM"]
+
+
+@pytest.mark.django_db
+def test_retention_sweep_cannot_duplicate_a_concurrent_request(org_patient, monkeypatch):
+    org, patient = org_patient
+    past = timezone.now() - timedelta(days=1)
+    raced, free = (_order(org, patient, data_retention_until=past) for _ in range(2))
+    DeletionRequest.objects.create(org=org, order=raced, requested_by="STAFF_USER", reason="Staff", status="APPROVED")
+
+    # The request appeared after the sweep read its batch
+    monkeypatch.setattr(retention_sweep, "Exists", lambda qs: Value(False, output_field=BooleanField()))
+    out = StringIO()
+    call_command("retention_sweep", stdout=out)
+
+    assert DeletionRequest.objects.filter(order=raced).count() == 1
+    assert DeletionRequest.objects.filter(order=free, requested_by="SYSTEM").count() == 1
+    assert "1 new deletion requests" in out.getvalue()
+
+    with pytest.raises(IntegrityError), transaction.atomic():
+        DeletionRequest.objects.create(org=org, order=raced, requested_by="PATIENT", reason="Again")
+
+
+@pytest.mark.django_db
+def test_cleanup_expired_orders_cancels_only_stale_open_orders(org_patient):
+    org, patient = org_patient
+    past = timezone.now() - timedelta(hours=1)
+
+    stale = [
+        _order(org, patient, status=AssessmentOrder.STATUS_CREATED, public_link_expires_at=past)
+        for _ in range(3)
+    ]
+    done = _order(org, patient, status=AssessmentOrder.STATUS_COMPLETED, public_link_expires_at=past)
+
+    call_command("cleanup_expired_orders", "--batch-size", "2")
+
+    assert AssessmentOrder.objects.filter(
+        id__in=[o.id for o in stale], status=AssessmentOrder.STATUS_CANCELLED
+    ).count() == 3
+    done.refresh_from_db()
+    assert done.status == AssessmentOrder.STATUS_COMPLETED
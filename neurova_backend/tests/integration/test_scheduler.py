@@ -0,0 +1,81 @@
+import threading
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from core.models import Organization
+from apps.clinical_ops.models import AssessmentOrder, Patient
+from apps.clinical_ops.models_scheduler import ScheduledJobRun
+from apps.clinical_ops.services.scheduler import Job, Scheduler, due_at, run_job
+from common.db_locks import advisory_lock
+
+
+@pytest.mark.django_db
+def test_job_runs_once_per_interval_and_records_rows():
+    org = Organization.objects.create(name="Sched Org", code="SCHED_ORG", org_type="HOSPITAL")
+    patient = Patient.objects.create(org=org, full_name="Sched Patient", age=40, sex="FEMALE")
+    for _ in range(3):
+        order = AssessmentOrder.objects.create(org=org, patient=patient, battery_code="ANX_SCREEN_V1")
+        AssessmentOrder.objects.filter(pk=order.pk).update(
+            data_retention_until=timezone.now() - timedelta(days=1)
+        )
+
+    job = Job("retention_sweep", interval=3600)
+    run = run_job(job, node="node-a")
+
+    assert run.status == ScheduledJobRun.STATUS_SUCCEEDED
+    assert run.rows_affected == 3
+    assert run.duration_ms is not None
+
+    # Not due again on any node until the interval passes
+    assert run_job(job, node="node-b") is None
+    assert ScheduledJobRun.objects.filter(job_name="retention_sweep").count() == 1
+
+
+@pytest.mark.django_db
+def test_failed_job_backs_off_exponentially(settings):
+    settings.SCHEDULER_BACKOFF_BASE_SECONDS = 60
+    job = Job("seal_audit_log", interval=3600, args=["--batch-size", "not-a-number"])
+
+    first = run_job(job)
+    assert first.status == ScheduledJobRun.STATUS_FAILED
+    assert first.error
+    assert due_at(job) == first.finished_at + timedelta(seconds=60)
+
+    ScheduledJobRun.objects.filter(pk=first.pk).update(finished_at=timezone.now() - timedelta(hours=1))
+    second = run_job(job)
+    assert due_at(job) == second.finished_at + timedelta(seconds=120)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_other_node_holding_the_lock_skips_the_job():
+    job = Job("sweep_idempotency_keys", interval=60)
+    held, release = threading.Event(), threading.Event()
+
+    def other_node():
+        try:
+            with advisory_lock(job.lock_name) as acquired:
+                assert acquired
+                held.set()
+                release.wait(5)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=other_node)
+    thread.start()
+    held.wait(5)
+    try:
+        assert run_job(job) is None
+    finally:
+        release.set()
+        thread.join()
+
+    runs = Scheduler([job], use_jitter=False).tick()
+    assert [r.status for r in runs] == [ScheduledJobRun.STATUS_SUCCEEDED]
+
+
+def test_default_schedule_never_auto_approves_deletions(settings):
+    assert not settings.RETENTION_AUTO_APPROVE
+    assert "--approve-system" not in settings.MAINTENANCE_SCHEDULE["execute_deletion_requests"]["args"]
@@ -0,0 +1,56 @@
+from datetime import date
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from apps.clinical_ops.audit.models import AuditEvent
+from apps.clinical_ops.models import AssessmentOrder, ResponseQuality
+from apps.clinical_ops.models_assessment import AssessmentResponse, AssessmentResult
+from apps.clinical_ops.models_public_token import PublicAccessToken
+from apps.clinical_ops.models_report import AssessmentReport
+
+ARGS = [
+    "--orgs", "2", "--patients", "30", "--orders", "120", "--audit-events", "300",
+    "--seed", "7", "--end-date", "2026-06-30", "--chunk-size", "50",
+]
+
+
+def _fingerprint():
+    return list(
+        AssessmentOrder.objects.order_by("id").values_list(
+            "battery_code", "status", "created_at", "result__primary_severity", "report__signoff_status",
+        )
+    )
+
+
+@pytest.mark.django_db
+def test_generates_consistent_rows_at_requested_scale():
+    call_command("generate_synthetic_data", *ARGS, stdout=StringIO())
+
+    orders = AssessmentOrder.objects.all()
+    assert orders.count() == 120
+    assert AuditEvent.objects.count() == 300
+    assert PublicAccessToken.objects.count() == 120
+    assert len({o.status for o in orders}) >= 5
+    assert max(orders.values_list("created_at", flat=True)).date() <= date(2026, 6, 30)
+
+    submitted = orders.exclude(status__in=["CREATED", "IN_PROGRESS", "CANCELLED"])
+    assert AssessmentResponse.objects.count() == submitted.count()
+    assert ResponseQuality.objects.count() == submitted.count()
+    assert AssessmentResult.objects.count() == submitted.count()
+    assert not AssessmentReport.objects.filter(order__status="CREATED").exists()
+    assert AssessmentReport.objects.filter(order__status="DELIVERED").exclude(signoff_status="SIGNED").count() == 0
+
+
+@pytest.mark.django_db
+def test_same_seed_is_deterministic_and_purge_replaces():
+    call_command("generate_synthetic_data", *ARGS, stdout=StringIO())
+    first = _fingerprint()
+
+    with pytest.raises(CommandError):
+        call_command("generate_synthetic_data", *ARGS, stdout=StringIO())
+
+    call_command("generate_synthetic_data", *ARGS, "--purge", stdout=StringIO())
+    assert _fingerprint() == first
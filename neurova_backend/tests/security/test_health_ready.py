@@ -2,6 +2,8 @@ import pytest
 from rest_framework.test import APIClient
 from django.db import connection
 
+from common.db_pool import configure_connections, pooling_available
+
 
 @pytest.mark.django_db
 def test_healthz_ok():
@@ -18,6 +20,33 @@ def test_readyz_ok_when_db_up():
     assert resp.json().get("db") == "ok"
 
 
+@pytest.mark.django_db
+def test_readyz_reports_pool_stats():
+    client = APIClient()
+    resp = client.get("/readyz/")
+    stats = resp.json()["db_pool"]["default"]
+
+    if stats["mode"] == "pool":
+        assert stats["size"] >= stats["in_use"] >= 0
+        assert {"waiting", "avg_wait_ms", "max_size"} <= set(stats)
+    else:
+        assert stats["health_checks"] is True
+
+
+def test_configure_connections_pool_and_fallback():
+    databases = {"default": {"OPTIONS": {}}}
+    kwargs = dict(min_size=1, max_size=4, timeout=5, max_idle=60, max_lifetime=600, conn_max_age=30)
+
+    configure_connections(databases, pool_enabled=False, **kwargs)
+    assert databases["default"]["CONN_MAX_AGE"] == 30
+    assert "pool" not in databases["default"]["OPTIONS"]
+
+    configure_connections(databases, pool_enabled=True, **kwargs)
+    if pooling_available():
+        assert databases["default"]["OPTIONS"]["pool"]["max_size"] == 4
+        assert databases["default"]["CONN_MAX_AGE"] == 0
+
+
 @pytest.mark.django_db
 def test_readyz_fails_when_db_down(monkeypatch):
     client = APIClient()
@@ -29,3 +58,36 @@ def test_readyz_fails_when_db_down(monkeypatch):
 
     resp = client.get("/readyz/")
     assert resp.status_code == 503
+
+
+@pytest.mark.django_db
+def test_metrics_exposes_request_and_stage_series(settings):
+    settings.METRICS_TOKEN = "scrape-secret"
+    client = APIClient()
+    client.get("/healthz/")
+
+    resp = client.get("/metrics/", HTTP_AUTHORIZATION="Bearer scrape-secret")
+    body = resp.content.decode()
+    assert resp.status_code == 200
+    assert 'neurova_http_requests_total{method="GET",route="healthz/",status="200"}' in body
+    assert "neurova_db_queries_per_request" in body
+
+
+def test_metrics_requires_token_when_configured(settings):
+    settings.METRICS_TOKEN = "scrape-secret"
+    client = APIClient()
+
+    assert client.get("/metrics/").status_code == 401
+    resp = client.get("/metrics/", HTTP_AUTHORIZATION="Bearer scrape-secret")
+    assert resp.status_code == 200
+
+
+def test_metrics_fails_closed_without_token(settings):
+    settings.METRICS_TOKEN = ""
+    client = APIClient()
+
+    settings.DEBUG = False
+    assert client.get("/metrics/").status_code == 503
+
+    settings.DEBUG = True
+    assert client.get("/metrics/").status_code == 200
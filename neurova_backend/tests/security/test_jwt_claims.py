@@ -0,0 +1,75 @@
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+
+from common.auth.authentication import ClaimsJWTAuthentication, TokenPrincipal
+from common.auth.serializers import (
+    AppLogoutSerializer,
+    AppTokenObtainPairSerializer,
+    AppTokenRefreshSerializer,
+)
+from common.permissions import IsStaff
+from core.models import Organization, UserProfile
+
+
+@pytest.fixture
+def staff():
+    org = Organization.objects.create(name="Org", code="JWT1", org_type="HOSPITAL")
+    user = User.objects.create_user("staff@test.com", password="pass", first_name="Sam", last_name="Lee")
+    UserProfile.objects.create(user=user, organization=org, role="STAFF")
+    return user
+
+
+def _authenticate(access):
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {access}")
+    return ClaimsJWTAuthentication().authenticate(request)
+
+
+@pytest.mark.django_db
+def test_access_token_principal_needs_no_queries(staff):
+    access = AppTokenObtainPairSerializer.get_token(staff).access_token
+    org = staff.profile.organization
+    assert access["org_id"] == org.id
+    assert access["org_external_id"] == str(org.external_id)
+    assert access["role"] == "STAFF"
+
+    with CaptureQueriesContext(connection) as queries:
+        user, _ = _authenticate(str(access))
+        assert IsStaff().has_permission(type("R", (), {"user": user}), None)
+        assert user.profile.organization.pk == org.id
+        assert user.profile.organization.external_id == org.external_id
+    assert len(queries) == 0
+    assert isinstance(user, TokenPrincipal)
+
+    # Rare fields load the real user (and organization) lazily
+    assert user.get_full_name() == "Sam Lee"
+    assert user.profile.organization.code == "JWT1"
+
+
+@pytest.mark.django_db
+def test_token_without_claims_falls_back_to_db_user(staff):
+    access = AppTokenObtainPairSerializer.get_token(User.objects.create_user("plain", password="x")).access_token
+    user, _ = _authenticate(str(access))
+    assert isinstance(user, User)
+
+
+@pytest.mark.django_db
+def test_refresh_restamps_claims_and_respects_revocation(staff):
+    refresh = str(AppTokenObtainPairSerializer.get_token(staff))
+    UserProfile.objects.filter(user=staff).update(role="CLINICIAN")
+
+    serializer = AppTokenRefreshSerializer(data={"refresh": refresh})
+    serializer.is_valid(raise_exception=True)
+    user, _ = _authenticate(serializer.validated_data["access_token"])
+    assert user.profile.role == "CLINICIAN"
+
+    rotated = serializer.validated_data["refresh_token"]
+    logout = AppLogoutSerializer(data={"refresh_token": rotated})
+    logout.is_valid(raise_exception=True)
+    logout.save()
+
+    with pytest.raises(AuthenticationFailed):
+        AppTokenRefreshSerializer(data={"refresh": rotated}).is_valid(raise_exception=True)
@@ -0,0 +1,71 @@
+import pytest
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+
+from common.profiling import list_profiles, sign_request_id
+
+PROTECTED = "/api/v1/clinical-ops/staff/queue"
+PUBLIC = "/api/v1/clinical-ops/public/order/some-token"
+
+
+@pytest.fixture
+def profiler_settings(settings, tmp_path):
+    settings.PROFILER_DIR = str(tmp_path / "profiles")
+    settings.PROFILER_SECRET = "profile-secret"
+    settings.PROFILER_SAMPLE_RATE = 0.0
+    settings.PROFILER_MAX_PROFILES = 2
+    return settings
+
+
+@pytest.mark.django_db
+def test_public_routes_are_never_profiled(profiler_settings):
+    profiler_settings.PROFILER_SAMPLE_RATE = 1.0
+    client = APIClient(HTTP_USER_AGENT="pytest")
+    rid = "req-public"
+
+    for path in (PUBLIC, "/healthz/"):
+        resp = client.get(path, HTTP_X_REQUEST_ID=rid, HTTP_X_PROFILE_SIGNATURE=sign_request_id(rid))
+        assert "X-Profile-Id" not in resp
+
+    assert list_profiles() == []
+
+
+@pytest.mark.django_db
+def test_signed_header_profiles_and_ring_buffer_is_bounded(profiler_settings):
+    client = APIClient(HTTP_USER_AGENT="pytest")
+
+    resp = client.get(PROTECTED, HTTP_X_REQUEST_ID="req-0", HTTP_X_PROFILE_SIGNATURE="bad")
+    assert "X-Profile-Id" not in resp
+
+    for i in range(3):
+        rid = f"req-{i}"
+        resp = client.get(PROTECTED, HTTP_X_REQUEST_ID=rid, HTTP_X_PROFILE_SIGNATURE=sign_request_id(rid))
+        assert resp["X-Profile-Id"] == rid
+
+    profiles = list_profiles()
+    assert [p["request_id"] for p in profiles] == ["req-2", "req-1"]
+    assert profiles[0]["trigger"] == "signature"
+
+
+@pytest.mark.django_db
+def test_query_flag_requires_staff_and_admin_views(profiler_settings):
+    client = APIClient(HTTP_USER_AGENT="pytest")
+    user = User.objects.create_user(username="clinician", password="x")
+    client.force_login(user)
+
+    assert "X-Profile-Id" not in client.get(PROTECTED + "?__profile=1")
+    assert client.get("/admin/profiles/").status_code == 302
+
+    user.is_staff = True
+    user.save()
+    resp = client.get(PROTECTED + "?__profile=1", HTTP_X_REQUEST_ID="req-admin")
+    assert resp["X-Profile-Id"] == "req-admin"
+
+    [profile] = client.get("/admin/profiles/").json()["data"]
+    assert profile["trigger"] == "admin"
+    assert "?" not in profile["path"]
+
+    download = client.get(f"/admin/profiles/{profile['file']}")
+    assert download.status_code == 200
+    assert b"".join(download.streaming_content)
+    assert client.get("/admin/profiles/..%2Fsettings.py").status_code == 404
@@ -0,0 +1,110 @@
+import pytest
+from rest_framework.test import APIClient
+
+from datetime import timedelta
+
+from django.utils import timezone
+
+from apps.clinical_ops.models import AssessmentOrder, Patient
+from apps.clinical_ops.models_public_token import PublicAccessToken
+from apps.clinical_ops.services.access_code import (
+    MAX_FAILED_ATTEMPTS,
+    access_code_locked,
+    clear_failed_access_codes,
+    issue_report_access_code,
+    record_failed_access_code,
+)
+from core.models import Organization
+from common import rate_limit
+from common.rate_limit import DatabaseBucketStore
+
+
+class _Order:
+    id = 424242
+
+
+@pytest.mark.django_db
+def test_database_bucket_consumes_and_refills(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(rate_limit.time, "time", lambda: now[0])
+    store = DatabaseBucketStore()
+
+    results = [store.consume("t:bucket", capacity=3, rate=1.0)[0] for _ in range(4)]
+    assert results == [True, True, True, False]
+
+    now[0] += 1.5
+    allowed, tokens = store.consume("t:bucket", capacity=3, rate=1.0)
+    assert allowed and tokens == pytest.approx(0.5)
+
+    now[0] += 10
+    assert store.sweep() == 1
+
+
+@pytest.mark.django_db
+def test_public_token_bucket_is_per_token_and_endpoint(settings):
+    settings.RATE_LIMITS = {**settings.RATE_LIMITS, "public_token.public_read": "2/minute"}
+    client = APIClient(HTTP_USER_AGENT="pytest")
+
+    codes = [client.get("/api/v1/clinical-ops/public/order/not-a-token").status_code for _ in range(3)]
+    assert 429 not in codes[:2] and codes[2] == 429
+
+    # Another token, or the same token on another endpoint class, has its own bucket
+    assert client.get("/api/v1/clinical-ops/public/order/other-token").status_code != 429
+    assert client.post("/api/v1/clinical-ops/public/order/not-a-token/submit", {}, format="json").status_code != 429
+
+
+@pytest.mark.django_db
+def test_public_token_bucket_follows_the_order_across_rotations(settings):
+    settings.RATE_LIMITS = {**settings.RATE_LIMITS, "public_token.public_read": "3/minute", "ip": None}
+    org = Organization.objects.create(name="Rotate Org", code="ROT_ORG", org_type="HOSPITAL")
+    patient = Patient.objects.create(org=org, full_name="Rotate Patient", age=30, sex="MALE")
+    order = AssessmentOrder.objects.create(org=org, patient=patient, battery_code="ANX_SCREEN_V1")
+    token = PublicAccessToken.generate_raw_token()
+    PublicAccessToken.objects.create(
+        order=order,
+        token_hash=PublicAccessToken.hash_token(token),
+        expires_at=timezone.now() + timedelta(minutes=30),
+    )
+    client = APIClient(HTTP_USER_AGENT="pytest")
+
+    codes = []
+    for _ in range(4):
+        resp = client.get(f"/api/v1/clinical-ops/public/order/{token}")
+        codes.append(resp.status_code)
+        token = resp.get("X-Public-Token", token)
+
+    # Every request used a fresh token, yet the order's bucket ran dry
+    assert codes == [200, 200, 200, 429]
+
+
+@pytest.mark.django_db
+def test_failed_access_codes_lock_without_touching_the_order():
+    order = _Order()
+    assert not access_code_locked(order)
+
+    locked = [record_failed_access_code(order) for _ in range(MAX_FAILED_ATTEMPTS)]
+    assert locked[-1] and not any(locked[:-1])
+    assert access_code_locked(order)
+
+    clear_failed_access_codes(order)
+    assert not access_code_locked(order)
+
+
+@pytest.mark.django_db
+def test_access_code_lock_holds_until_a_new_code_is_issued(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(rate_limit.time, "time", lambda: now[0])
+    org = Organization.objects.create(name="Lock Org", code="LOCK_ORG", org_type="HOSPITAL")
+    patient = Patient.objects.create(org=org, full_name="Lock Patient", age=30, sex="MALE")
+    order = AssessmentOrder.objects.create(org=org, patient=patient, battery_code="ANX_SCREEN_V1")
+    issue_report_access_code(order)
+
+    for _ in range(MAX_FAILED_ATTEMPTS):
+        record_failed_access_code(order)
+
+    # Waiting does not bring attempts back: a sixth guess is still refused
+    now[0] += 24 * 3600
+    assert access_code_locked(order)
+
+    issue_report_access_code(order)
+    assert not access_code_locked(order)
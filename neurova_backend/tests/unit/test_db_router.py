@@ -0,0 +1,59 @@
+import pytest
+from django.test import RequestFactory
+
+from common import db_router
+from common.db_router import PrimaryReplicaRouter, replica_reads, routing_scope
+from common.replica_middleware import ReplicaPinningMiddleware
+from apps.clinical_ops.models import AssessmentOrder
+
+
+@pytest.fixture
+def router(monkeypatch):
+    monkeypatch.setattr(db_router, "replica_configured", lambda: True)
+    return PrimaryReplicaRouter()
+
+
+def test_reads_use_replica_only_inside_scope(router):
+    with routing_scope():
+        assert router.db_for_read(AssessmentOrder) == "default"
+        with replica_reads():
+            assert router.db_for_read(AssessmentOrder) == "replica"
+
+
+def test_write_pins_rest_of_scope_to_primary(router):
+    with routing_scope():
+        with replica_reads():
+            assert router.db_for_write(AssessmentOrder) == "default"
+            assert router.db_for_read(AssessmentOrder) == "default"
+
+    with routing_scope(), replica_reads():
+        assert router.db_for_read(AssessmentOrder) == "replica"
+
+
+def test_no_replica_alias_means_primary():
+    with routing_scope(), replica_reads():
+        assert PrimaryReplicaRouter().db_for_read(AssessmentOrder) == "default"
+
+
+def test_middleware_isolates_pinning_per_request(router):
+    seen = []
+
+    def view(request):
+        with replica_reads():
+            seen.append(router.db_for_read(AssessmentOrder))
+            if request.method == "POST":
+                router.db_for_write(AssessmentOrder)
+                seen.append(router.db_for_read(AssessmentOrder))
+        return None
+
+    middleware = ReplicaPinningMiddleware(view)
+    factory = RequestFactory()
+    middleware(factory.post("/"))
+    middleware(factory.get("/"))
+
+    assert seen == ["replica", "default", "replica"]
+
+
+def test_replica_is_never_migrated(router):
+    assert router.allow_migrate("default", "clinical_ops")
+    assert not router.allow_migrate("replica", "clinical_ops")
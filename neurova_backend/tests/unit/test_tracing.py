@@ -0,0 +1,74 @@
+import json
+
+import pytest
+from rest_framework.test import APIClient
+
+from common.metrics import timed
+from common.tracing import span, to_otlp
+
+
+@pytest.fixture
+def jsonl_traces(settings, tmp_path):
+    path = tmp_path / "traces.jsonl"
+    settings.TRACING_EXPORTER = "jsonl"
+    settings.TRACING_JSONL_PATH = str(path)
+    settings.TRACING_SAMPLE_RATE = 1.0
+
+    def read():
+        if not path.exists():
+            return []
+        return [json.loads(line) for line in path.read_text().splitlines()]
+
+    return read
+
+
+def test_nested_spans_share_trace_and_export_on_root_end(jsonl_traces):
+    with span("root", request_id="req-1"):
+        with timed("score_battery"):
+            pass
+        assert jsonl_traces() == []
+
+    spans = {s["name"]: s for s in jsonl_traces()}
+    assert set(spans) == {"root", "score_battery"}
+    assert spans["score_battery"]["parent_id"] == spans["root"]["span_id"]
+    assert spans["root"]["parent_id"] is None
+    assert {s["trace_id"] for s in spans.values()} == {spans["root"]["trace_id"]}
+    assert spans["root"]["request_id"] == "req-1"
+
+
+def test_error_status_and_sampling(jsonl_traces, settings):
+    with pytest.raises(ValueError):
+        with span("failing"):
+            raise ValueError("boom")
+    [failed] = jsonl_traces()
+    assert failed["status"] == "error"
+    assert failed["attributes"]["error.type"] == "ValueError"
+
+    settings.TRACING_SAMPLE_RATE = 0.0
+    with span("dropped"):
+        pass
+    assert len(jsonl_traces()) == 1
+
+
+@pytest.mark.django_db
+def test_request_trace_is_keyed_by_request_id(jsonl_traces):
+    rid = "0b7e3c1e-5a4f-4c61-9d3a-2f1e6b8c9d00"
+    resp = APIClient().get("/healthz/", HTTP_X_REQUEST_ID=rid)
+    assert resp["X-Request-ID"] == rid
+
+    [root] = jsonl_traces()
+    assert root["name"] == "http.request"
+    assert root["trace_id"] == rid.replace("-", "")
+    assert root["attributes"]["status"] == 200
+
+
+def test_otlp_payload_shape(jsonl_traces):
+    with span("root", request_id="req-2", org_id=7):
+        with span("child"):
+            pass
+
+    body = to_otlp(jsonl_traces())
+    otlp_spans = body["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [s["name"] for s in otlp_spans] == ["child", "root"]
+    assert len(otlp_spans[0]["traceId"]) == 32
+    assert {"key": "org_id", "value": {"intValue": "7"}} in otlp_spans[1]["attributes"]